@@ -1,15 +1,153 @@
-from flask import Flask, render_template, jsonify, request, redirect, url_for, flash
+from flask import Flask, render_template, jsonify, request, redirect, url_for, flash, make_response, session, Response, stream_with_context, g
+from markupsafe import Markup
 from utils.data_manager import DataManager
-import ast
-import pandas as pd
-import subprocess
+from utils.responses import FastJSONProvider, compress_response
+from utils.events import EventBus, format_sse
+from utils.jobs import JobManager
+from utils.coordinator import CoordinatorClient, RemoteJobManager, SnapshotDataManager
+from utils.metrics import REGISTRY as metrics, QUERY_STAGE_SECONDS, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from utils.logs import setup_logging
+import configparser
+import logging
 import sys
 import json
 import os
+import time
 
 app = Flask(__name__)
 app.secret_key = 'fellowship-helper-secret-key-change-in-production'
-data_manager = DataManager()
+app.json = FastJSONProvider(app)
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+setup_logging(os.path.join(APP_DIR, 'config.ini'))
+logger = logging.getLogger('app')
+event_bus = EventBus()
+# Under serve.py, this process is one of several workers: it reads the coordinator's shared
+# snapshot and sends writes and pipeline runs to the coordinator.
+coordinator_client = CoordinatorClient.from_environment()
+if coordinator_client is not None:
+    coordinator_client.on_event = event_bus.publish
+    data_manager = SnapshotDataManager(coordinator_client)
+else:
+    data_manager = DataManager()
+# Reload events list changed ids only up to this many; larger reloads just report counts
+MAX_EVENT_IDS = 500
+
+def _publish_version(version, changes):
+    data = {'version': version, **changes}
+    for field in ('ids', 'added', 'changed', 'updates'):
+        ids = data.get(field)
+        if ids is not None and len(ids) > MAX_EVENT_IDS:
+            data[field] = None
+            data[f'{field}_count'] = len(ids)
+    event_bus.publish('data_version', data)
+
+data_manager.add_version_listener(_publish_version)
+
+jobs_config = configparser.ConfigParser()
+jobs_config.read(os.path.join(APP_DIR, 'config.ini'))
+if coordinator_client is not None:
+    job_manager = RemoteJobManager(coordinator_client)
+else:
+    job_manager = JobManager.from_config(
+        jobs_config,
+        cwd=APP_DIR,
+        publish=event_bus.publish,
+        on_finish=lambda job: data_manager.refresh_data_if_needed(),
+    )
+
+def _job_started_response(job, created, message):
+    """JSON reply for a pipeline submission; joining an already active run is not an error."""
+    if not created:
+        message = f"A {job.type} run is already {job.state} (job {job.id})."
+    return jsonify({'success': True, 'message': message, 'job': job.to_dict(), 'coalesced': not created}), 202 if created else 200
+
+http_config = configparser.ConfigParser()
+http_config.read('config.ini')
+COMPRESSION_ENABLED = http_config.getboolean('HTTP', 'compression', fallback=True)
+COMPRESSION_MIN_BYTES = http_config.getint('HTTP', 'compression_min_bytes', fallback=1024)
+GZIP_LEVEL = http_config.getint('HTTP', 'gzip_level', fallback=6)
+BROTLI_QUALITY = http_config.getint('HTTP', 'brotli_quality', fallback=5)
+
+REQUEST_SECONDS = metrics.histogram(
+    'fellowship_http_request_duration_seconds',
+    'Time to build each HTTP response, by route template, method and status code.',
+    ['route', 'method', 'status'],
+)
+
+def _cache_samples(stat):
+    stats = data_manager.cache_stats()
+    yield {'cache': 'query'}, stats[stat]
+    yield {'cache': 'fragment'}, stats['fragments'][stat]
+
+metrics.callback('fellowship_cache_hits_total', 'Cache lookups answered from the cache.', lambda: _cache_samples('hits'), kind='counter')
+metrics.callback('fellowship_cache_misses_total', 'Cache lookups that had to compute or render.', lambda: _cache_samples('misses'), kind='counter')
+metrics.callback('fellowship_cache_hit_ratio', 'Share of cache lookups answered from the cache.', lambda: _cache_samples('hit_rate'))
+metrics.callback('fellowship_cache_entries', 'Entries currently held in each cache.', lambda: _cache_samples('size'))
+metrics.callback('fellowship_dataset_rows', 'Fellowships in the loaded dataset.', lambda: [({}, 0 if data_manager.df is None else len(data_manager.df))])
+metrics.callback('fellowship_dataset_memory_bytes', 'Memory used by the in-memory fellowship table.', lambda: [({}, data_manager.memory_report()['total_after_bytes'])])
+metrics.callback('fellowship_dataset_version', 'Current dataset version.', lambda: [({}, data_manager.data_version)])
+metrics.callback('fellowship_data_available', '1 if processed fellowship data is loaded.', lambda: [({}, int(bool(data_manager.data_available)))])
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    # Registered before compress(), so it runs after it and the timing includes compression.
+    start = g.pop('request_start', None)
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        REQUEST_SECONDS.observe(time.perf_counter() - start, route=route, method=request.method, status=response.status_code)
+    return response
+
+@app.after_request
+def compress(response):
+    """gzip/brotli-encodes JSON and HTML responses for clients that accept it."""
+    if not COMPRESSION_ENABLED:
+        return response
+    return compress_response(response, request.accept_encodings, COMPRESSION_MIN_BYTES, GZIP_LEVEL, BROTLI_QUALITY)
+
+def _not_modified(etag):
+    """Returns a 304 response if the client's If-None-Match already holds `etag`, else None."""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    response = make_response('', 304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def _with_etag(response, etag):
+    """Tags a response so browsers revalidate it with If-None-Match instead of refetching."""
+    response = make_response(response)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def _render_cards(fellowships, page_version):
+    """
+    Card HTML for each fellowship, reusing fragments already rendered for the same row version.
+
+    `page_version` is the dataset version read before the records were built; a row that
+    changed after that is rendered but not cached, so a stale card is never stored under
+    the row's new version.
+    """
+    start = time.perf_counter()
+    cache = data_manager.fragment_cache
+    hits_before = cache.hits
+    fragments = []
+    for fellowship in fellowships:
+        version = data_manager.row_version(fellowship['id'])
+        cacheable = version is not None and version <= page_version
+        fragments.append(cache.get_or_render(
+            fellowship['id'],
+            version,
+            lambda fellowship=fellowship: Markup(render_template('_fellowship_card.html', fellowship=fellowship)),
+            cacheable,
+        ))
+    QUERY_STAGE_SECONDS.observe(time.perf_counter() - start, stage='render')
+    logger.debug("[Index] Rendered %d cards (%d cached) in %.2fms", len(fragments), cache.hits - hits_before, (time.perf_counter() - start) * 1000)
+    return fragments
 
 @app.route("/")
 def index():
@@ -21,7 +159,7 @@ def index():
     show_removed = request.args.get('show_removed', 'false').lower() == 'true'
     keywords = request.args.get('keywords', '', type=str)
     
-    print(f"Index Data Availability: {data_manager.data_available}")
+    logger.debug("[Index] Data availability: %s", data_manager.data_available)
     
     # If no data is available, render template with empty state
     if not data_manager.data_available:
@@ -48,17 +186,23 @@ def index():
         'keywords': [kw.strip() for kw in keywords.split(',') if kw.strip()]
     }
     
-    # Get filtered fellowships from DataManager with error handling
+    # Unchanged data and parameters: let the browser reuse its copy. Pending flash messages
+    # are part of the page, so those requests are always rendered.
+    etag = data_manager.query_etag(filters, 'index', page, per_page, keywords)
+    if '_flashes' not in session:
+        not_modified = _not_modified(etag)
+        if not_modified is not None:
+            logger.debug("[Index] Not modified (etag=%s)", etag)
+            return not_modified
+
+    # Resolve the filters to ordered row ids; rows are only materialized for the requested page
     try:
-        fellowships_df = data_manager.get_filtered_fellowships(filters)
-        total_count = len(fellowships_df)
-        
-        print(f"[Index] Filters={filters} | page={page} per_page={per_page} | total_count={total_count}")
+        query = data_manager.query_fellowships(filters)
+        total_count = query.total_count
         
-        # Reset index and add ID column for template use
-        fellowships_df = fellowships_df.reset_index().rename(columns={'index': 'id'})
+        logger.debug("[Index] Filters=%s | page=%s per_page=%s | total_count=%s", filters, page, per_page, total_count)
     except Exception as e:
-        print(f"[Index] Error filtering fellowships: {e}")
+        logger.exception("[Index] Error filtering fellowships: %s", e)
         flash(f'Error loading fellowship data: {str(e)}', 'error')
         return render_template("index.html", 
                              fellowships=[],
@@ -70,31 +214,6 @@ def index():
                              filters=filters,
                              data_available=False)
     
-    # Calculate pagination
-    start = (page - 1) * per_page
-    end = start + per_page
-    paginated_fellowships = fellowships_df.iloc[start:end]
-    
-    print(f"[Index] Slice start={start} end={end} | page_rows={len(paginated_fellowships)}")
-    
-    # Convert to template-friendly format
-    fellowships_list = paginated_fellowships.where(pd.notnull(paginated_fellowships), None).to_dict('records')
-    
-    # Process subjects field for each fellowship
-    for fellowship in fellowships_list:
-        subjects_raw = fellowship.get('subjects')
-        if isinstance(subjects_raw, str):
-            try:
-                subjects_list = ast.literal_eval(subjects_raw)
-                if isinstance(subjects_list, list):
-                    fellowship['subjects'] = subjects_list
-                else:
-                    fellowship['subjects'] = [str(subjects_list)]
-            except (ValueError, SyntaxError):
-                fellowship['subjects'] = [s.strip() for s in subjects_raw.split(',') if s.strip()]
-        elif not isinstance(subjects_raw, list):
-            fellowship['subjects'] = []
-    
     # Handle invalid page numbers
     total_pages = (total_count + per_page - 1) // per_page if total_count > 0 else 1
     original_page = page
@@ -107,26 +226,15 @@ def index():
         page = total_pages
         if original_page != page:
             flash(f'Page {original_page} does not exist. Redirected to last page.', 'warning')
-        # Recalculate pagination with corrected page
-        start = (page - 1) * per_page
-        end = start + per_page
-        paginated_fellowships = fellowships_df.iloc[start:end]
-        fellowships_list = paginated_fellowships.where(pd.notnull(paginated_fellowships), None).to_dict('records')
-        
-        # Reprocess subjects for corrected page
-        for fellowship in fellowships_list:
-            subjects_raw = fellowship.get('subjects')
-            if isinstance(subjects_raw, str):
-                try:
-                    subjects_list = ast.literal_eval(subjects_raw)
-                    if isinstance(subjects_list, list):
-                        fellowship['subjects'] = subjects_list
-                    else:
-                        fellowship['subjects'] = [str(subjects_list)]
-                except (ValueError, SyntaxError):
-                    fellowship['subjects'] = [s.strip() for s in subjects_raw.split(',') if s.strip()]
-            elif not isinstance(subjects_raw, list):
-                fellowship['subjects'] = []
+    
+    # Calculate pagination
+    start = (page - 1) * per_page
+    end = start + per_page
+    page_version = data_manager.data_version
+    fellowships_list = query.page(start, end)
+    card_fragments = _render_cards(fellowships_list, page_version)
+    
+    logger.debug("[Index] Slice start=%s end=%s | page_rows=%d", start, end, len(fellowships_list))
     
     # Calculate comprehensive pagination info
     has_more = end < total_count
@@ -142,10 +250,11 @@ def index():
     for p in range(start_page, end_page + 1):
         page_range.append(p)
     
-    print(f"[Index] Returning {len(fellowships_list)} items | page={page}/{total_pages} | has_more={has_more} | has_previous={has_previous}")
+    logger.debug("[Index] Returning %d items | page=%s/%s | has_more=%s | has_previous=%s", len(fellowships_list), page, total_pages, has_more, has_previous)
     
-    return render_template("index.html",
+    rendered = render_template("index.html",
                         fellowships=fellowships_list,
+                        card_fragments=card_fragments,
                         total_count=total_count,
                         current_page=page,
                         per_page=per_page,
@@ -162,53 +271,92 @@ def index():
                             'keywords': keywords
                         },
                         data_available=data_manager.data_available)
+    return _with_etag(rendered, etag)
 
 @app.route("/api/fellowships", methods=['GET'])
 def get_fellowships():
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
+    # Opaque keyset cursor from a previous response's next_cursor; takes precedence over page
+    cursor = request.args.get('cursor')
+    # Projection: comma-separated field names, or "card" for just what a card displays
+    fields = [f.strip() for f in request.args.get('fields', '').split(',') if f.strip()]
     
     # Extract filters from request arguments
     filters = {
         'min_stars': request.args.get('min_stars', 1, type=int),
         'favorites_first': request.args.get('favorites_first', 'false').lower() == 'true',
         'show_removed': request.args.get('show_removed', 'false').lower() == 'true',
-        'keywords': [kw.strip() for kw in request.args.get('keywords', '').split(',') if kw.strip()]
+        'keywords': [kw.strip() for kw in request.args.get('keywords', '').split(',') if kw.strip()],
+        'subjects': [s.strip() for s in request.args.get('subjects', '').split(',') if s.strip()]
     }
 
-    fellowships_df = data_manager.get_filtered_fellowships(filters)
-    total_count = len(fellowships_df)
-    print(f"[GET /api/fellowships] Filters={filters} | page={page} per_page={per_page} | total_count={total_count}")
+    etag = data_manager.query_etag(filters, 'api', page, per_page, cursor, tuple(fields))
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        logger.debug("[GET /api/fellowships] Not modified (etag=%s)", etag)
+        return not_modified
 
-    fellowships_df = fellowships_df.reset_index().rename(columns={'index': 'id'})
-    
-    start = (page - 1) * per_page
-    end = start + per_page
-    paginated_fellowships = fellowships_df.iloc[start:end]
-    print(f"[GET /api/fellowships] Slice start={start} end={end} | page_rows={len(paginated_fellowships)}")
-    
-    fellowships_list = paginated_fellowships.where(pd.notnull(paginated_fellowships), None).to_dict('records')
+    query = data_manager.query_fellowships(filters)
+    total_count = query.total_count
+    logger.debug("[GET /api/fellowships] Filters=%s | page=%s per_page=%s cursor=%s fields=%s | total_count=%s", filters, page, per_page, cursor, fields or 'all', total_count)
 
-    for fellowship in fellowships_list:
-        subjects_raw = fellowship.get('subjects')
-        if isinstance(subjects_raw, str):
-            try:
-                subjects_list = ast.literal_eval(subjects_raw)
-                if isinstance(subjects_list, list):
-                    fellowship['subjects'] = subjects_list
-                else:
-                    fellowship['subjects'] = [str(subjects_list)]
-            except (ValueError, SyntaxError):
-                fellowship['subjects'] = [s.strip() for s in subjects_raw.split(',') if s.strip()]
-        elif not isinstance(subjects_raw, list):
-            fellowship['subjects'] = []
-    print(f"[GET /api/fellowships] Returning {len(fellowships_list)} items | has_more={end < total_count}")
+    try:
+        fields = query.resolve_fields(fields)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    return jsonify({
+    if cursor is not None:
+        try:
+            fellowships_list, next_cursor = query.page_after(cursor, per_page, fields)
+        except ValueError as e:
+            logger.info("[GET /api/fellowships] %s", e)
+            return jsonify({"error": "Invalid cursor."}), 400
+    else:
+        start = (page - 1) * per_page
+        end = start + per_page
+        fellowships_list = query.page(start, end, fields)
+        next_cursor = query.cursor_at(end - 1) if end < total_count else None
+        logger.debug("[GET /api/fellowships] Slice start=%s end=%s | page_rows=%d", start, end, len(fellowships_list))
+    has_more = next_cursor is not None
+
+    serialize_start = time.perf_counter()
+    response = jsonify({
         "fellowships": fellowships_list,
         "total_count": total_count,
-        "has_more": end < total_count
+        "has_more": has_more,
+        "next_cursor": next_cursor
     })
+    QUERY_STAGE_SECONDS.observe(time.perf_counter() - serialize_start, stage='serialization')
+    logger.debug("[GET /api/fellowships] Returning %d items | has_more=%s | %s bytes serialized in %.2fms", len(fellowships_list), has_more, response.content_length, (time.perf_counter() - serialize_start) * 1000)
+    return _with_etag(response, etag)
+
+@app.route("/api/subjects", methods=['GET'])
+def get_subjects():
+    """Normalized subject vocabulary with integer codes and row counts."""
+    return jsonify({"subjects": data_manager.get_subject_vocabulary()})
+
+@app.route("/api/facets", methods=['GET'])
+def get_facets():
+    """
+    Number of fellowships per continent, subject, star rating, deadline month, favorited
+    and show value, among those matching the same filters as /api/fellowships.
+    """
+    filters = {
+        'min_stars': request.args.get('min_stars', 1, type=int),
+        'show_removed': request.args.get('show_removed', 'false').lower() == 'true',
+        'keywords': [kw.strip() for kw in request.args.get('keywords', '').split(',') if kw.strip()],
+        'subjects': [s.strip() for s in request.args.get('subjects', '').split(',') if s.strip()]
+    }
+
+    etag = data_manager.query_etag(filters, 'facets')
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+
+    total_count, facets = data_manager.facet_counts(filters)
+    logger.debug("[GET /api/facets] Filters=%s | total_count=%s", filters, total_count)
+    return _with_etag(jsonify({"total_count": total_count, "facets": facets}), etag)
 
 @app.route("/api/fellowships/<fellowship_id>/favorite", methods=['POST'])
 def favorite_fellowship(fellowship_id):
@@ -233,14 +381,31 @@ def undo_remove_fellowship(fellowship_id):
         return jsonify({"success": True})
     return jsonify({"success": False}), 404
 
+@app.route("/api/fellowships/batch", methods=['POST'])
+def batch_update_fellowships():
+    """
+    Applies a list of {id, field, value} status changes (field: favorited or show) at once.
+
+    Accepts {"operations": [...]} or a bare list. Either every operation is applied, with one
+    journal write and one version bump, or none is and the errors are returned.
+    """
+    data = request.get_json(silent=True)
+    operations = data.get('operations') if isinstance(data, dict) else data
+    applied, errors = data_manager.update_fellowship_statuses(operations)
+    if errors:
+        logger.info("[POST /api/fellowships/batch] Rejected batch: %d invalid operation(s)", len(errors))
+        return jsonify({"success": False, "errors": errors}), 400
+    logger.debug("[POST /api/fellowships/batch] Applied %d change(s) | version=%s", applied, data_manager.data_version)
+    return jsonify({"success": True, "applied": applied, "version": data_manager.data_version})
+
 # New server-side fellowship action routes
 @app.route("/fellowship/<fellowship_id>/favorite", methods=['POST'])
 def favorite_fellowship_redirect(fellowship_id):
     """Toggle favorite status and redirect back with preserved filters"""
     # Get current favorite status and toggle it
     try:
-        row_index = int(fellowship_id)
-        if data_manager.df is not None and row_index in data_manager.df.index:
+        row_index = data_manager.resolve_fellowship_id(fellowship_id)
+        if row_index is not None:
             current_status = data_manager.df.loc[row_index, 'favorited']
             new_status = 1 if current_status == 0 else 0
             success = data_manager.update_fellowship_status(fellowship_id, 'favorited', new_status)
@@ -314,43 +479,92 @@ def get_status():
         "message": "Processed fellowship data is available." if data_manager.data_available else "Processed fellowship data not found. Please process the raw data."
     })
 
+@app.route("/api/events", methods=['GET'])
+def stream_events():
+    """
+    Server-Sent Events stream of pipeline progress ('job', 'progress') and dataset changes
+    ('data_version', with the ids of changed fellowships where known).
+
+    Reconnecting clients send Last-Event-ID and receive the events they missed.
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+    subscription = event_bus.subscribe(last_event_id)
+
+    def generate():
+        try:
+            yield f"retry: 3000\nevent: hello\ndata: {json.dumps({'version': data_manager.data_version})}\n\n"
+            while not subscription.closed:
+                event = subscription.get(timeout=15)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            subscription.close()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+@app.route("/api/cache/stats", methods=['GET'])
+def get_cache_stats():
+    """Hit/miss counters for the filtered-query cache, used to tune [CACHE] query_cache_size."""
+    return jsonify(data_manager.cache_stats())
+
+@app.route("/api/metrics", methods=['GET'])
+def get_metrics():
+    """
+    Request latency, query stage timings, cache hit rates and dataset size in Prometheus
+    text format. Under serve.py each worker reports its own requests.
+    """
+    return Response(metrics.render(), headers={'Content-Type': METRICS_CONTENT_TYPE, 'Cache-Control': 'no-cache'})
+
+@app.route("/api/memory", methods=['GET'])
+def get_memory_report():
+    """Per-column bytes of the in-memory fellowship table before and after [MEMORY] optimize."""
+    return jsonify(data_manager.memory_report())
+
 @app.route('/api/filters', methods=['GET', 'POST'])
 def manage_filters():
     filters_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'configs', 'filters.json')
     if request.method == 'GET':
         try:
-            print(f"[GET /api/filters] Loading filters from: {filters_path}")
+            logger.debug("[GET /api/filters] Loading filters from: %s", filters_path)
             with open(filters_path, 'r') as f:
                 filters = json.load(f)
-            print("[GET /api/filters] Loaded filters:")
-            print(json.dumps(filters, indent=2))
+            logger.debug("[GET /api/filters] Loaded filters: %s", filters)
             return jsonify(filters)
         except FileNotFoundError:
-            print(f"[GET /api/filters] Filters file not found at: {filters_path}")
+            logger.warning("[GET /api/filters] Filters file not found at: %s", filters_path)
             return jsonify({"error": "Filters file not found."}), 404
         except json.JSONDecodeError as e:
-            print(f"[GET /api/filters] Error decoding filters file: {e}")
+            logger.error("[GET /api/filters] Error decoding filters file: %s", e)
             return jsonify({"error": "Error decoding filters file."}), 500
 
     if request.method == 'POST':
         try:
             new_filters = request.json
-            print("[POST /api/filters] Saving filters to JSON at:", filters_path)
-            print(json.dumps(new_filters, indent=2))
+            logger.info("[POST /api/filters] Saving filters to JSON at: %s", filters_path)
+            logger.debug("[POST /api/filters] New filters: %s", new_filters)
             with open(filters_path, 'w') as f:
                 json.dump(new_filters, f, indent=4)
             # After saving filters, start the scraping process (no flags)
             try:
-                command = [sys.executable, 'data_retrieval.py', '--notify-app']
-                cwd_path = os.path.dirname(os.path.abspath(__file__))
-                print(f"[POST /api/filters] Starting scraping process: {' '.join(command)} (cwd={cwd_path})")
-                subprocess.Popen(command, cwd=cwd_path)
-                return jsonify({"success": True, "message": "Filters saved successfully. Scraping process started."})
+                command = [sys.executable, 'data_retrieval.py']
+                logger.info("[POST /api/filters] Starting scraping process: %s (cwd=%s)", ' '.join(command), APP_DIR)
+                job, created = job_manager.submit('scrape', command)
+                return _job_started_response(job, created, "Filters saved successfully. Scraping process started.")
             except Exception as e:
-                print(f"[POST /api/filters] Filters saved but failed to start scraping: {e}")
+                logger.exception("[POST /api/filters] Filters saved but failed to start scraping: %s", e)
                 return jsonify({"success": False, "error": f"Filters saved but failed to start scraping: {str(e)}"}), 500
         except Exception as e:
-            print(f"[POST /api/filters] Error saving filters: {e}")
+            logger.exception("[POST /api/filters] Error saving filters: %s", e)
             return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/api_key', methods=['GET', 'POST'])
@@ -373,7 +587,7 @@ def manage_api_key():
             if not isinstance(new_api_key_data, dict):
                 return jsonify({"success": False, "error": "Invalid JSON body."}), 400
 
-            print(f"[POST /api/api_key] Saving API key to: {api_key_path}")
+            logger.info("[POST /api/api_key] Saving API key to: %s", api_key_path)
 
             config_data = {}
             if os.path.exists(api_key_path):
@@ -394,7 +608,7 @@ def manage_api_key():
 
             return jsonify({"success": True, "message": "API key saved successfully."})
         except Exception as e:
-            print(f"[POST /api/api_key] Error saving API key: {e}")
+            logger.exception("[POST /api/api_key] Error saving API key: %s", e)
             return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/api_key/perplexity', methods=['POST'])
@@ -405,7 +619,7 @@ def manage_perplexity_api_key():
         if not isinstance(body, dict) or 'perplexity_api_key' not in body:
             return jsonify({"success": False, "error": "'perplexity_api_key' not in request."}), 400
 
-        print(f"[POST /api/api_key/perplexity] Saving API key to: {api_key_path}")
+        logger.info("[POST /api/api_key/perplexity] Saving API key to: %s", api_key_path)
 
         config_data = {}
         if os.path.exists(api_key_path):
@@ -422,7 +636,7 @@ def manage_perplexity_api_key():
 
         return jsonify({"success": True, "message": "Perplexity API key saved successfully."})
     except Exception as e:
-        print(f"[POST /api/api_key/perplexity] Error saving API key: {e}")
+        logger.exception("[POST /api/api_key/perplexity] Error saving API key: %s", e)
         return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/login/profellow', methods=['GET', 'POST'])
@@ -474,18 +688,18 @@ def scrape():
         filters_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'configs', 'filters.json')
         filters = {}
         try:
-            print(f"[GET /scrape] Loading filters from: {filters_path}")
+            logger.debug("[GET /scrape] Loading filters from: %s", filters_path)
             with open(filters_path, 'r') as f:
                 filters = json.load(f)
             browsing = filters.get('Browsing')
             categories = list(filters.get('categories', {}).keys())
             keywords = filters.get('keywords', {})
             sys_instr_len = len(filters.get('system_instructions', '') or '')
-            print(f"[GET /scrape] Loaded. Browsing={browsing}; Categories={categories}; KeywordType={keywords.get('type')}; KeywordCount={len(keywords.get('words', []))}; SystemInstructionsLength={sys_instr_len}")
+            logger.debug("[GET /scrape] Loaded. Browsing=%s; Categories=%s; KeywordType=%s; KeywordCount=%d; SystemInstructionsLength=%d", browsing, categories, keywords.get('type'), len(keywords.get('words', [])), sys_instr_len)
         except FileNotFoundError:
-            print(f"[GET /scrape] Filters file not found at: {filters_path}. Proceeding with defaults.")
+            logger.warning("[GET /scrape] Filters file not found at: %s. Proceeding with defaults.", filters_path)
         except json.JSONDecodeError as e:
-            print(f"[GET /scrape] Error decoding filters file: {e}. Proceeding with defaults.")
+            logger.error("[GET /scrape] Error decoding filters file: %s. Proceeding with defaults.", e)
         
         # Load API keys if they exist (Gemini and Perplexity)
         api_key_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'configs', 'api_key.json')
@@ -497,11 +711,11 @@ def scrape():
                     'gemini_api_key': api_key_data.get('gemini_api_key', ''),
                     'perplexity_api_key': api_key_data.get('perplexity_api_key', '')
                 }
-            print(f"[GET /scrape] Loaded API keys (Gemini length: {len(api_keys['gemini_api_key']) if api_keys.get('gemini_api_key') else 0}, Perplexity length: {len(api_keys['perplexity_api_key']) if api_keys.get('perplexity_api_key') else 0})")
+            logger.debug("[GET /scrape] Loaded API keys (Gemini length: %d, Perplexity length: %d)", len(api_keys['gemini_api_key'] or ''), len(api_keys['perplexity_api_key'] or ''))
         except FileNotFoundError:
-            print(f"[GET /scrape] API key file not found at: {api_key_path}")
+            logger.warning("[GET /scrape] API key file not found at: %s", api_key_path)
         except json.JSONDecodeError as e:
-            print(f"[GET /scrape] Error decoding API key file: {e}")
+            logger.error("[GET /scrape] Error decoding API key file: %s", e)
 
         return render_template('scrape.html', filters=filters, api_keys=api_keys)
     
@@ -513,8 +727,8 @@ def scrape():
         command.append('--cleanup')
 
     try:
-        subprocess.Popen(command, cwd=os.path.dirname(os.path.abspath(__file__)))
-        return jsonify({'success': True, 'message': 'Scraping process started.'})
+        job, created = job_manager.submit('scrape', command)
+        return _job_started_response(job, created, 'Scraping process started.')
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -522,10 +736,33 @@ def scrape():
 def process():
     command = [sys.executable, 'data_retrieval.py', '--refine']
     try:
-        subprocess.Popen(command, cwd=os.path.dirname(os.path.abspath(__file__)))
-        return jsonify({'success': True, 'message': 'Processing started.'})
+        job, created = job_manager.submit('process', command)
+        return _job_started_response(job, created, 'Processing started.')
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """Pipeline runs started from the app, newest first, with the worker pool's state."""
+    return jsonify({'jobs': [job.to_dict() for job in job_manager.jobs()], 'stats': job_manager.stats()})
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """State, last progress report, exit code, duration and recent output of one run."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found.'}), 404
+    return jsonify(job.to_dict(output=True))
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found.'}), 404
+    if not job.active:
+        return jsonify({'success': False, 'error': f'Job already {job.state}.', 'job': job.to_dict()}), 409
+    job_manager.cancel(job_id)
+    return jsonify({'success': True, 'message': 'Cancellation requested.', 'job': job.to_dict()})
+
 if __name__ == "__main__":
     app.run(debug=True)
@@ -3,10 +3,21 @@ from utils.scrape import ProfellowBot
 from utils.files_folders import FileManager
 from utils.data import DataProcessor
 from utils.refinement import GeminiRefiner
+from utils.storage import open_fellowship_store, export_csv, storage_report
+from utils.logs import setup_logging
+from utils.browser_profiles import PROFILES
+from utils.scrape_runs import load_runs, summarize_runs
+from utils.facetwp import FacetWPClient, FacetWPReplayServer
+from utils.cards import CardParseError, parse_fellowship_cards
+import configparser
+import time
 import os
 import json
+from pathlib import Path
 
 def main():
+    setup_logging()
+
     # --- File and Folder Setup ---
     file_manager = FileManager()
     file_manager.setup()
@@ -17,9 +28,84 @@ def main():
     parser.add_argument('--cleanup', action='store_true', help="Clear both tmp and data folders before starting the bot.")
     parser.add_argument('--cleardata', action='store_true', help="Clear the data folder before starting the bot.")
     parser.add_argument('--refine', action='store_true', help="Refine existing raw data without running the scraper.")
-    parser.add_argument('--notify-app', action='store_true', help="Notify the Flask app to refresh data upon completion.")
+    parser.add_argument('--notify-app', action='store_true', help="Report a 'done' progress event upon completion (streamed to clients when the app launched this run).")
+    parser.add_argument('--export-csv', action='store_true', help="Export the processed fellowships to CSV and exit.")
+    parser.add_argument('--storage-report', action='store_true', help="Report on-disk size and load time of the processed data for each storage format and exit.")
+    parser.add_argument('--parse-benchmark', nargs='?', const='tmp/fellowship_page.html', metavar='HTML_FILE', help="Open a saved results page (default: the last scrape's tmp/fellowship_page.html) in the browser, time reading its cards over WebDriver against parsing its HTML, and exit.")
+    parser.add_argument('--profile', choices=PROFILES, help="Browser profile for this run (default: [SCRAPE] profile in config.ini). 'headless' blocks images, media, fonts and trackers; 'full' opens a visible browser.")
+    parser.add_argument('--scrape-report', action='store_true', help="Compare wall time and peak browser memory of past scrape runs per browser and profile, and exit.")
+    parser.add_argument('--fetch-mode', choices=('browser', 'direct'), help="How results are loaded after login (default: [SCRAPE] fetch_mode in config.ini). 'direct' fetches FacetWP's result pages over HTTP in parallel instead of clicking 'Load More'.")
+    parser.add_argument('--direct-replay', nargs='?', const='tmp/facetwp', metavar='RECORD_DIR', help="Run the direct fetch against a local server replaying a recorded listing (default: the last direct scrape's tmp/facetwp), report timing and card counts, and exit.")
+    parser.add_argument('--replay-delay', type=float, default=0.0, metavar='SECONDS', help="Latency the replay server adds to each response (with --direct-replay).")
     args = parser.parse_args()
 
+    if args.direct_replay:
+        if not os.path.exists(os.path.join(args.direct_replay, 'request.json')):
+            print(f"No recorded listing found in '{args.direct_replay}'. Exiting.")
+            return
+        config = configparser.ConfigParser()
+        config.read('config.ini')
+        concurrency = config.getint('SCRAPE', 'direct_concurrency', fallback=4)
+        with FacetWPReplayServer(args.direct_replay, delay=args.replay_delay) as server:
+            for workers in sorted({1, concurrency}):
+                client = FacetWPClient.from_recording(args.direct_replay, server.url, concurrency=workers)
+                start = time.perf_counter()
+                try:
+                    templates = client.fetch_all()
+                finally:
+                    client.close()
+                fetch_seconds = time.perf_counter() - start
+                start = time.perf_counter()
+                cards = [card for template in templates for card in parse_fellowship_cards(template, client.base_url)]
+                parse_seconds = time.perf_counter() - start
+                errors = sum(isinstance(card, CardParseError) for card in cards)
+                print(f"{workers} worker(s): {len(templates)} pages in {fetch_seconds:.3f}s | {len(cards)} cards ({errors} unparseable) parsed in {parse_seconds:.3f}s")
+        return
+
+    if args.scrape_report:
+        summary = summarize_runs(load_runs(os.path.join('tmp', 'scrape_runs.jsonl')))
+        if not summary:
+            print("No completed scrape runs recorded in 'tmp/scrape_runs.jsonl'. Exiting.")
+        for entry in summary:
+            memory = f"{entry['peak_rss_bytes'] / (1024 * 1024):.0f} MB" if entry['peak_rss_bytes'] is not None else "unknown"
+            phases = ', '.join(f"{name} {seconds:.1f}s" for name, seconds in entry['phases'].items())
+            hit_rate = f"{entry['session_hit_rate']:.0%}" if entry['session_hit_rate'] is not None else "n/a"
+            print(f"{entry['browser']:>8} {entry['profile']:>8} ({entry['card_parser']}, {entry['fetch_mode']} fetch, {entry['runs']} runs): {entry['wall_seconds']:.1f}s wall | peak memory {memory} | session hit rate {hit_rate} | {phases}")
+            if entry['waits']:
+                print("          waits: " + ', '.join(f"{name} {seconds:.1f}s" for name, seconds in entry['waits'].items()))
+        return
+
+    if args.export_csv or args.storage_report:
+        data_processor = DataProcessor()
+        store = open_fellowship_store(data_processor.processed_data_path, "processed_fellowship_list", data_processor.storage_format)
+        if not store.exists():
+            print(f"No processed data found at '{store.path}'. Exiting.")
+            return
+        if args.export_csv:
+            export_csv(store, data_processor.processed_fellowship_csv_path)
+        if args.storage_report:
+            for entry in storage_report(store.read()):
+                print(f"{entry['format']:>8}: {entry['size_bytes']:>10} bytes | load {entry['load_seconds']:.3f}s | write {entry['write_seconds']:.3f}s")
+        return
+
+    if args.parse_benchmark:
+        if not os.path.exists(args.parse_benchmark):
+            print(f"No saved results page found at '{args.parse_benchmark}'. Exiting.")
+            return
+        with open(os.path.join(os.getcwd(), 'configs', 'filters.json'), 'r') as f:
+            browser = json.load(f).get('Browsing', 'firefox')
+        bot = ProfellowBot(browser=browser, profile=args.profile)
+        try:
+            result = bot.benchmark_card_parsing(Path(os.path.abspath(args.parse_benchmark)).as_uri())
+        finally:
+            bot.driver.quit()
+        print(f"Cards: {result['cards']} (HTML parser found {result['html_cards']})")
+        print(f"WebDriver: {result['webdriver_seconds']:.3f}s | HTML: {result['html_seconds']:.3f}s | speedup: {result['speedup'] or 0:.1f}x")
+        print(f"Identical rows: {result['identical']}")
+        for mismatch in result['mismatches']:
+            print(f"  Mismatch: {mismatch}")
+        return
+
     if args.cleartmp:
         file_manager.clear_tmp_folder()
 
@@ -61,7 +147,7 @@ def main():
 
         # Update the config file if a valid browser is specified via command line
         # --- Bot Execution ---
-        bot = ProfellowBot(browser=browser, notify_app=args.notify_app)
+        bot = ProfellowBot(browser=browser, notify_app=args.notify_app, profile=args.profile, fetch_mode=args.fetch_mode)
         bot.run()
 
 if __name__ == "__main__":
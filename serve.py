@@ -0,0 +1,101 @@
+import argparse
+import configparser
+import logging
+import multiprocessing
+import os
+import socket
+import time
+from utils.coordinator import Coordinator, COORDINATOR_ADDRESS_ENV, COORDINATOR_KEY_ENV
+from utils.data_manager import DataManager
+from utils.jobs import JobManager
+from utils.logs import setup_logging
+
+try:
+    import waitress
+except ImportError:  # pragma: no cover - waitress is optional, Werkzeug's threaded server is the fallback
+    waitress = None
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+logger = logging.getLogger('serve')
+
+
+def run_worker(sock, coordinator_address, authkey, worker_number, threads):
+    """Serves the app on the shared listening socket, reading through the coordinator."""
+    os.environ[COORDINATOR_ADDRESS_ENV] = f"{coordinator_address[0]}:{coordinator_address[1]}"
+    os.environ[COORDINATOR_KEY_ENV] = authkey.hex()
+    from app import app
+
+    logger.info("Worker %d: Serving on %s:%s (pid %d)", worker_number, *sock.getsockname()[:2], os.getpid())
+    if waitress is not None:
+        waitress.serve(app, sockets=[sock], threads=threads)
+    else:
+        from werkzeug.serving import make_server
+        host, port = sock.getsockname()[:2]
+        make_server(host, port, app, threaded=True, fd=sock.fileno()).serve_forever()
+
+
+def main():
+    config = configparser.ConfigParser()
+    config.read(os.path.join(APP_DIR, 'config.ini'))
+
+    parser = argparse.ArgumentParser(description="Serve the Fellowship Finder web app with several worker processes.")
+    parser.add_argument('--host', default=config.get('SERVE', 'host', fallback='127.0.0.1'), help="Address to listen on.")
+    parser.add_argument('--port', type=int, default=config.getint('SERVE', 'port', fallback=5000), help="Port to listen on.")
+    parser.add_argument('--workers', type=int, default=config.getint('SERVE', 'workers', fallback=4), help="Number of worker processes.")
+    parser.add_argument('--threads', type=int, default=config.getint('SERVE', 'threads', fallback=8), help="Request threads per worker (waitress only).")
+    args = parser.parse_args()
+
+    os.chdir(APP_DIR)
+    setup_logging()
+    # The coordinator is the only process that writes the processed data or runs pipelines.
+    data_manager = DataManager()
+    authkey = os.urandom(16)
+    coordinator = Coordinator(
+        data_manager,
+        os.path.join(data_manager.processed_data_path, 'snapshots'),
+        authkey,
+        keep_snapshots=config.getint('SERVE', 'keep_snapshots', fallback=3),
+        snapshot_interval=config.getfloat('SERVE', 'snapshot_interval_seconds', fallback=1.0),
+    )
+    coordinator.job_manager = JobManager.from_config(
+        config,
+        cwd=APP_DIR,
+        publish=coordinator.publish_event,
+        on_finish=lambda job: data_manager.refresh_data_if_needed(),
+    )
+    coordinator.start()
+
+    sock = socket.create_server((args.host, args.port), backlog=128)
+    context = multiprocessing.get_context('spawn')
+
+    def start_worker(worker_number):
+        process = context.Process(
+            target=run_worker,
+            args=(sock, coordinator.address, authkey, worker_number, args.threads),
+            name=f"fellowship-worker-{worker_number}",
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    workers = {number: start_worker(number) for number in range(1, max(args.workers, 1) + 1)}
+    logger.info("%d workers on http://%s:%s (%s)", len(workers), args.host, args.port, 'waitress' if waitress is not None else 'werkzeug')
+    try:
+        while True:
+            time.sleep(1)
+            for number, process in list(workers.items()):
+                if not process.is_alive():
+                    logger.warning("Worker %d exited with code %s; restarting it.", number, process.exitcode)
+                    workers[number] = start_worker(number)
+    except KeyboardInterrupt:
+        logger.info("Shutting down.")
+    finally:
+        for process in workers.values():
+            process.terminate()
+        for process in workers.values():
+            process.join(timeout=5)
+        sock.close()
+
+
+if __name__ == "__main__":
+    main()
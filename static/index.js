@@ -1,7 +1,8 @@
 document.addEventListener('DOMContentLoaded', () => {
     const fellowshipCardsContainer = document.getElementById('fellowship-cards-container');
 
-    let currentPage = 1;
+    // Keyset cursor for the next page; null means start from the first result
+    let nextCursor = null;
     let itemsPerPage = document.getElementById('items-per-page').value;
     let recentlyRemovedId = null;
     let undoTimeout = null;
@@ -20,7 +21,7 @@ document.addEventListener('DOMContentLoaded', () => {
     });
 
     getResultsBtn.addEventListener('click', () => {
-        currentPage = 1;
+        nextCursor = null;
         fellowshipCardsContainer.innerHTML = '';
         fetchFellowships();
     });
@@ -28,14 +29,13 @@ document.addEventListener('DOMContentLoaded', () => {
     const itemsPerPageSelector = document.getElementById('items-per-page');
     itemsPerPageSelector.addEventListener('change', () => {
         itemsPerPage = itemsPerPageSelector.value;
-        currentPage = 1;
+        nextCursor = null;
         fellowshipCardsContainer.innerHTML = '';
         fetchFellowships();
     });
 
     const loadMoreBtn = document.getElementById('load-more-btn');
     loadMoreBtn.addEventListener('click', () => {
-        currentPage++;
         fetchFellowships();
     });
 
@@ -77,7 +77,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 .then(response => response.json())
                 .then(data => {
                     if(data.success) {
-                        currentPage = 1;
+                        nextCursor = null;
                         fellowshipCardsContainer.innerHTML = '';
                         fetchFellowships(); // Re-fetch with current filters
                         showNotification('Data refreshed successfully!');
@@ -158,19 +158,28 @@ document.addEventListener('DOMContentLoaded', () => {
         const keywords = searchInput.value;
 
         const queryParams = new URLSearchParams({
-            page: currentPage,
             per_page: itemsPerPage,
+            fields: 'card',
             min_stars: minStars,
             favorites_first: favoritesFirst,
             show_removed: showRemoved,
             keywords: keywords
         });
+        if (nextCursor) {
+            queryParams.set('cursor', nextCursor);
+        }
 
-        fetch(`/api/fellowships?${queryParams.toString()}`)
+        // Revalidate with the server's ETag: unchanged results come back as an empty 304
+        fetch(`/api/fellowships?${queryParams.toString()}`, { cache: 'no-cache' })
             .then(response => response.json())
             .then(data => {
                 document.getElementById('total-opportunities').textContent = data.total_count;
+                nextCursor = data.next_cursor;
                 data.fellowships.forEach(fellowship => {
+                    // A card un-favorited while favorites come first moves further down and can come back
+                    if (fellowshipCardsContainer.querySelector(`[data-id="${fellowship.id}"]`)) {
+                        return;
+                    }
                     fellowshipCardsContainer.appendChild(createFellowshipCard(fellowship));
                 });
 
@@ -336,7 +345,7 @@ document.addEventListener('DOMContentLoaded', () => {
             .then(response => response.json())
             .then(data => {
                 if (data.success) {
-                    currentPage = 1;
+                    nextCursor = null;
                     fellowshipCardsContainer.innerHTML = '';
                     fetchFellowships();
                 }
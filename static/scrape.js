@@ -260,7 +260,9 @@ function saveFiltersAndStartScraping(formData) {
         })
         .then(data => {
             if (data.success) {
-                alert('Scraping process started successfully! You will be redirected to the main page.');
+                alert(data.coalesced
+                    ? `${data.message} You will be redirected to the main page.`
+                    : 'Scraping process started successfully! You will be redirected to the main page.');
                 window.location.href = '/';
             } else {
                 throw new Error(data.error || 'Failed to start scraping process.');
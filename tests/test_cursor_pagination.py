@@ -0,0 +1,85 @@
+import pandas as pd
+import pytest
+
+from utils.data_manager import DataManager
+
+
+def _rows(start, count, filler):
+    """Fellowships whose description mentions 'quantum' once among `filler` or more other words."""
+    return [
+        dict(
+            title=f"Quantum Fellowship {i}", location=f"Org {i}", continent="Europe", deadline="2026-01",
+            link=f"https://www.profellow.com/fellowships/q-{i}/",
+            description=" ".join(["quantum"] + ["research"] * (filler + i % 7)),
+            processed="yes", subjects="['physics']", total_compensation="1000", other_funding="travel",
+            length_in_years=1, interest_rating=3.0, favorited=0, show=1, announced="no", links="[]",
+        )
+        for i in range(start, start + count)
+    ]
+
+
+def _write(path, rows):
+    pd.DataFrame(rows).to_csv(path / "data" / "processed_fellowship_list.csv", index=False)
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "config.ini").write_text(
+        "[PATHS]\nprocessed_data = data/\n\n"
+        "[STORAGE]\nformat = csv\n\n"
+        # Reloads happen only when the test asks for them
+        "[RELOAD]\ncheck_interval_seconds = 3600\n"
+    )
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _ids(records):
+    return [record['id'] for record in records]
+
+
+def _scores(query):
+    return {record['id']: record['relevance_score'] for record in query.page(0, query.total_count)}
+
+
+def test_cursor_pages_stay_exact_when_a_reload_rescores_rows(data_dir):
+    rows = _rows(0, 30, filler=5)
+    _write(data_dir, rows)
+    dm = DataManager()
+    filters = {'keywords': ['quantum']}
+
+    query = dm.query_fellowships(filters)
+    first_page, cursor = query.page_after(None, 10)
+    before = _scores(query)
+
+    # New rows change the term's IDF and the average field lengths, so every score moves.
+    _write(data_dir, rows + _rows(100, 40, filler=40))
+    assert dm.reload_if_changed()
+    query = dm.query_fellowships(filters)
+    after = _scores(query)
+    assert all(after[row_id] != score for row_id, score in before.items())
+
+    walked = []
+    while cursor is not None:
+        records, cursor = dm.query_fellowships(filters).page_after(cursor, 10)
+        walked += _ids(records)
+
+    ordering = _ids(query.page(0, query.total_count))
+    last_seen = ordering.index(_ids(first_page)[-1])
+    assert walked == ordering[last_seen + 1:]
+    assert not set(walked) & set(_ids(first_page))
+
+
+def test_cursor_falls_back_to_its_relevance_when_its_row_is_gone(data_dir):
+    _write(data_dir, _rows(0, 30, filler=5))
+    dm = DataManager()
+    filters = {'keywords': ['quantum']}
+
+    query = dm.query_fellowships(filters)
+    first_page, cursor = query.page_after(None, 10)
+    ordering = _ids(query.page(0, query.total_count))
+    dm.update_fellowship_status(_ids(first_page)[-1], 'show', 0)
+
+    records, _ = dm.query_fellowships(filters).page_after(cursor, 30)
+    assert _ids(records) == ordering[10:]
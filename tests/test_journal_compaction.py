@@ -0,0 +1,57 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from utils.data_manager import DataManager
+
+
+@pytest.fixture
+def dm(tmp_path, monkeypatch):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "config.ini").write_text(
+        "[PATHS]\nprocessed_data = data/\n\n"
+        "[STORAGE]\nformat = csv\n\n"
+        # Compactions and reloads happen only when the test asks for them
+        "[JOURNAL]\ncheck_interval_seconds = 3600\n\n"
+        "[RELOAD]\ncheck_interval_seconds = 3600\n"
+    )
+    pd.DataFrame([
+        dict(
+            title=f"Fellowship {i}", location="Org", continent="Europe", deadline="2026-01",
+            link=f"https://www.profellow.com/fellowships/f-{i}/", description="research",
+            processed="yes", subjects="['physics']", total_compensation="1000", other_funding="",
+            length_in_years=1, interest_rating=3.0, favorited=0, show=1, announced="no", links="[]",
+        )
+        for i in range(20)
+    ]).to_csv(tmp_path / "data" / "processed_fellowship_list.csv", index=False)
+    monkeypatch.chdir(tmp_path)
+    return DataManager()
+
+
+def test_status_changes_do_not_wait_for_a_compaction_write(dm, monkeypatch):
+    ids = [record['id'] for record in dm.query_fellowships({}).page(0, 2)]
+    dm.update_fellowship_status(ids[0], 'favorited', 1)
+
+    writing = threading.Event()
+    write = dm.store.write
+
+    def slow_write(df):
+        writing.set()
+        time.sleep(1.0)
+        write(df)
+
+    monkeypatch.setattr(dm.store, 'write', slow_write)
+    compaction = threading.Thread(target=dm.compact_journal)
+    compaction.start()
+    assert writing.wait(5)
+
+    start = time.perf_counter()
+    dm.update_fellowship_status(ids[1], 'favorited', 1)
+    assert time.perf_counter() - start < 0.5
+
+    compaction.join()
+    assert dm._base_signature == dm._file_signature()
+    assert not dm.reload_if_changed()
+    assert dm.journal.entries == 1
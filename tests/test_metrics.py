@@ -0,0 +1,22 @@
+import logging
+
+from app import app, metrics
+from utils.metrics import CallbackMetric
+
+
+def _broken():
+    raise RuntimeError("collector exploded")
+
+
+def test_metrics_endpoint_skips_a_failing_collector(monkeypatch, caplog):
+    monkeypatch.setitem(metrics._metrics, 'fellowship_broken', CallbackMetric('fellowship_broken', 'Always fails.', _broken))
+
+    with caplog.at_level(logging.ERROR, logger='utils.metrics'):
+        response = app.test_client().get('/api/metrics')
+
+    assert response.status_code == 200
+    body = response.get_data(as_text=True)
+    assert 'fellowship_broken' not in body
+    assert '# TYPE fellowship_dataset_version gauge' in body
+    assert '# TYPE fellowship_query_stage_seconds histogram' in body
+    assert any(record.name == 'utils.metrics' and record.exc_info for record in caplog.records)
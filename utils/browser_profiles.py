@@ -0,0 +1,139 @@
+import logging
+from selenium import webdriver
+
+logger = logging.getLogger(__name__)
+
+FULL = 'full'
+HEADLESS = 'headless'
+PROFILES = (FULL, HEADLESS)
+# Browsers the headless profile knows how to configure.
+HEADLESS_BROWSERS = ('firefox', 'chrome')
+
+# Third-party analytics and ad hosts the results page loads; none of them affect the cards.
+DEFAULT_BLOCKED_HOSTS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googlesyndication.com',
+    'facebook.net', 'facebook.com', 'hotjar.com', 'clarity.ms', 'hs-analytics.net', 'hs-scripts.com',
+    'linkedin.com', 'licdn.com', 'twitter.com', 'ads-twitter.com', 'bing.com', 'quantserve.com',
+)
+# Image, media and font files, blocked by URL where the browser has no preference for them.
+BLOCKED_EXTENSIONS = (
+    'png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico',
+    'mp4', 'webm', 'ogg', 'mp3', 'wav', 'm4a',
+    'woff', 'woff2', 'ttf', 'otf', 'eot',
+)
+
+# Injected into every page of the headless profile: transitions and animations finish at once.
+DISABLE_ANIMATIONS_SCRIPT = """
+(function () {
+    var style = document.createElement('style');
+    style.textContent = '*, *::before, *::after { animation: none !important; transition: none !important; scroll-behavior: auto !important; }';
+    (document.head || document.documentElement).appendChild(style);
+    if (window.jQuery) { window.jQuery.fx.off = true; }
+})();
+"""
+
+
+class BrowserProfile:
+    """
+    How ProfellowBot launches its browser.
+
+    `full` is a visible, fullscreen browser that loads everything (the original behaviour).
+    `headless` runs Firefox or Chrome without a window, blocks images, media, fonts and
+    third-party trackers, turns animations off, and uses the eager page-load strategy
+    (navigation returns at DOMContentLoaded; the scraper waits for the elements it needs).
+    Chrome blocks `blocked_hosts` by URL; Firefox relies on its tracking protection list.
+    """
+
+    def __init__(self, name=HEADLESS, window_size=(1920, 1080), blocked_hosts=DEFAULT_BLOCKED_HOSTS):
+        if name not in PROFILES:
+            raise ValueError(f"Unknown browser profile: '{name}'. Please choose one of {', '.join(PROFILES)}.")
+        self.name = name
+        self.window_size = tuple(window_size)
+        self.blocked_hosts = tuple(blocked_hosts)
+
+    @classmethod
+    def from_config(cls, config, name=None):
+        """The profile named `name` (default: [SCRAPE] profile), configured from [SCRAPE]."""
+        name = (name or config.get('SCRAPE', 'profile', fallback=HEADLESS)).lower()
+        width, _, height = config.get('SCRAPE', 'window_size', fallback='1920,1080').partition(',')
+        hosts = config.get('SCRAPE', 'blocked_hosts', fallback=None)
+        return cls(
+            name,
+            window_size=(int(width), int(height or 1080)),
+            blocked_hosts=DEFAULT_BLOCKED_HOSTS if hosts is None else [h.strip() for h in hosts.split(',') if h.strip()],
+        )
+
+    @property
+    def headless(self):
+        return self.name == HEADLESS
+
+    def applies_to(self, browser):
+        return not self.headless or browser in HEADLESS_BROWSERS
+
+    def firefox_options(self):
+        options = webdriver.FirefoxOptions()
+        if not self.headless:
+            return options
+        options.add_argument('-headless')
+        options.add_argument(f'--width={self.window_size[0]}')
+        options.add_argument(f'--height={self.window_size[1]}')
+        options.page_load_strategy = 'eager'
+        for name, value in {
+            'permissions.default.image': 2,
+            'media.autoplay.default': 5,
+            'media.autoplay.blocking_policy': 2,
+            'gfx.downloadable_fonts.enabled': False,
+            'browser.display.use_document_fonts': 0,
+            'privacy.trackingprotection.enabled': True,
+            'privacy.trackingprotection.socialtracking.enabled': True,
+            'ui.prefersReducedMotion': 1,
+            'toolkit.cosmeticAnimations.enabled': False,
+            'browser.cache.disk.enable': False,
+        }.items():
+            options.set_preference(name, value)
+        return options
+
+    def chrome_options(self):
+        options = webdriver.ChromeOptions()
+        if not self.headless:
+            return options
+        options.add_argument('--headless=new')
+        options.add_argument(f'--window-size={self.window_size[0]},{self.window_size[1]}')
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_argument('--autoplay-policy=user-gesture-required')
+        options.add_argument('--force-prefers-reduced-motion')
+        options.add_argument('--disable-extensions')
+        options.page_load_strategy = 'eager'
+        options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        return options
+
+    def prepare(self, driver, browser):
+        """Per-session setup after launch: request blocking and animation removal."""
+        if not self.headless:
+            driver.fullscreen_window()
+            return
+        if browser == 'chrome':
+            try:
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_url_patterns()})
+                driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': DISABLE_ANIMATIONS_SCRIPT})
+            except Exception as e:
+                logger.warning("Could not set up request blocking: %s", e)
+
+    def after_navigation(self, driver):
+        """
+        Adjusts a freshly loaded page. The full profile zooms out so more results fit on
+        screen; the headless profile's window is already large enough, and on Firefox
+        (which has no script-on-new-document hook) animations are switched off here.
+        """
+        if self.headless:
+            driver.execute_script(DISABLE_ANIMATIONS_SCRIPT)
+        else:
+            driver.execute_script("document.body.style.zoom = '0.5';")
+
+    def blocked_url_patterns(self):
+        patterns = [f'*.{extension}' for extension in BLOCKED_EXTENSIONS]
+        patterns += [f'*{extension}?*' for extension in ('.woff', '.woff2', '.mp4', '.webm')]
+        patterns += [f'*://*.{host}/*' for host in self.blocked_hosts]
+        patterns += [f'*://{host}/*' for host in self.blocked_hosts]
+        return patterns
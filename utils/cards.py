@@ -0,0 +1,159 @@
+import re
+from urllib.parse import urljoin
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException
+
+try:
+    from bs4 import BeautifulSoup, Comment, NavigableString, SoupStrainer, Tag
+except ImportError:  # pragma: no cover - without BeautifulSoup only the WebDriver path is available
+    BeautifulSoup = None
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Class names of the parts of a fellowship card on the results page.
+CARD_CLASS = "fellowship"
+HEADER_CLASS = "fellowship-content__header"
+META_CLASS = "fellowship-content__meta"
+META_FIELDS = {
+    'location': "fellowship-meta--organization",
+    'continent': "fellowship-meta--region",
+    'deadline': "fellowship-meta--deadline",
+}
+CARD_FIELDS = ('title', 'link', 'location', 'continent', 'deadline', 'description')
+
+# Elements whose text starts on a new line, as in WebElement.text.
+_BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt', 'figcaption', 'figure',
+    'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav',
+    'ol', 'p', 'pre', 'section', 'table', 'tr', 'ul',
+}
+_SKIPPED_TAGS = {'script', 'style', 'template', 'noscript'}
+_SPACES = re.compile(r'[^\S\n]+')
+# Matches CARD_CLASS as one token of a class attribute, as the strainer sees it unsplit.
+_CARD_CLASS_TOKEN = re.compile(r'(?:^|\s)' + re.escape(CARD_CLASS) + r'(?:\s|$)')
+_BASE_HREF = re.compile(r'<base\s[^>]*href\s*=\s*["\']?([^"\'\s>]+)', re.IGNORECASE)
+
+
+class CardParseError(Exception):
+    """A card on the page lacks a part every fellowship has (header, link, title or metadata)."""
+
+
+def html_parsing_available():
+    return BeautifulSoup is not None
+
+
+def card_from_element(element, skip_links=()):
+    """
+    Reads a card from a live WebElement; every lookup is a WebDriver round trip.
+
+    When the card's link is in `skip_links`, only {'link': ...} is returned and the other
+    lookups are skipped.
+    """
+    header = element.find_element(By.CLASS_NAME, HEADER_CLASS)
+    link = header.find_element(By.TAG_NAME, "a").get_attribute("href")
+    if link in skip_links:
+        return {'link': link}
+    card = {'title': header.find_element(By.TAG_NAME, "h2").text, 'link': link}
+    meta = element.find_element(By.CLASS_NAME, META_CLASS)
+    for field, class_name in META_FIELDS.items():
+        try:
+            card[field] = meta.find_element(By.CLASS_NAME, class_name).text
+        except NoSuchElementException:
+            card[field] = None
+    try:
+        card['description'] = element.find_element(By.TAG_NAME, "p").text
+    except NoSuchElementException:
+        card['description'] = None
+    return card
+
+
+def parse_fellowship_cards(page_source, base_url=None):
+    """
+    Extracts every fellowship card from one snapshot of the results page.
+
+    Returns a list with a card dict (the same fields card_from_element reads) per card, or a
+    CardParseError for cards missing a required part. Links are resolved against the page's
+    <base href> or `base_url`, as the browser does for the href property. Text follows
+    WebElement.text: whitespace collapsed, line breaks at <br> and block elements. Styling
+    that only a browser applies (hidden elements, text-transform) is not reproduced.
+    """
+    if BeautifulSoup is None:
+        raise RuntimeError("beautifulsoup4 is required to parse fellowship cards from HTML.")
+    base = _BASE_HREF.search(page_source)
+    if base is not None:
+        base_url = urljoin(base_url or '', base.group(1))
+    # Only the cards are built into a tree; the rest of the page is just tokenized.
+    soup = BeautifulSoup(page_source, HTML_PARSER, parse_only=SoupStrainer(class_=_CARD_CLASS_TOKEN))
+    return [_parse_card(card, base_url) for card in soup.find_all(class_=CARD_CLASS)]
+
+
+def _parse_card(element, base_url):
+    parts = _first_descendants(element, {'header': (None, HEADER_CLASS), 'meta': (None, META_CLASS), 'description': ('p', None)})
+    header = parts['header']
+    header_parts = _first_descendants(header, {'anchor': ('a', None), 'title': ('h2', None)}) if header is not None else {}
+    anchor = header_parts.get('anchor')
+    title = header_parts.get('title')
+    meta = parts['meta']
+    if anchor is None or title is None or meta is None:
+        return CardParseError(f"Card is missing its {'header link' if anchor is None else 'title' if title is None else 'metadata'}.")
+    href = anchor.get('href')
+    card = {
+        'title': element_text(title),
+        'link': urljoin(base_url, href) if href is not None and base_url else href,
+    }
+    meta_parts = _first_descendants(meta, {field: (None, class_name) for field, class_name in META_FIELDS.items()})
+    for field in META_FIELDS:
+        card[field] = element_text(meta_parts[field])
+    card['description'] = element_text(parts['description'])
+    return card
+
+
+def _first_descendants(tag, wanted):
+    """
+    Finds the first descendant matching each of `wanted` ({key: (tag name, class)}, either
+    may be None) in one pass, like find() per key but without building a filter for each.
+    """
+    found = dict.fromkeys(wanted)
+    remaining = dict(wanted)
+    for child in tag.descendants:
+        if not isinstance(child, Tag):
+            continue
+        classes = child.get('class') or ()
+        for key, (name, class_name) in list(remaining.items()):
+            if (name is None or child.name == name) and (class_name is None or class_name in classes):
+                found[key] = child
+                del remaining[key]
+        if not remaining:
+            break
+    return found
+
+
+def element_text(tag):
+    """Rendered text of a parsed element, following WebElement.text; None if tag is None."""
+    if tag is None:
+        return None
+    parts = []
+    _collect_text(tag, parts)
+    lines = (_SPACES.sub(' ', line).strip() for line in ''.join(parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def _collect_text(tag, parts):
+    for child in tag.children:
+        if isinstance(child, Comment):
+            continue
+        if isinstance(child, NavigableString):
+            parts.append(str(child).replace('\n', ' '))
+        elif child.name == 'br':
+            parts.append('\n')
+        elif child.name not in _SKIPPED_TAGS:
+            block = child.name in _BLOCK_TAGS
+            if block:
+                parts.append('\n')
+            _collect_text(child, parts)
+            if block:
+                parts.append('\n')
@@ -0,0 +1,479 @@
+import logging
+import os
+import queue
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+from utils.data_manager import DataManager
+from utils.jobs import ACTIVE_STATES
+from utils.storage import read_snapshot_manifest, snapshot_store, write_snapshot, SnapshotStore
+
+# Environment variables through which serve.py tells a worker process where its coordinator is.
+COORDINATOR_ADDRESS_ENV = 'FELLOWSHIP_COORDINATOR'
+COORDINATOR_KEY_ENV = 'FELLOWSHIP_COORDINATOR_KEY'
+
+logger = logging.getLogger(__name__)
+
+
+class CoordinatorError(Exception):
+    """Raised by CoordinatorClient when the coordinator rejects or fails a request."""
+
+
+class Coordinator:
+    """
+    Single writer behind the multi-worker server (serve.py).
+
+    Owns the DataManager that writes the processed data (status journal, compaction,
+    reloads after pipeline runs) and the JobManager that runs the pipelines. Worker
+    processes serve reads from memory-mapped snapshots of the dataset and send every write
+    here over a multiprocessing connection.
+
+    Every version of the dataset is announced to subscribed workers, in order: status
+    changes as small 'status' messages the workers apply in memory, reloads as a new
+    snapshot file the workers map in place of the old one. Snapshots that only catch up on
+    status changes are written in the background, at most every `snapshot_interval`
+    seconds, so a worker that (re)starts loads an up-to-date file.
+    """
+
+    def __init__(self, data_manager, snapshot_dir, authkey, address=('127.0.0.1', 0), keep_snapshots=3, snapshot_interval=1.0):
+        self.data_manager = data_manager
+        self.job_manager = None
+        self.snapshot_dir = os.path.abspath(snapshot_dir)
+        self.authkey = authkey
+        self.keep_snapshots = keep_snapshots
+        self.snapshot_interval = snapshot_interval
+        self.manifest = None
+        self._subscribers = set()
+        self._subscribers_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_due = threading.Event()
+        # Version announcements, published in order by one thread (see _publish_announcements)
+        self._announcements = queue.Queue()
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        self._listener = Listener(address, authkey=authkey)
+        self.address = self._listener.address
+
+        data_manager.add_version_listener(self._on_version)
+        if data_manager.data_available:
+            self.publish_snapshot()
+
+    def start(self):
+        threading.Thread(target=self._accept, name="coordinator-listener", daemon=True).start()
+        threading.Thread(target=self._write_due_snapshots, name="coordinator-snapshots", daemon=True).start()
+        threading.Thread(target=self._publish_announcements, name="coordinator-announcements", daemon=True).start()
+        logger.info("Listening on %s:%s; snapshots in %s", self.address[0], self.address[1], self.snapshot_dir)
+
+    def publish_event(self, event_type, data):
+        """Forwards an event (job state, pipeline progress) to every worker's event stream."""
+        self._broadcast({'type': 'event', 'event_type': event_type, 'data': data})
+
+    def publish_snapshot(self, changes=None):
+        """Writes the current dataset as a snapshot and announces it to the workers."""
+        frame = self._copy_frame()
+        if frame is None:
+            return None
+        return self._publish_snapshot(*frame, changes)
+
+    def _copy_frame(self):
+        """(copy of the frame, its version) taken under the data lock, or None before data loads."""
+        dm = self.data_manager
+        with dm._lock:
+            if dm.df is None:
+                return None
+            return dm.df.copy(), dm.data_version
+
+    def _publish_snapshot(self, df, version, changes):
+        # Only the copy is written, so status writes go on while the file is being written.
+        with self._snapshot_lock:
+            if self.manifest is None or self.manifest['version'] < version:
+                self.manifest = write_snapshot(self.snapshot_dir, df, version, keep=self.keep_snapshots, instance_id=self.data_manager.instance_id)
+            manifest = self.manifest
+        self._broadcast({'type': 'snapshot', 'version': manifest['version'], 'manifest': manifest, 'changes': changes or {}})
+        return manifest
+
+    def _on_version(self, version, changes):
+        # Runs under the data lock, inside the write or reload that made the version, so it
+        # only queues the announcement; the snapshot file is written by the publisher thread.
+        if changes.get('reason') in ('status', 'batch'):
+            self._announcements.put(('status', version, changes))
+            self._snapshot_due.set()
+        else:
+            # Loads and reloads change content; workers switch to the new snapshot.
+            self._announcements.put(('snapshot', (self.data_manager.df.copy(), version), changes))
+
+    def _publish_announcements(self):
+        """
+        Announces versions in the order they were made. A status change that follows a reload
+        waits for the reload's snapshot, so workers never apply it to the old data.
+        """
+        while True:
+            kind, payload, changes = self._announcements.get()
+            try:
+                if kind == 'status':
+                    self._broadcast({'type': 'status', 'version': payload, 'changes': changes})
+                else:
+                    self._publish_snapshot(*payload, changes)
+            except Exception as e:
+                logger.exception("Failed to publish version announcement: %s", e)
+
+    def _write_due_snapshots(self):
+        while True:
+            self._snapshot_due.wait()
+            time.sleep(self.snapshot_interval)
+            self._snapshot_due.clear()
+            try:
+                self._catch_up_snapshot()
+            except Exception as e:
+                logger.warning("Failed to write snapshot: %s", e)
+
+    def _catch_up_snapshot(self):
+        """Writes a snapshot if status changes happened since the last one (not announced)."""
+        dm = self.data_manager
+        with dm._lock:
+            if dm.df is None or (self.manifest is not None and self.manifest['version'] >= dm.data_version):
+                return self.manifest
+            df = dm.df.copy()
+            version = dm.data_version
+        with self._snapshot_lock:
+            if self.manifest is None or self.manifest['version'] < version:
+                self.manifest = write_snapshot(self.snapshot_dir, df, version, keep=self.keep_snapshots, instance_id=dm.instance_id)
+            return self.manifest
+
+    def _broadcast(self, message):
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.send(message)
+
+    def _accept(self):
+        while True:
+            try:
+                conn = self._listener.accept()
+            except Exception as e:
+                logger.warning("Rejected a connection: %s", e)
+                continue
+            threading.Thread(target=self._serve_connection, args=(conn,), name="coordinator-connection", daemon=True).start()
+
+    def _serve_connection(self, conn):
+        try:
+            while True:
+                message = conn.recv()
+                if message.get('op') == 'subscribe':
+                    # From here on the connection only carries announcements to the worker.
+                    subscriber = _Subscriber(conn, self._remove_subscriber)
+                    subscriber.send({'ok': True})
+                    with self._subscribers_lock:
+                        self._subscribers.add(subscriber)
+                    return
+                conn.send(self._handle(message))
+        except (EOFError, OSError):
+            conn.close()
+
+    def _remove_subscriber(self, subscriber):
+        with self._subscribers_lock:
+            self._subscribers.discard(subscriber)
+
+    def _handle(self, message):
+        op = message.get('op')
+        handler = getattr(self, f'_op_{op}', None)
+        if handler is None:
+            return {'ok': False, 'error': f"Unknown operation: {op}"}
+        try:
+            return {'ok': True, **handler(message)}
+        except Exception as e:
+            logger.warning("%s failed: %s", op, e)
+            return {'ok': False, 'error': str(e)}
+
+    def _op_hello(self, message):
+        # Status changes since the last snapshot are only in memory; the new worker must
+        # start from a file that includes them (later ones reach it as announcements).
+        return {
+            'instance_id': self.data_manager.instance_id,
+            'snapshot_dir': self.snapshot_dir,
+            'manifest': self._catch_up_snapshot(),
+        }
+
+    def _op_status(self, message):
+        dm = self.data_manager
+        with dm._lock:
+            updated = dm.update_fellowship_status(message['id'], message['field'], message['value'])
+            return {'updated': updated, 'version': dm.data_version}
+
+    def _op_status_batch(self, message):
+        dm = self.data_manager
+        with dm._lock:
+            applied, errors = dm.update_fellowship_statuses(message['operations'])
+            return {'applied': applied, 'errors': errors, 'version': dm.data_version}
+
+    def _op_refresh(self, message):
+        self.data_manager.refresh_data_if_needed()
+        return {}
+
+    def _op_submit_job(self, message):
+        job, created = self.job_manager.submit(message['type'], message['command'])
+        return {'job': job.to_dict(output=True), 'created': created}
+
+    def _op_get_job(self, message):
+        job = self.job_manager.get(message['id'])
+        return {'job': job.to_dict(output=True) if job is not None else None}
+
+    def _op_cancel_job(self, message):
+        job = self.job_manager.cancel(message['id'])
+        return {'job': job.to_dict(output=True) if job is not None else None}
+
+    def _op_jobs(self, message):
+        return {'jobs': [job.to_dict(output=True) for job in self.job_manager.jobs()], 'stats': self.job_manager.stats()}
+
+
+class _Subscriber:
+    """A worker's announcement connection, fed from its own queue so a slow worker never blocks writes."""
+
+    def __init__(self, conn, on_close):
+        self.conn = conn
+        self._on_close = on_close
+        self._queue = queue.Queue()
+        threading.Thread(target=self._run, name="coordinator-subscriber", daemon=True).start()
+
+    def send(self, message):
+        self._queue.put(message)
+
+    def _run(self):
+        while True:
+            message = self._queue.get()
+            try:
+                self.conn.send(message)
+            except (OSError, EOFError, ValueError):
+                self._on_close(self)
+                self.conn.close()
+                return
+
+
+class CoordinatorClient:
+    """
+    A worker's connection to the Coordinator.
+
+    request() sends one operation and waits for its reply (requests from concurrent threads
+    are serialized). subscribe() opens a second connection that receives announcements;
+    'event' messages go to `on_event(event_type, data)`, everything else to the handler.
+    """
+
+    def __init__(self, address, authkey):
+        self.address = address
+        self.authkey = authkey
+        self.on_event = None
+        self._conn = Client(address, authkey=authkey)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls):
+        """The client for the coordinator named in the environment, or None outside serve.py."""
+        address = os.environ.get(COORDINATOR_ADDRESS_ENV)
+        if not address:
+            return None
+        host, port = address.rsplit(':', 1)
+        return cls((host, int(port)), bytes.fromhex(os.environ[COORDINATOR_KEY_ENV]))
+
+    def request(self, op, **params):
+        with self._lock:
+            self._conn.send({'op': op, **params})
+            reply = self._conn.recv()
+        if not reply.pop('ok', False):
+            raise CoordinatorError(reply.get('error', 'Coordinator request failed.'))
+        return reply
+
+    def subscribe(self, handler):
+        conn = Client(self.address, authkey=self.authkey)
+        conn.send({'op': 'subscribe'})
+        conn.recv()
+
+        def run():
+            while True:
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    logger.warning("Lost the coordinator's announcement stream.")
+                    return
+                try:
+                    if message.get('type') == 'event':
+                        if self.on_event is not None:
+                            self.on_event(message['event_type'], message['data'])
+                    else:
+                        handler(message)
+                except Exception as e:
+                    logger.warning("Failed to handle %s announcement: %s", message.get('type'), e)
+
+        threading.Thread(target=run, name="coordinator-announcements", daemon=True).start()
+
+
+class SnapshotDataManager(DataManager):
+    """
+    Read-side DataManager of a worker process.
+
+    Loads the coordinator's current snapshot (memory-mapped, shared with the other workers)
+    and follows its announcements: status changes are applied in memory, new snapshots are
+    loaded in place of the old one. Versions and the instance id are the coordinator's, so
+    ETags and cursors are interchangeable between workers. Writes are forwarded to the
+    coordinator; a write returns once this worker has applied it.
+    """
+
+    def __init__(self, client, write_timeout=10.0):
+        self.client = client
+        self.write_timeout = write_timeout
+        self._loading_version = None
+        self._loading_changes = None
+        self._applied = threading.Condition()
+        self._ready = threading.Event()
+        client.subscribe(self._on_announcement)
+        hello = client.request('hello')
+        self.snapshot_dir = hello['snapshot_dir']
+        self.manifest = hello['manifest'] or read_snapshot_manifest(self.snapshot_dir)
+        if self.manifest is not None:
+            self._loading_version = self.manifest['version']
+        super().__init__()
+        self._loading_version = None
+        self.instance_id = hello['instance_id']
+        self._ready.set()
+
+    def _open_store(self):
+        if self.manifest is None:
+            return SnapshotStore(self.snapshot_dir, 'fellowships-v0')
+        return snapshot_store(self.snapshot_dir, self.manifest)
+
+    def _bump_version(self, patch=None, changes=None, version=None):
+        if version is None:
+            version = self._loading_version
+        if self._loading_changes is not None:
+            changes = self._loading_changes
+        super()._bump_version(patch, changes, version)
+
+    def _replay_journal(self):
+        # Snapshots already include every status change up to their version.
+        self._base_signature = None
+
+    def _start_compaction_thread(self):
+        pass
+
+    def _start_reload_thread(self):
+        pass
+
+    def save_fellowship_data(self):
+        pass
+
+    def reload_if_changed(self):
+        return False
+
+    def compact_journal(self):
+        return False
+
+    def refresh_data_if_needed(self):
+        self.client.request('refresh')
+
+    def request_reload(self):
+        self.client.request('refresh')
+
+    def update_fellowship_status(self, fellowship_id, status_type, value):
+        if self.df is None:
+            return False
+        try:
+            value = int(value)
+        except (ValueError, TypeError):
+            return False
+        reply = self.client.request('status', id=str(fellowship_id), field=status_type, value=value)
+        if reply['updated']:
+            self._wait_for_version(reply['version'])
+        return reply['updated']
+
+    def update_fellowship_statuses(self, operations):
+        if self.df is None:
+            return 0, [{'index': None, 'id': None, 'error': 'No fellowship data loaded.'}]
+        reply = self.client.request('status_batch', operations=operations)
+        if reply['applied']:
+            self._wait_for_version(reply['version'])
+        return reply['applied'], reply['errors']
+
+    def _wait_for_version(self, version):
+        with self._applied:
+            if not self._applied.wait_for(lambda: self.data_version >= version, timeout=self.write_timeout):
+                logger.warning("Timed out waiting for version %s (at %s).", version, self.data_version)
+
+    def _on_announcement(self, message):
+        self._ready.wait()
+        version = message['version']
+        with self._lock:
+            if version <= self.data_version:
+                return
+            if message['type'] == 'status':
+                changes = message['changes']
+                applied = False
+                if changes.get('reason') == 'batch':
+                    updates = {}
+                    for update in changes['updates']:
+                        row_index = self.resolve_fellowship_id(update['id'])
+                        if row_index is not None:
+                            updates[(row_index, update['field'])] = update['value']
+                    if updates:
+                        self._apply_status_batch(updates, version=version)
+                        applied = True
+                else:
+                    for fellowship_id in changes.get('ids') or ():
+                        applied = self._apply_status_change(fellowship_id, changes['field'], changes['value'], version=version) is not None
+                if not applied:
+                    # Keep the version in step even if this worker could not resolve the rows.
+                    self._bump_version(changes=changes, version=version)
+            elif message['type'] == 'snapshot':
+                self.manifest = message['manifest']
+                self._loading_version = version
+                self._loading_changes = message.get('changes') or None
+                try:
+                    self.load_fellowship_data()
+                finally:
+                    self._loading_version = None
+                    self._loading_changes = None
+        with self._applied:
+            self._applied.notify_all()
+
+
+class RemoteJob:
+    """A job's state as reported by the coordinator; mirrors the parts of Job the routes use."""
+
+    def __init__(self, data):
+        self._data = data
+        self.id = data['id']
+        self.type = data['type']
+        self.state = data['state']
+
+    @property
+    def active(self):
+        return self.state in ACTIVE_STATES
+
+    def to_dict(self, output=False):
+        data = dict(self._data)
+        if not output:
+            data.pop('output', None)
+        return data
+
+
+class RemoteJobManager:
+    """JobManager interface for worker processes; jobs run in the coordinator."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def submit(self, job_type, command):
+        reply = self.client.request('submit_job', type=job_type, command=list(command))
+        return RemoteJob(reply['job']), reply['created']
+
+    def get(self, job_id):
+        job = self.client.request('get_job', id=str(job_id))['job']
+        return RemoteJob(job) if job is not None else None
+
+    def cancel(self, job_id):
+        job = self.client.request('cancel_job', id=str(job_id))['job']
+        return RemoteJob(job) if job is not None else None
+
+    def jobs(self):
+        return [RemoteJob(job) for job in self.client.request('jobs')['jobs']]
+
+    def stats(self):
+        return self.client.request('jobs')['stats']
@@ -1,14 +1,19 @@
 import configparser
+import logging
 import os
 import re
 import json
+import time
 import pandas as pd
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
 from tqdm import tqdm
+from utils.cards import card_from_element, parse_fellowship_cards
 from utils.data_manager import format_deadline
+from utils.storage import open_fellowship_store
+from utils.events import report_progress
+from utils.logs import sampled
 from datetime import datetime
-import sys
+
+logger = logging.getLogger(__name__)
 
 class DataProcessor:
     def __init__(self):
@@ -20,6 +25,7 @@ class DataProcessor:
         os.makedirs(self.processed_data_path, exist_ok=True)
         self.fellowship_csv_path = os.path.join(self.raw_data_path, "raw_fellowship_list.csv")
         self.processed_fellowship_csv_path = os.path.join(self.processed_data_path, "processed_fellowship_list.csv")
+        self.storage_format = config.get('STORAGE', 'format', fallback='feather')
         
         # Load keywords from filters.json
         self.configs_path = config.get('PATHS', 'configs', fallback='configs/')
@@ -42,98 +48,102 @@ class DataProcessor:
         lower_words = [word.lower() for word in words]
 
         if keyword_type == "AND":
-            if all(word in text_to_search for word in lower_words):
-                print(f"Fellowship '{title}' passed AND filter.")
-                return True
-            else:
-                print(f"Fellowship '{title}' failed AND filter.")
-                return False
+            passed = all(word in text_to_search for word in lower_words)
         elif keyword_type == "OR":
-            if any(word in text_to_search for word in lower_words):
-                print(f"Fellowship '{title}' passed OR filter.")
-                return True
-            else:
-                print(f"Fellowship '{title}' failed OR filter.")
-                return False
-        
-        return True # Default to passing if type is not AND/OR
+            passed = any(word in text_to_search for word in lower_words)
+        else:
+            return True # Default to passing if type is not AND/OR
+
+        logger.debug("Fellowship '%s' %s %s filter.", title, 'passed' if passed else 'failed', keyword_type, extra=sampled('keyword_filter'))
+        return passed
 
 
     def process_fellowships(self, fellowship_elements):
-        print(f"Processing {len(fellowship_elements)} fellowship elements.")
-        
+        """Adds new fellowships from live card WebElements, reading each field over WebDriver."""
+        logger.info("Processing %d fellowship elements.", len(fellowship_elements))
+        existing_links = set()
+
+        def cards():
+            for element in fellowship_elements:
+                try:
+                    yield card_from_element(element, existing_links)
+                except Exception as e:
+                    yield e
+
+        self._process_cards(cards(), len(fellowship_elements), existing_links)
+
+    def process_fellowship_html(self, page_source, base_url=None):
+        """Adds new fellowships parsed from one page_source snapshot of the results page; returns the card count."""
+        return self.process_fellowship_pages([page_source], base_url)
+
+    def process_fellowship_pages(self, page_sources, base_url=None):
+        """Adds new fellowships parsed from the HTML of each page of results, in order; returns the card count."""
+        start = time.perf_counter()
+        cards = [card for page_source in page_sources for card in parse_fellowship_cards(page_source, base_url)]
+        logger.info(
+            "Parsed %d fellowship cards from %d bytes of HTML in %.3fs.",
+            len(cards), sum(len(page_source) for page_source in page_sources), time.perf_counter() - start,
+        )
+        self._process_cards(cards, len(cards))
+        return len(cards)
+
+    def _process_cards(self, cards, total, existing_links=None):
+        """
+        Appends the cards that are new and pass the keyword filter to the raw CSV.
+
+        `cards` yields card dicts (see utils.cards) or the exception raised reading a card.
+        `existing_links` is filled with the links already in the CSV before the first card
+        is read, then with each added card's link.
+        """
+        existing_links = set() if existing_links is None else existing_links
+
         # Load existing data or create a new DataFrame
         if os.path.exists(self.fellowship_csv_path):
             df = pd.read_csv(self.fellowship_csv_path)
-            existing_links = set(df['link'].tolist())
-            print(f"Loaded existing data from {self.fellowship_csv_path}. Found {len(existing_links)} existing links.")
+            existing_links.update(df['link'].tolist())
+            logger.info("Loaded existing data from %s. Found %d existing links.", self.fellowship_csv_path, len(existing_links))
         else:
             df = pd.DataFrame(columns=['title', 'location', 'continent', 'deadline', 'link', 'description', 'processed'])
-            existing_links = set()
-            print("No existing data file found. A new one will be created.")
+            logger.info("No existing data file found. A new one will be created.")
 
         new_fellowships = []
+        duplicates = filtered_out = errors = 0
 
-        for element in fellowship_elements:
+        for position, card in enumerate(cards, start=1):
+            if position % 25 == 0 or position == total:
+                report_progress('parse', current=position, total=total)
             try:
-                # Extract title and link
-                header = element.find_element(By.CLASS_NAME, "fellowship-content__header")
-                link_element = header.find_element(By.TAG_NAME, "a")
-                link = link_element.get_attribute("href")
+                if isinstance(card, Exception):
+                    raise card
 
+                link = card['link']
                 if link in existing_links:
-                    print(f"Skipping duplicate fellowship: {link}")
+                    duplicates += 1
+                    logger.debug("Skipping duplicate fellowship: %s", link, extra=sampled('duplicate'))
                     continue
 
-                title = header.find_element(By.TAG_NAME, "h2").text
-
-                # Extract metadata
-                meta = element.find_element(By.CLASS_NAME, "fellowship-content__meta")
-                
-                try:
-                    location = meta.find_element(By.CLASS_NAME, "fellowship-meta--organization").text
-                except NoSuchElementException:
-                    location = None
-                
-                try:
-                    continent = meta.find_element(By.CLASS_NAME, "fellowship-meta--region").text
-                except NoSuchElementException:
-                    continent = None
-
-                try:
-                    deadline = meta.find_element(By.CLASS_NAME, "fellowship-meta--deadline").text
-                except NoSuchElementException:
-                    deadline = None
-                
-                # Description
-                # The user mentioned "p1" class, which is likely a typo for a <p> tag.
-                # I'll look for a `p` tag inside the element.
-                try:
-                    description = element.find_element(By.TAG_NAME, "p").text
-                except NoSuchElementException:
-                    description = None
-
                 # Keyword Filtering
-                if not self._passes_keyword_filter(title, description):
+                if not self._passes_keyword_filter(card['title'], card['description']):
+                    filtered_out += 1
                     continue
-                
-                # Format the deadline
-                formatted_deadline = format_deadline(deadline)
-                
+
                 new_fellowships.append({
-                    'title': title,
-                    'location': location,
-                    'continent': continent,
-                    'deadline': formatted_deadline,
+                    'title': card['title'],
+                    'location': card['location'],
+                    'continent': card['continent'],
+                    'deadline': format_deadline(card['deadline']),
                     'link': link,
-                    'description': description,
+                    'description': card['description'],
                     'processed': 'no'
                 })
-                
+
                 existing_links.add(link)
 
             except Exception as e:
-                print(f"Error processing a fellowship element: {e}")
+                errors += 1
+                logger.warning("Error processing a fellowship element: %s", e, extra=sampled('element_error'))
+
+        logger.info("Skipped %d duplicates and %d fellowships that failed the keyword filter; %d elements could not be parsed.", duplicates, filtered_out, errors)
 
         if new_fellowships:
             new_df = pd.DataFrame(new_fellowships)
@@ -143,31 +153,32 @@ class DataProcessor:
             
             df = pd.concat([df, new_df], ignore_index=True)
             df.to_csv(self.fellowship_csv_path, index=False)
-            print(f"Added {len(new_fellowships)} new fellowships. Total fellowships: {len(df)}")
+            logger.info("Added %d new fellowships. Total fellowships: %d", len(new_fellowships), len(df))
         else:
-            print("No new fellowships to add.")
+            logger.info("No new fellowships to add.")
 
     def refine_and_save_fellowships(self, refiner):
         if not os.path.exists(self.fellowship_csv_path):
-            print("Raw fellowship data not found.")
+            logger.warning("Raw fellowship data not found.")
             return
 
         raw_df = pd.read_csv(self.fellowship_csv_path)
         unprocessed_df = raw_df[raw_df['processed'] == 'no']
 
         if unprocessed_df.empty:
-            print("No new fellowships to process.")
+            logger.info("No new fellowships to process.")
             return
 
-        print(f"Found {len(unprocessed_df)} unprocessed fellowships to refine.")
+        logger.info("Found %d unprocessed fellowships to refine.", len(unprocessed_df))
         try:
             refiner_model = getattr(refiner, 'model', 'unknown')
-            print(f"Refiner status -> enabled={refiner.enabled}, model={refiner_model}")
+            logger.info("Refiner status -> enabled=%s, model=%s", refiner.enabled, refiner_model)
         except Exception:
             pass
 
-        if os.path.exists(self.processed_fellowship_csv_path):
-            processed_df = pd.read_csv(self.processed_fellowship_csv_path)
+        processed_store = open_fellowship_store(self.processed_data_path, "processed_fellowship_list", self.storage_format)
+        if processed_store.exists():
+            processed_df = processed_store.read()
             
             # Ensure all necessary columns exist
             expected_cols = [
@@ -198,15 +209,17 @@ class DataProcessor:
                         processed_df[col] = ""
             
             # Save the updated DataFrame
-            processed_df.to_csv(self.processed_fellowship_csv_path, index=False)
-            print(f"Updated processed_fellowship_list.csv with missing columns.")
+            processed_store.write(processed_df)
+            logger.info("Updated %s with missing columns.", processed_store.path)
         else:
             processed_df = pd.DataFrame()
 
         refined_data_list = []
         
         # Wrap the loop with tqdm for a progress bar
-        for index, row in tqdm(unprocessed_df.iterrows(), total=unprocessed_df.shape[0], desc="Refining Fellowships"):
+        total = unprocessed_df.shape[0]
+        for position, (index, row) in enumerate(tqdm(unprocessed_df.iterrows(), total=total, desc="Refining Fellowships"), start=1):
+            report_progress('refine', current=position, total=total)
             try:
                 if refiner.enabled:
                     refined_data = refiner.refine(row)
@@ -232,8 +245,7 @@ class DataProcessor:
                         refined_data_list.append(cleaned_data)
                         raw_df.loc[index, 'processed'] = 'yes'
             except Exception as e:
-                tqdm.write(f"An error occurred while refining row {index + 2}: {e}")
-                sys.stdout.flush()
+                logger.error("An error occurred while refining row %d: %s", index + 2, e)
                 raw_df.loc[index, 'processed'] = 'error'
 
         if refined_data_list:
@@ -245,11 +257,11 @@ class DataProcessor:
                 processed_df = pd.concat([processed_df, new_processed_df], ignore_index=True)
 
             processed_df.drop_duplicates(subset=['link'], keep='last', inplace=True)
-            processed_df.to_csv(self.processed_fellowship_csv_path, index=False)
-            print(f"Saved/updated {len(new_processed_df)} refined fellowships to {self.processed_fellowship_csv_path}")
+            processed_store.write(processed_df)
+            logger.info("Saved/updated %d refined fellowships to %s", len(new_processed_df), processed_store.path)
 
             raw_df.to_csv(self.fellowship_csv_path, index=False)
-            print("Updated raw_fellowship_list.csv with processed status.")
+            logger.info("Updated raw_fellowship_list.csv with processed status.")
 
     def _clean_and_validate_refined_data(self, data):
         # Default values for all possible refined keys
@@ -323,8 +335,7 @@ class DataProcessor:
             data['show'] = int(data.get('show', 1))
 
         except (ValueError, TypeError) as e:
-            tqdm.write(f"Data validation error for link {data.get('link', 'N/A')}: {e}")
-            sys.stdout.flush()
+            logger.warning("Data validation error for link %s: %s", data.get('link', 'N/A'), e)
             # Still return data with defaults even if a field fails validation
             return data
 
@@ -1,7 +1,34 @@
+import base64
 import configparser
+import hashlib
+import json
+import logging
 import os
+import threading
+import time
+from collections import namedtuple
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from utils.search_index import KeywordIndex, SEARCH_FIELDS, build_search_text
+from utils.ranking import BM25Ranker, DEFAULT_FIELD_WEIGHTS
+from utils.query_cache import QueryCache
+from utils.fragment_cache import FragmentCache
+from utils.subjects import SubjectVocabulary, parse_subjects_value
+from utils.facets import FacetIndex
+from utils.status_journal import StatusJournal
+from utils.storage import open_fellowship_store, export_csv
+from utils.frame_memory import column_memory, conform_frame, memory_report, optimize_frame
+from utils.metrics import QUERY_STAGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Normalized form of the filters accepted by DataManager.query_fellowships, used as the cache key.
+QueryKey = namedtuple('QueryKey', ['show_removed', 'min_stars', 'favorites_first', 'keywords', 'subjects'])
+# Cached result of a query. positions, keyword_matches, scores and sort_keys are aligned;
+# relevance_levels holds the distinct relevance values (scores, or matches) in ascending order.
+QueryResult = namedtuple('QueryResult', ['positions', 'keyword_matches', 'scores', 'sort_keys', 'relevance_levels'])
+EMPTY_RESULT = QueryResult(np.empty(0, dtype=np.intp), None, None, None, None)
 
 class DataManager:
     def __init__(self):
@@ -9,101 +36,369 @@ class DataManager:
         config.read('config.ini')
         self.processed_data_path = config.get('PATHS', 'processed_data', fallback='data/processed/')
         self.fellowship_csv_path = os.path.join(self.processed_data_path, "processed_fellowship_list.csv")
-        print(f"DataManager: Checking for processed data file at: {os.path.abspath(self.fellowship_csv_path)}")
+        self.storage_format = config.get('STORAGE', 'format', fallback='feather')
+        self.store = None
+        self.load_stats = {}
+        self.memory_optimized = config.getboolean('MEMORY', 'optimize', fallback=True)
+        self._memory_before = {}
+        logger.info("Checking for processed data in: %s (format=%s)", os.path.abspath(self.processed_data_path), self.storage_format)
         self.df = None
+        self.search_index = KeywordIndex()
+        # Keyword results are ordered by BM25 relevance, or by the number of matching keywords
+        self.ranking = config.get('SEARCH', 'ranking', fallback='bm25').lower()
+        self.ranking_params = {
+            'field_weights': {
+                field: config.getfloat('SEARCH', f'{field}_weight', fallback=weight)
+                for field, weight in DEFAULT_FIELD_WEIGHTS.items()
+            },
+            'k1': config.getfloat('SEARCH', 'bm25_k1', fallback=1.2),
+            'b': config.getfloat('SEARCH', 'bm25_b', fallback=0.75),
+        }
+        self.ranker = BM25Ranker(**self.ranking_params)
+        self.subject_vocab = SubjectVocabulary()
+        # Per-value row bitsets for the counts served by /api/facets
+        self.facet_index = FacetIndex()
+        self.data_version = 0
+        # Distinguishes this process's versions from those of an earlier run (for ETags)
+        self.instance_id = os.urandom(4).hex()
+        self.query_cache = QueryCache(config.getint('CACHE', 'query_cache_size', fallback=128))
+        # Rendered card HTML per fellowship, valid while the row's version is unchanged
+        self.fragment_cache = FragmentCache(config.getint('CACHE', 'fragment_cache_size', fallback=2000))
+        self._row_versions = {}
+        self._base_row_version = 0
+        self._version_listeners = []
         self.data_available = False
+
+        # Status changes are appended to a journal and folded into the CSV in the background
+        self._lock = threading.RLock()
+        # Serializes rewrites of the base file; compaction writes under it without holding _lock
+        self._write_lock = threading.Lock()
+        self.journal = StatusJournal(os.path.join(self.processed_data_path, "status_journal.jsonl"))
+        self.journal_max_entries = config.getint('JOURNAL', 'max_entries', fallback=500)
+        self.journal_max_bytes = config.getint('JOURNAL', 'max_bytes', fallback=1024 * 1024)
+        self.journal_max_age = config.getfloat('JOURNAL', 'max_age_seconds', fallback=300)
+        self.journal_check_interval = config.getfloat('JOURNAL', 'check_interval_seconds', fallback=15)
+        self._base_signature = None
+
+        # Changes to the processed file on disk are merged in by a background reload thread
+        self.reload_check_interval = config.getfloat('RELOAD', 'check_interval_seconds', fallback=5)
+        self._reload_requested = threading.Event()
+        self._row_hashes = {}
+        self._row_for_link = {}
+        self._row_for_id = {}
+
         self.load_fellowship_data()
+        self._start_compaction_thread()
+        self._start_reload_thread()
 
     def refresh_data_if_needed(self):
-        """Checks for the data file and loads it if it wasn't available before."""
-        file_exists = os.path.exists(self.fellowship_csv_path)
+        """
+        Checks for the data file and loads it if it wasn't available before.
+
+        When data is already loaded, an incremental reload is scheduled on the background
+        reload thread instead, so the caller does not wait for it.
+        """
+        file_exists = self._data_file_exists()
         # If file now exists, but we previously thought it didn't
         if file_exists and not self.data_available:
-            print("DataManager: Data file found on refresh. Reloading...")
+            logger.info("Data file found on refresh. Reloading...")
             self.load_fellowship_data()
+        elif file_exists:
+            self.request_reload()
         # If file does not exist, update state
         elif not file_exists:
             self.data_available = False
 
+    def request_reload(self):
+        """Wakes the reload thread to check the processed file for changes now."""
+        self._reload_requested.set()
+
+    def _data_file_exists(self):
+        return os.path.exists(self.fellowship_csv_path) or (self.store is not None and self.store.exists())
+
+    def _open_store(self):
+        """The store the fellowship table is loaded from."""
+        return open_fellowship_store(self.processed_data_path, "processed_fellowship_list", self.storage_format)
+
     def load_fellowship_data(self):
-        if not os.path.exists(self.fellowship_csv_path):
-            print(f"DataManager: Data file not found at {self.fellowship_csv_path}")
+        try:
+            self.store = self._open_store()
+        except Exception as e:
+            logger.error("Error opening fellowship data store: %s", e)
+            self.data_available = False
+            return
+
+        if not self.store.exists():
+            logger.info("Data file not found at %s", self.store.path)
             if self.data_available: # Only print if state is changing
-                print("DataManager: Processed data file NOT FOUND.")
+                logger.info("Processed data file NOT FOUND.")
             self.data_available = False
             return
         
         if not self.data_available: # Only print if state is changing
-            print("DataManager: Processed data file FOUND. Loading data.")
+            logger.info("Processed data file FOUND. Loading data.")
         try:
-            print(f"DataManager: Loading data from {self.fellowship_csv_path}")
-            self.df = pd.read_csv(self.fellowship_csv_path)
+            logger.info("Loading data from %s", self.store.path)
+            start = time.perf_counter()
+            self.df = self.store.read()
+            self.load_stats = {
+                'format': self.store.format_name,
+                'path': self.store.path,
+                'size_bytes': self.store.size_bytes,
+                'read_seconds': time.perf_counter() - start,
+            }
             self.ensure_required_columns()
             self._coerce_column_types()
+            self._replay_journal()
+            self._decode_subjects()
+            self._optimize_memory()
+            self.search_index = KeywordIndex.from_frame(self.df)
+            self.ranker = BM25Ranker.from_frame(self.df, **self.ranking_params)
+            self.facet_index = FacetIndex.from_frame(self.df, self.subject_vocab)
+            self._row_for_link = dict(zip(self.df['link'].tolist(), self.df.index.tolist())) if 'link' in self.df.columns else {}
+            self._row_for_id = {fellowship_id_for_link(link): row_index for link, row_index in self._row_for_link.items()}
+            self._row_hashes = _content_hashes(self.df)
+            self.load_stats['rows'] = len(self.df)
+            self._bump_version(changes={'reason': 'load', 'rows': len(self.df)})
+            self._row_versions = {}
+            self._base_row_version = self.data_version
+            self.fragment_cache.clear()
             self.data_available = True
-            print(f"DataManager: Data loaded successfully. Total rows: {len(self.df)}")
+            self.load_stats['total_seconds'] = time.perf_counter() - start
+            logger.info("Data loaded successfully. Total rows: %s | format=%s size=%s bytes read=%.3fs total=%.3fs", len(self.df), self.load_stats['format'], self.load_stats['size_bytes'], self.load_stats['read_seconds'], self.load_stats['total_seconds'])
         except Exception as e:
-            print(f"Error loading fellowship data: {e}")
+            logger.error("Error loading fellowship data: %s", e)
             self.data_available = False
 
     def ensure_required_columns(self):
-        updated = False
-        if 'favorited' not in self.df.columns:
-            self.df['favorited'] = 0
-            updated = True
-        
-        if 'show' not in self.df.columns:
-            self.df['show'] = 1
-            updated = True
-
-        if 'interest_rating' not in self.df.columns:
-            self.df['interest_rating'] = 0
-            updated = True
-        
-        if 'total_compensation' not in self.df.columns:
-            self.df['total_compensation'] = "N/A"
-            updated = True
-            
-        if 'other_funding' not in self.df.columns:
-            self.df['other_funding'] = ""
-            updated = True
-            
-        if 'subjects' not in self.df.columns:
-            self.df['subjects'] = []
-            updated = True
-            
-        if 'length_in_years' not in self.df.columns:
-            self.df['length_in_years'] = 0
-            updated = True
-
-        if 'announced' not in self.df.columns:
-            self.df['announced'] = "no"
-            updated = True
-
-        if updated:
+        if _add_missing_columns(self.df):
             self.save_fellowship_data()
 
     def save_fellowship_data(self):
-        if self.df is not None:
-            self.df.to_csv(self.fellowship_csv_path, index=False)
+        """Rewrites the full processed data file atomically (write to a temp file, then rename)."""
+        with self._lock:
+            if self.df is not None:
+                self._write_base_file(self.df)
+
+    def _write_base_file(self, df):
+        with self._write_lock:
+            self.store.write(df)
+        self._base_signature = self._file_signature()
+
+    def _file_signature(self, store=None):
+        """(mtime, size) of the processed data file, or None if it does not exist."""
+        store = store or self.store
+        try:
+            stat = os.stat(store.path)
+        except (OSError, AttributeError):
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def export_fellowship_csv(self, csv_path=None):
+        """Exports the processed data (including pending journal changes) as CSV."""
+        self.compact_journal()
+        return export_csv(self.store, csv_path or self.fellowship_csv_path)
+
+    def _replay_journal(self):
+        """Applies journaled status changes that have not been compacted into the base file yet."""
+        self._base_signature = self._file_signature()
+        if 'link' not in self.df.columns:
+            return
+        row_for_link = dict(zip(self.df['link'].tolist(), self.df.index.tolist()))
+        applied = 0
+        for record in self.journal.replay():
+            row_index = row_for_link.get(record.get('link'))
+            field = record.get('field')
+            if row_index is None or field not in self.df.columns:
+                continue
+            self.df.at[row_index, field] = record.get('value')
+            applied += 1
+        if applied:
+            logger.info("Replayed %s journaled status changes.", applied)
+
+    def _journal_due_for_compaction(self):
+        journal = self.journal
+        if journal.entries == 0:
+            return False
+        if journal.entries >= self.journal_max_entries or journal.size_bytes >= self.journal_max_bytes:
+            return True
+        return journal.first_entry_time is not None and time.time() - journal.first_entry_time >= self.journal_max_age
+
+    def compact_journal(self):
+        """Folds pending journal records into the processed CSV and discards them."""
+        with self._lock:
+            if self.df is None or self.store is None or not self.store.exists():
+                return False
+            if self._file_signature() != self._base_signature:
+                # Someone else (the refiner) rewrote the file; keep the journal until it is reloaded.
+                logger.info("Processed file changed on disk; postponing journal compaction.")
+                return False
+            if not self.journal.rotate():
+                return False
+            snapshot = self.df.copy()
+            store = self.store
+            base_signature = self._base_signature
+        try:
+            # The rewrite runs outside _lock so status clicks are not held up behind it.
+            with self._write_lock:
+                store.write(snapshot)
+                written = self._file_signature(store)
+            with self._lock:
+                # If a reload or another writer changed the file meanwhile, leave the signature
+                # stale so the reload path picks the file up.
+                if store is self.store and self._base_signature == base_signature and self._file_signature() == written:
+                    self._base_signature = written
+            self.journal.finish_compaction()
+            logger.info("Compacted status journal into %s", self.store.path)
+            return True
+        except Exception as e:
+            logger.error("Journal compaction failed, records kept for replay: %s", e)
+            return False
+
+    def _start_compaction_thread(self):
+        def run():
+            while True:
+                time.sleep(self.journal_check_interval)
+                try:
+                    if self._journal_due_for_compaction():
+                        self.compact_journal()
+                except Exception as e:
+                    logger.exception("Error in journal compaction thread: %s", e)
+
+        thread = threading.Thread(target=run, name="status-journal-compactor", daemon=True)
+        thread.start()
 
     def _coerce_column_types(self):
         """Ensure important columns have expected data types for filtering/sorting."""
         if self.df is None:
             return
-        try:
-            # favorited and show should be 0/1 integers
-            for col in ['favorited', 'show']:
-                if col in self.df.columns:
-                    self.df[col] = pd.to_numeric(self.df[col], errors='coerce', downcast='integer').fillna(0).astype(int)
-            # interest_rating should be float
-            if 'interest_rating' in self.df.columns:
-                self.df['interest_rating'] = pd.to_numeric(self.df['interest_rating'], errors='coerce').fillna(0.0).astype(float)
-            # length_in_years should be integer if present
-            if 'length_in_years' in self.df.columns:
-                self.df['length_in_years'] = pd.to_numeric(self.df['length_in_years'], errors='coerce').fillna(0).astype(int)
-        except Exception as e:
-            print(f"DataManager: Warning - failed to coerce column types: {e}")
+        _coerce_frame_types(self.df)
+
+    def _start_reload_thread(self):
+        def run():
+            while True:
+                self._reload_requested.wait(self.reload_check_interval)
+                self._reload_requested.clear()
+                try:
+                    self.reload_if_changed()
+                except Exception as e:
+                    logger.exception("Error in reload thread: %s", e)
+
+        thread = threading.Thread(target=run, name="processed-data-reloader", daemon=True)
+        thread.start()
+
+    def reload_if_changed(self):
+        """
+        Merges new or changed rows from the processed file into the live frame.
+
+        Returns True if anything was reloaded. Favorite/show values of rows already loaded
+        are kept, since the app is the only writer of those columns.
+        """
+        store = open_fellowship_store(self.processed_data_path, "processed_fellowship_list", self.storage_format)
+        if not store.exists():
+            return False
+        if self.df is None or not self.data_available:
+            self.load_fellowship_data()
+            return self.data_available
+
+        signature = self._file_signature(store)
+        if self.store is not None and store.path == self.store.path and signature == self._base_signature:
+            return False
+
+        start = time.perf_counter()
+        new_df = store.read()
+        _add_missing_columns(new_df)
+        _coerce_frame_types(new_df)
+        new_df['subjects'] = pd.Series([parse_subjects_value(v) for v in new_df['subjects'].tolist()], index=new_df.index, dtype=object)
+
+        with self._lock:
+            live = self.df
+            if 'link' not in new_df.columns or set(new_df.columns) != set(live.columns) or len(new_df) < self.load_stats.get('rows', 0):
+                logger.info("Processed file layout changed; performing a full reload.")
+                self.load_fellowship_data()
+                return True
+
+            new_df = new_df[list(live.columns)].drop_duplicates(subset=['link'], keep='last')
+            if self.memory_optimized:
+                live, new_df = conform_frame(live, new_df)
+            new_hashes = _content_hashes(new_df)
+            changed_rows = []
+            added_rows = []
+            for position, (link, row_hash) in enumerate(zip(new_df['link'].tolist(), new_hashes.values())):
+                row_index = self._row_for_link.get(link)
+                if row_index is None:
+                    added_rows.append(position)
+                elif self._row_hashes.get(link) != row_hash:
+                    changed_rows.append((row_index, position))
+
+            self.store = store
+            self._base_signature = signature
+            self.load_stats['rows'] = len(new_df)
+            if not changed_rows and not added_rows:
+                logger.info("Processed file touched but no rows changed.")
+                return False
+
+            merged = live.copy()
+            content_columns = [col for col in merged.columns if col not in STATUS_COLUMNS]
+            for row_index, position in changed_rows:
+                for col in content_columns:
+                    merged.at[row_index, col] = new_df[col].iat[position]
+            if added_rows:
+                additions = new_df.iloc[added_rows]
+                first_label = int(merged.index.max()) + 1 if len(merged) else 0
+                additions.index = pd.RangeIndex(first_label, first_label + len(additions))
+                merged = pd.concat([merged, additions])
+
+            self.df = merged
+            touched = [row_index for row_index, _ in changed_rows] + list(merged.index[len(live):])
+            for row_index in touched:
+                link = merged.at[row_index, 'link']
+                self._row_for_link[link] = row_index
+                self._row_for_id[fellowship_id_for_link(link)] = row_index
+            self._row_hashes.update(_content_hashes(merged.loc[touched]))
+            self._reindex_rows(touched)
+            self.facet_index = FacetIndex.from_frame(merged, self.subject_vocab)
+            self._bump_version(changes={
+                'reason': 'reload',
+                'added': [self._public_id(row_index) for row_index in merged.index[len(live):]],
+                'changed': [self._public_id(row_index) for row_index, _ in changed_rows],
+            })
+            self._mark_rows_changed(touched)
+
+        logger.info("Reloaded processed data. added=%s changed=%s total_rows=%s in %.3fs", len(added_rows), len(changed_rows), len(self.df), time.perf_counter() - start)
+        return True
+
+    def _decode_subjects(self):
+        """Parses the subjects column into lists once and builds the subject vocabulary."""
+        subject_lists = [parse_subjects_value(value) for value in self.df['subjects'].tolist()]
+        self.df['subjects'] = pd.Series(subject_lists, index=self.df.index, dtype=object)
+        self.subject_vocab = SubjectVocabulary.from_subject_lists(subject_lists)
+        logger.info("Decoded subjects. vocabulary_size=%s", len(self.subject_vocab))
+
+    def _optimize_memory(self):
+        """Switches the loaded frame to compact column types when [MEMORY] optimize is on."""
+        self._memory_before = column_memory(self.df)
+        if not self.memory_optimized:
+            return
+        self.df = optimize_frame(self.df)
+        report = memory_report(self._memory_before, column_memory(self.df))
+        logger.info("Optimized in-memory frame. %s -> %s bytes (%.0f%%)", report['total_before_bytes'], report['total_after_bytes'], report['ratio'] * 100)
+
+    def memory_report(self):
+        """Per-column memory of the live frame, compared with the frame as it was loaded."""
+        report = memory_report(self._memory_before, column_memory(self.df))
+        report['optimized'] = self.memory_optimized
+        report['rows'] = 0 if self.df is None else len(self.df)
+        report['dtypes'] = {} if self.df is None else {col: str(dtype) for col, dtype in self.df.dtypes.items()}
+        return report
+
+    def get_subject_vocabulary(self):
+        """Returns [{'subject', 'code', 'count'}] for every known subject, most common first."""
+        entries = [
+            {'subject': name, 'code': code, 'count': count}
+            for name, code, count in self.subject_vocab.counts()
+        ]
+        return sorted(entries, key=lambda entry: (-entry['count'], entry['subject'].lower()))
 
     def get_visible_fellowships(self):
         if self.df is None:
@@ -111,70 +406,681 @@ class DataManager:
         return self.df[self.df['show'] == 1]
 
     def get_filtered_fellowships(self, filters):
+        """Returns the filtered fellowships as a DataFrame. Prefer query_fellowships() for paging."""
+        query = self.query_fellowships(filters)
+        return query.to_frame()
+
+    def query_fellowships(self, filters):
+        """
+        Resolves filters to an ordered array of row positions without copying the table.
+
+        Returns a FellowshipQuery; rows are only converted to dicts for the page requested.
+        Results are cached per normalized filter set and dataset version.
+        """
         if self.df is None:
-            return pd.DataFrame()
+            return FellowshipQuery(pd.DataFrame(), EMPTY_RESULT)
+
+        df = self.df
+        version = self.data_version
+        key = self._normalize_filters(filters)
+
+        cached = self.query_cache.get(key, version)
+        if cached is not None:
+            logger.debug("Query cache hit. key=%s rows=%s", key, len(cached.positions))
+            return FellowshipQuery(df, cached, key, self.resolve_fellowship_id)
 
-        df_filtered = self.df.copy()
-        print(f"DataManager: Starting filter. total_rows={len(df_filtered)} show_removed={filters.get('show_removed', False)} min_stars={filters.get('min_stars')} favorites_first={filters.get('favorites_first')} keywords_len={len(filters.get('keywords', []))}")
+        result = self._run_query(df, key)
+        for array in result:
+            if array is not None:
+                array.setflags(write=False)
+        if version == self.data_version:
+            self.query_cache.put(key, version, result)
+        return FellowshipQuery(df, result, key, self.resolve_fellowship_id)
+
+    def facet_counts(self, filters):
+        """
+        Counts per continent, subject, star rating, deadline month, favorited and show value
+        among the fellowships matching `filters`.
+
+        Returns (total_count, {facet: [{'value', 'count'}]}).
+        """
+        query = self.query_fellowships(filters)
+        with QUERY_STAGE_SECONDS.time(stage='facets'):
+            counts = self.facet_index.counts(query.positions)
+        return query.total_count, counts
+
+    def _normalize_filters(self, filters):
+        """Maps equivalent filter dicts onto the same QueryKey."""
+        keywords = [str(kw).strip().lower() for kw in filters.get('keywords', []) or []]
+        subjects = [str(subject).strip() for subject in filters.get('subjects', []) or []]
+        return QueryKey(
+            show_removed=bool(filters.get('show_removed', False)),
+            min_stars=max(int(filters.get('min_stars', 1) or 1), 1),
+            favorites_first=bool(filters.get('favorites_first', False)),
+            keywords=tuple(sorted(kw for kw in keywords if kw)),
+            subjects=tuple(sorted(self.subject_vocab.encode(subject for subject in subjects if subject))),
+        )
+
+    def _run_query(self, df, key):
+        """Returns a QueryResult: ordered positions with aligned keyword matches, scores and sort keys."""
+        mask = np.ones(len(df), dtype=bool)
+        logger.debug("Starting filter. total_rows=%s show_removed=%s min_stars=%s favorites_first=%s keywords_len=%s", len(df), key.show_removed, key.min_stars, key.favorites_first, len(key.keywords))
 
         # Filter by 'show' status
-        if not filters.get('show_removed', False):
-            before = len(df_filtered)
-            df_filtered = df_filtered[df_filtered['show'] == 1]
-            print(f"DataManager: After show==1 filter: {len(df_filtered)} (removed {before - len(df_filtered)})")
+        if not key.show_removed:
+            with QUERY_STAGE_SECONDS.time(stage='show'):
+                before = int(mask.sum())
+                mask &= df['show'].to_numpy() == 1
+                after = int(mask.sum())
+            logger.debug("After show==1 filter: %s (removed %s)", after, before - after)
 
         # Filter by minimum stars
-        min_stars = filters.get('min_stars', 1)
-        if min_stars > 1:
-            before = len(df_filtered)
-            df_filtered = df_filtered[df_filtered['interest_rating'] >= min_stars]
-            print(f"DataManager: After min_stars>={min_stars} filter: {len(df_filtered)} (removed {before - len(df_filtered)})")
+        if key.min_stars > 1:
+            with QUERY_STAGE_SECONDS.time(stage='stars'):
+                before = int(mask.sum())
+                mask &= df['interest_rating'].to_numpy() >= key.min_stars
+                after = int(mask.sum())
+            logger.debug("After min_stars>=%s filter: %s (removed %s)", key.min_stars, after, before - after)
 
-        # Handle 'favorites_first' sorting
-        if filters.get('favorites_first', False):
-            df_filtered = df_filtered.sort_values(by='favorited', ascending=False)
-            print("DataManager: Sorted with favorites first")
+        # Filter by subject codes (rows carrying any of the requested subjects)
+        if key.subjects:
+            with QUERY_STAGE_SECONDS.time(stage='subjects'):
+                before = int(mask.sum())
+                mask &= self.subject_vocab.mask(key.subjects, len(df))
+                after = int(mask.sum())
+            logger.debug("After subjects filter: %s (removed %s)", after, before - after)
 
         # Handle search keywords
-        keywords = filters.get('keywords', [])
-        if keywords:
-            df_filtered['keyword_matches'] = df_filtered.apply(
-                lambda row: self._count_keyword_matches(row, keywords), axis=1
-            )
-            before = len(df_filtered)
-            df_filtered = df_filtered[df_filtered['keyword_matches'] > 0]
-            df_filtered = df_filtered.sort_values(by='keyword_matches', ascending=False)
-            print(f"DataManager: After keywords filter: {len(df_filtered)} (removed {before - len(df_filtered)})")
-        
-        return df_filtered
+        keyword_matches = None
+        if key.keywords:
+            with QUERY_STAGE_SECONDS.time(stage='keywords'):
+                keyword_matches = self._keyword_match_array(df, key.keywords)
+                before = int(mask.sum())
+                mask &= keyword_matches > 0
+                after = int(mask.sum())
+            logger.debug("After keywords filter: %s (removed %s)", after, before - after)
+
+        positions = np.flatnonzero(mask)
+        scores = None
+        if keyword_matches is not None:
+            keyword_matches = keyword_matches[positions]
+            if self.ranking == 'bm25':
+                with QUERY_STAGE_SECONDS.time(stage='rank'):
+                    scores = self._keyword_scores(df, positions, key.keywords)
+        relevance = scores if scores is not None else keyword_matches
+
+        # Order by relevance, then favorites (stable, so file order breaks ties)
+        with QUERY_STAGE_SECONDS.time(stage='sort'):
+            sort_keys = []
+            if key.favorites_first:
+                sort_keys.append(-df['favorited'].to_numpy()[positions])
+            if relevance is not None:
+                sort_keys.append(-relevance)
+            if sort_keys:
+                order = np.lexsort(sort_keys)
+                positions = positions[order]
+                if keyword_matches is not None:
+                    keyword_matches = keyword_matches[order]
+                if scores is not None:
+                    scores = scores[order]
+                relevance = scores if scores is not None else keyword_matches
+
+            favorited = df['favorited'].to_numpy()[positions]
+            levels = np.unique(relevance) if relevance is not None else None
+            sort_keys = query_sort_keys(key, len(df), positions, relevance, favorited, levels)
+        if key.favorites_first:
+            logger.debug("Sorted with favorites first")
+        return QueryResult(positions, keyword_matches, scores, sort_keys, levels)
+
+    def _keyword_scores(self, df, positions, keywords):
+        """BM25F scores for the candidate rows at `positions`."""
+        start = time.perf_counter()
+
+        def texts_for(field):
+            # Only phrase keywords need raw text; read just that column's candidate values.
+            if field not in df.columns:
+                return [''] * len(positions)
+            return df[field].to_numpy()[positions].tolist()
+
+        scores = self.ranker.score(keywords, df.index[positions].tolist(), self.search_index, texts_for=texts_for)
+        logger.debug("Ranked %s candidates with BM25 in %.4fs", len(positions), time.perf_counter() - start)
+        return scores
+
+    def _bump_version(self, patch=None, changes=None, version=None):
+        """
+        Advances the dataset version, carrying over cached results that `patch` can fix up.
+
+        The new version is `version` when given (a worker adopting the coordinator's
+        numbering), otherwise the next one. Version listeners are called with the new
+        version and a `changes` dict describing what changed (reason plus affected
+        fellowship ids where known).
+        """
+        old_version = self.data_version
+        self.data_version = old_version + 1 if version is None else version
+        self.query_cache.advance(old_version, self.data_version, patch)
+        for listener in list(self._version_listeners):
+            try:
+                listener(self.data_version, changes or {})
+            except Exception as e:
+                logger.exception("Version listener failed: %s", e)
+
+    def add_version_listener(self, listener):
+        """Registers `listener(version, changes)` to be called after every version bump."""
+        self._version_listeners.append(listener)
+
+    def _status_change_patch(self, position, status_type, value):
+        """
+        Builds a cache patch for a favorited/show change on a single row.
+
+        Results that do not depend on the changed column are kept as-is, and hiding a row
+        just drops it from results that exclude removed fellowships. Anything else is
+        recomputed on the next request.
+        """
+        def patch(key, cached):
+            positions = cached.positions
+            if status_type == 'favorited':
+                return None if key.favorites_first else cached
+            if status_type == 'show':
+                if key.show_removed:
+                    return cached
+                if value == 0:
+                    keep = positions != position
+                    if keep.all():
+                        return cached
+                    # Sort keys are position based, so the remaining rows keep theirs.
+                    kept = {
+                        field: getattr(cached, field)[keep]
+                        for field in ('positions', 'keyword_matches', 'scores', 'sort_keys')
+                        if getattr(cached, field) is not None
+                    }
+                    for array in kept.values():
+                        array.setflags(write=False)
+                    return cached._replace(**kept)
+            return None
+        return patch
+
+    def row_version(self, fellowship_id):
+        """
+        Dataset version at which a fellowship's row last changed (None if unknown).
 
-    def _count_keyword_matches(self, row, keywords):
-        count = 0
-        search_text = ' '.join([
-            str(row.get('title', '')),
-            str(row.get('description', '')),
-            str(row.get('subjects', ''))
-        ]).lower()
+        Rows keep their version until they are edited or reloaded, so anything derived from
+        a single row (like its rendered card) can be cached under (id, row_version).
+        """
+        row_index = self.resolve_fellowship_id(fellowship_id)
+        if row_index is None:
+            return None
+        return self._row_versions.get(row_index, self._base_row_version)
 
-        for keyword in keywords:
-            if keyword.lower() in search_text:
-                count += 1
-        return count
+    def _mark_rows_changed(self, row_indices):
+        for row_index in row_indices:
+            self._row_versions[row_index] = self.data_version
+            self.fragment_cache.invalidate(self._public_id(row_index))
+
+    def _public_id(self, row_index):
+        """The fellowship id clients see for a row label (see fellowship_id_for_link)."""
+        link = self.df.at[row_index, 'link'] if 'link' in self.df.columns else None
+        return _record_id(row_index, link)
+
+    def query_etag(self, filters, *extra):
+        """
+        Entity tag for a response built from `filters` at the current dataset version.
+
+        Equivalent filter sets share a tag (they normalize to the same QueryKey). `extra`
+        holds anything else the response depends on, such as paging parameters. Any status
+        change or reload bumps the version, so an old tag never matches fresher data.
+        """
+        key = self._normalize_filters(filters)
+        raw = repr((self.instance_id, self.data_version, self.data_available, key, extra))
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:20]
+
+    def cache_stats(self):
+        stats = self.query_cache.stats()
+        stats['data_version'] = self.data_version
+        stats['fragments'] = self.fragment_cache.stats()
+        return stats
+
+    def _keyword_match_array(self, df, keywords):
+        """Returns keyword match counts as an array aligned with the rows of df."""
+        matches = np.zeros(len(df), dtype=np.int64)
+        counts = self.search_index.count_matches(keywords)
+        if counts:
+            positions = df.index.get_indexer(list(counts.keys()))
+            values = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+            found = positions >= 0
+            matches[positions[found]] = values[found]
+        return matches
+
+    def _reindex_rows(self, row_indices):
+        """Refreshes the keyword index and subject codes for rows that were added or changed."""
+        for row_index in row_indices:
+            if row_index in self.df.index:
+                row = self.df.loc[row_index]
+                self.search_index.update(row_index, build_search_text(row))
+                self.ranker.update(row_index, row)
+                position = self.df.index.get_loc(row_index)
+                if position < len(self.subject_vocab.row_codes):
+                    self.subject_vocab.set_row(position, row['subjects'])
+                else:
+                    self.subject_vocab.append_row(row['subjects'])
+            else:
+                self.search_index.remove(row_index)
+                self.ranker.remove(row_index)
+
+    def resolve_fellowship_id(self, fellowship_id):
+        """
+        Maps a fellowship id to its row label in the live frame, or None if it is unknown.
+
+        Stable ids are derived from the fellowship link (see fellowship_id_for_link). Plain
+        row labels ("12" or "row-12") are still accepted from older pages.
+        """
+        if self.df is None or fellowship_id is None:
+            return None
+        fellowship_id = str(fellowship_id)
+        row_index = self._row_for_id.get(fellowship_id)
+        if row_index is not None:
+            return row_index
+        label = fellowship_id[len('row-'):] if fellowship_id.startswith('row-') else fellowship_id
+        if label.isdigit() and int(label) in self.df.index:
+            return int(label)
+        return None
 
     def update_fellowship_status(self, fellowship_id, status_type, value):
         if self.df is None:
             return False
 
         try:
-            row_index = int(fellowship_id)
-            if row_index in self.df.index:
-                self.df.loc[row_index, status_type] = int(value)
-                self.save_fellowship_data()
-                return True
-            return False
+            with self._lock:
+                row_index = self._apply_status_change(fellowship_id, status_type, value)
+                if row_index is None:
+                    return False
+                self.journal.append(self.df.at[row_index, 'link'], status_type, int(value))
+            return True
         except (ValueError, TypeError):
             return False
 
+    def update_fellowship_statuses(self, operations):
+        """
+        Applies a batch of {id, field, value} status changes atomically.
+
+        Every operation is validated first; if any is invalid nothing is applied. Otherwise
+        the changes are journaled with a single write and become visible together, under
+        one new version. Returns (applied, errors): the number of changes applied (repeated
+        changes to the same field of a row count once, the last one wins) and a list of
+        {index, id, error} dicts.
+        """
+        if self.df is None:
+            return 0, [{'index': None, 'id': None, 'error': 'No fellowship data loaded.'}]
+        with self._lock:
+            updates, errors = self._resolve_status_operations(operations)
+            if errors:
+                return 0, errors
+            if not updates:
+                return 0, []
+            self.journal.append_many(
+                (self.df.at[row_index, 'link'], field, value) for (row_index, field), value in updates.items()
+            )
+            self._apply_status_batch(updates)
+        return len(updates), []
+
+    def _resolve_status_operations(self, operations):
+        """Validates batch operations. Returns ({(row_index, field): value}, errors)."""
+        if not isinstance(operations, list):
+            return {}, [{'index': None, 'id': None, 'error': 'Operations must be a list.'}]
+        if len(operations) > MAX_BATCH_OPERATIONS:
+            return {}, [{'index': None, 'id': None, 'error': f'At most {MAX_BATCH_OPERATIONS} operations per batch.'}]
+        updates = {}
+        errors = []
+        for index, operation in enumerate(operations):
+            if not isinstance(operation, dict):
+                errors.append({'index': index, 'id': None, 'error': 'Operation must be an object.'})
+                continue
+            fellowship_id = operation.get('id')
+            field = operation.get('field')
+            row_index = self.resolve_fellowship_id(fellowship_id) if fellowship_id is not None else None
+            if row_index is None:
+                errors.append({'index': index, 'id': fellowship_id, 'error': 'Fellowship not found.'})
+                continue
+            if field not in STATUS_COLUMNS:
+                errors.append({'index': index, 'id': fellowship_id, 'error': f"Field must be one of {', '.join(STATUS_COLUMNS)}."})
+                continue
+            try:
+                value = int(operation.get('value'))
+            except (ValueError, TypeError):
+                value = None
+            if value not in (0, 1):
+                errors.append({'index': index, 'id': fellowship_id, 'error': 'Value must be 0 or 1.'})
+                continue
+            updates.pop((row_index, field), None)
+            updates[(row_index, field)] = value
+        return updates, errors
+
+    def _apply_status_batch(self, updates, version=None):
+        """
+        Applies resolved {(row_index, field): value} changes under a single version bump.
+
+        The changed columns are written to a shallow copy of the frame that then replaces
+        the live one, so a request reading the frame sees all of the batch or none of it.
+        """
+        with self._lock:
+            df = self.df.copy(deep=False)
+            for field in {field for _, field in updates}:
+                values = df[field].to_numpy(copy=True)
+                for (row_index, changed_field), value in updates.items():
+                    if changed_field == field:
+                        values[df.index.get_loc(row_index)] = value
+                df[field] = pd.Series(values, index=df.index, name=field)
+            facet_index = self.facet_index
+            for field in {field for _, field in updates}:
+                facet_index = facet_index.with_status(field, df[field].to_numpy())
+            self.df = df
+            self.facet_index = facet_index
+            rows = list(dict.fromkeys(row_index for row_index, _ in updates))
+            if any(field in SEARCH_FIELDS for _, field in updates):
+                self._reindex_rows(rows)
+            patches = [
+                self._status_change_patch(df.index.get_loc(row_index), field, value)
+                for (row_index, field), value in updates.items()
+            ]
+
+            def patch(key, cached):
+                for row_patch in patches:
+                    cached = row_patch(key, cached)
+                    if cached is None:
+                        return None
+                return cached
+
+            self._bump_version(
+                patch,
+                changes={
+                    'reason': 'batch',
+                    'updates': [
+                        {'id': self._public_id(row_index), 'field': field, 'value': value}
+                        for (row_index, field), value in updates.items()
+                    ],
+                },
+                version=version,
+            )
+            self._mark_rows_changed(rows)
+
+    def _apply_status_change(self, fellowship_id, status_type, value, version=None):
+        """Sets a status column in memory and advances the version. Returns the row, or None."""
+        with self._lock:
+            row_index = self.resolve_fellowship_id(fellowship_id)
+            if row_index is None:
+                return None
+            self.df.loc[row_index, status_type] = int(value)
+            self.facet_index = self.facet_index.with_status(status_type, self.df[status_type].to_numpy())
+            if status_type in SEARCH_FIELDS:
+                self._reindex_rows([row_index])
+            position = self.df.index.get_loc(row_index)
+            self._bump_version(
+                self._status_change_patch(position, status_type, int(value)),
+                changes={'reason': 'status', 'ids': [self._public_id(row_index)], 'field': status_type, 'value': int(value)},
+                version=version,
+            )
+            self._mark_rows_changed([row_index])
+            return row_index
+
+STATUS_COLUMNS = ('favorited', 'show')
+# Largest number of operations accepted by update_fellowship_statuses in one batch.
+MAX_BATCH_OPERATIONS = 1000
+
+# Fields a fellowship card needs; `fields=card` on the API is shorthand for this list.
+CARD_FIELDS = (
+    'title', 'location', 'continent', 'deadline', 'link', 'description', 'subjects',
+    'interest_rating', 'total_compensation', 'length_in_years', 'favorited', 'show',
+)
+# Per-result values that can be requested alongside the stored columns.
+COMPUTED_FIELDS = ('keyword_matches', 'relevance_score')
+
+# Defaults for columns older processed files may be missing.
+REQUIRED_COLUMN_DEFAULTS = {
+    'favorited': 0,
+    'show': 1,
+    'interest_rating': 0,
+    'total_compensation': "N/A",
+    'other_funding': "",
+    'subjects': None,
+    'length_in_years': 0,
+    'announced': "no",
+}
+
+
+def _add_missing_columns(df):
+    """Adds any required column the frame lacks. Returns True if the frame was changed."""
+    updated = False
+    for col, default in REQUIRED_COLUMN_DEFAULTS.items():
+        if col in df.columns:
+            continue
+        if col == 'subjects':
+            df[col] = pd.Series([[] for _ in range(len(df))], index=df.index, dtype=object)
+        else:
+            df[col] = default
+        updated = True
+    return updated
+
+
+def _coerce_frame_types(df):
+    try:
+        # favorited and show should be 0/1 integers
+        for col in ['favorited', 'show']:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce', downcast='integer').fillna(0).astype(int)
+        # interest_rating should be float
+        if 'interest_rating' in df.columns:
+            df['interest_rating'] = pd.to_numeric(df['interest_rating'], errors='coerce').fillna(0.0).astype(float)
+        # length_in_years should be integer if present
+        if 'length_in_years' in df.columns:
+            df['length_in_years'] = pd.to_numeric(df['length_in_years'], errors='coerce').fillna(0).astype(int)
+    except Exception as e:
+        logger.warning("Failed to coerce column types: %s", e)
+
+
+def _content_hashes(df):
+    """Returns {link: hash} over every non-status column, used to spot changed rows on reload."""
+    if df is None or 'link' not in df.columns or df.empty:
+        return {}
+    columns = sorted(col for col in df.columns if col not in STATUS_COLUMNS)
+    hashable = pd.DataFrame({col: df[col].map(str) for col in columns}, index=df.index)
+    hashes = pd.util.hash_pandas_object(hashable, index=False)
+    return dict(zip(df['link'].tolist(), hashes.tolist()))
+
+
+def fellowship_id_for_link(link):
+    """Stable public id for a fellowship: a short hash of its link, unchanged across reloads."""
+    return hashlib.sha1(str(link).encode('utf-8')).hexdigest()[:16]
+
+
+def query_sort_keys(key, size, positions, relevance, favorited, levels):
+    """
+    Folds a query's ordering into one int64 per row, increasing along the ordered result.
+
+    The order is relevance (descending), then favorites first (when requested), then row
+    position. Relevance is replaced by its rank among the distinct `levels` (ascending
+    relevance values of the result), so (rank * size + position) is unique and a cursor
+    holding the last row's relevance, favorite flag and position can resume with a binary
+    search.
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    rank = np.zeros(len(positions), dtype=np.int64)
+    if relevance is not None and levels is not None and len(levels):
+        rank += (len(levels) - np.searchsorted(levels, np.asarray(relevance), side='right')) * 2
+    if key.favorites_first:
+        rank += 1 - np.clip(np.asarray(favorited, dtype=np.int64), 0, 1)
+    return rank * max(int(size), 1) + positions
+
+
+def encode_cursor(state):
+    """Packs cursor state into an opaque, URL-safe token."""
+    raw = json.dumps(state, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Inverse of encode_cursor. Raises ValueError for tokens this server did not produce."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        state = json.loads(raw.decode('utf-8'))
+        return {'m': float(state['m']), 'f': int(state['f']), 'p': int(state['p']), 'id': state.get('id')}
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+
+
+class FellowshipQuery:
+    """
+    Ordered row positions matching a query, materialized into records one page at a time.
+
+    Wraps a QueryResult. Pages can be addressed by offset (page) or by an opaque cursor
+    naming the last row seen (page_after).
+    """
+
+    def __init__(self, df, result, key=None, resolve_id=None):
+        self.df = df
+        self.result = result
+        self.positions = result.positions
+        self.keyword_matches = result.keyword_matches
+        self.scores = result.scores
+        self.sort_keys = result.sort_keys
+        self.key = key
+        self.resolve_id = resolve_id
+
+    @property
+    def relevance(self):
+        """Per-row values the result is ranked by: BM25 scores, else keyword match counts."""
+        return self.scores if self.scores is not None else self.keyword_matches
+
+    @property
+    def total_count(self):
+        return len(self.positions)
+
+    def __len__(self):
+        return self.total_count
+
+    def resolve_fields(self, fields):
+        """
+        Validates a field projection: a list of column names, or ['card'] for CARD_FIELDS.
+
+        Returns the fields in request order (None means every field). Raises ValueError
+        naming any unknown field.
+        """
+        if not fields:
+            return None
+        if list(fields) == ['card']:
+            fields = CARD_FIELDS
+        known = set(self.df.columns) | set(COMPUTED_FIELDS) | {'id'}
+        unknown = [field for field in fields if field not in known]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return [field for field in dict.fromkeys(fields) if field != 'id']
+
+    def page(self, start, end, fields=None):
+        """
+        Builds template/JSON friendly dicts for the rows in [start, end) of the result.
+
+        `fields`, from resolve_fields(), limits each record to those fields (plus 'id');
+        only the projected columns are read from the frame.
+        """
+        with QUERY_STAGE_SECONDS.time(stage='pagination'):
+            return self._page(start, end, fields)
+
+    def _page(self, start, end, fields):
+        page_positions = self.positions[max(start, 0):max(end, 0)]
+        if len(page_positions) == 0:
+            return []
+
+        if fields is None:
+            page_df = self.df.iloc[page_positions]
+        else:
+            columns = [field for field in fields if field in self.df.columns]
+            page_df = self.df.iloc[page_positions, self.df.columns.get_indexer(columns)]
+        if 'link' in page_df.columns:
+            links = page_df['link'].tolist()
+        elif 'link' in self.df.columns:
+            links = self.df['link'].iloc[page_positions].tolist()
+        else:
+            links = [None] * len(page_df)
+        records = []
+        for row_id, link, record in zip(page_df.index.tolist(), links, page_df.to_dict('records')):
+            record = {key: (None if _is_missing(value) else value) for key, value in record.items()}
+            record = {'id': _record_id(row_id, link), **record}
+            records.append(record)
+
+        self._add_computed_fields(records, start, end, COMPUTED_FIELDS if fields is None else fields)
+        return records
+
+    def _add_computed_fields(self, records, start, end, fields):
+        if 'keyword_matches' in fields and self.keyword_matches is not None:
+            page_matches = self.keyword_matches[max(start, 0):max(end, 0)]
+            for record, matches in zip(records, page_matches.tolist()):
+                record['keyword_matches'] = matches
+        if 'relevance_score' in fields and self.scores is not None:
+            page_scores = self.scores[max(start, 0):max(end, 0)]
+            for record, score in zip(records, page_scores.tolist()):
+                record['relevance_score'] = round(score, 4)
+
+    def cursor_at(self, index):
+        """Cursor that resumes right after the row at `index` of the result, or None past the end."""
+        if self.sort_keys is None or not 0 <= index < self.total_count:
+            return None
+        position = int(self.positions[index])
+        relevance = self.relevance[index].item() if self.relevance is not None else 0
+        favorited = int(self.df['favorited'].iat[position]) if 'favorited' in self.df.columns else 0
+        link = self.df['link'].iat[position] if 'link' in self.df.columns else None
+        return encode_cursor({'m': relevance, 'f': favorited, 'p': position, 'id': _record_id(self.df.index[position], link)})
+
+    def start_after(self, cursor):
+        """Index of the first result row ordered after the cursor's row."""
+        if self.sort_keys is None or self.key is None:
+            raise ValueError("This result does not support cursors.")
+        state = decode_cursor(cursor)
+        position = state['p']
+        # Full reloads may move rows; the id pins the cursor to the same fellowship.
+        row_index = self.resolve_id(state['id']) if self.resolve_id and state['id'] else None
+        relevance = [state['m']] if self.relevance is not None else None
+        if row_index is not None and row_index in self.df.index:
+            position = self.df.index.get_loc(row_index)
+            # Reloads re-score every row, so rank the row by its relevance in this result;
+            # the saved one is only used when the row has left the result. The favorite
+            # flag stays as saved, so toggling it does not move the cursor.
+            index = np.flatnonzero(self.positions == position)
+            if len(index) and relevance is not None:
+                relevance = [self.relevance[index[0]].item()]
+        cursor_key = query_sort_keys(self.key, len(self.df), [position], relevance, [state['f']], self.result.relevance_levels)[0]
+        return int(np.searchsorted(self.sort_keys, cursor_key, side='right'))
+
+    def page_after(self, cursor, limit, fields=None):
+        """Returns (records, next cursor or None) for up to `limit` rows after the cursor."""
+        start = self.start_after(cursor) if cursor else 0
+        end = start + limit
+        next_cursor = self.cursor_at(end - 1) if end < self.total_count else None
+        return self.page(start, end, fields), next_cursor
+
+    def to_frame(self):
+        """Materializes the full result as a DataFrame (copies only the matching rows)."""
+        df_filtered = self.df.iloc[self.positions]
+        if self.keyword_matches is not None:
+            df_filtered = df_filtered.assign(keyword_matches=self.keyword_matches)
+        if self.scores is not None:
+            df_filtered = df_filtered.assign(relevance_score=self.scores)
+        return df_filtered
+
+
+def _record_id(row_index, link):
+    if link is None or _is_missing(link):
+        return f"row-{row_index}"
+    return fellowship_id_for_link(link)
+
+
+def _is_missing(value):
+    """Scalar-safe pd.isna that leaves list/array values alone."""
+    if isinstance(value, (list, tuple, dict, set, np.ndarray)):
+        return False
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
 def format_deadline(deadline_text):
     """
     Formats the deadline string to include the correct year.
@@ -0,0 +1,122 @@
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Prefix of the stdout lines pipeline subprocesses use to report progress to the app.
+PROGRESS_PREFIX = "@@progress "
+
+
+def report_progress(stage, current=None, total=None, message=None, **extra):
+    """
+    Reports pipeline progress (scrape, load_more, parse, refine, ...) on stdout.
+
+    When the app launched this process it reads these lines and republishes them on its
+    event stream; when run from a terminal they are just an extra log line.
+    """
+    record = {'stage': stage}
+    if current is not None:
+        record['current'] = current
+    if total is not None:
+        record['total'] = total
+    if message:
+        record['message'] = message
+    record.update(extra)
+    print(PROGRESS_PREFIX + json.dumps(record), flush=True)
+
+
+def parse_progress_line(line):
+    """Returns the progress record of a line written by report_progress, or None."""
+    if not line.startswith(PROGRESS_PREFIX):
+        return None
+    try:
+        record = json.loads(line[len(PROGRESS_PREFIX):])
+    except json.JSONDecodeError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def format_sse(event):
+    """Serializes an event for a text/event-stream response."""
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+class EventBus:
+    """
+    In-process publish/subscribe hub behind the app's Server-Sent Events stream.
+
+    Each subscriber gets its own bounded queue. Recent events are kept so a client that
+    reconnects with Last-Event-ID receives what it missed. A subscriber that falls too far
+    behind is closed; its client reconnects and catches up from the history.
+    """
+
+    def __init__(self, history_size=256, queue_size=1000):
+        self.queue_size = queue_size
+        self._history = deque(maxlen=history_size)
+        self._subscribers = set()
+        self._lock = threading.RLock()
+        self._next_id = 1
+
+    def publish(self, event_type, data):
+        with self._lock:
+            event = {'id': self._next_id, 'type': event_type, 'data': data, 'ts': time.time()}
+            self._next_id += 1
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription._deliver(event)
+        return event
+
+    def subscribe(self, last_event_id=None):
+        """Returns a subscription, pre-filled with history newer than `last_event_id`."""
+        subscription = EventSubscription(self, self.queue_size)
+        with self._lock:
+            if last_event_id is not None:
+                for event in self._history:
+                    if event['id'] > last_event_id:
+                        subscription._deliver(event)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'last_event_id': self._next_id - 1,
+                'history': len(self._history),
+            }
+
+
+class EventSubscription:
+    def __init__(self, bus, queue_size):
+        self._bus = bus
+        self._queue = queue.Queue(maxsize=queue_size)
+        self.closed = False
+
+    def _deliver(self, event):
+        if self.closed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            logger.warning("Event subscriber fell behind; closing its stream.")
+            self.close()
+
+    def get(self, timeout=None):
+        """Next event, or None if none arrived within `timeout` seconds."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.closed = True
+        self._bus.unsubscribe(self)
@@ -0,0 +1,126 @@
+import re
+import numpy as np
+import pandas as pd
+
+# Facets reported by /api/facets, in response order.
+FACETS = ('continent', 'subject', 'rating', 'deadline_month', 'favorited', 'show')
+# Status facets always list both values, so a status change never reshapes the index.
+STATUS_FACETS = ('favorited', 'show')
+# Star levels a rating is bucketed into (floor of interest_rating, clipped to this range).
+RATING_BUCKETS = range(0, 6)
+
+_MONTH_PATTERN = re.compile(r'^\d{4}-\d{2}')
+
+if hasattr(np, 'bitwise_count'):
+    _popcount = np.bitwise_count
+else:  # pragma: no cover - numpy < 2.0
+    _POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def _popcount(bits):
+        return _POPCOUNT_TABLE[bits]
+
+
+class FacetIndex:
+    """
+    Per-value row bitsets for the facets the UI counts.
+
+    Every facet value owns one row of a packed bit matrix (one bit per fellowship row), so
+    counting all values of all facets under a filter is a single AND with the packed filter
+    mask followed by a popcount. Rows missing a value (no continent, an "NA" deadline) are
+    counted under None.
+
+    Instances are never modified; with_status() returns a copy with a status facet replaced,
+    so readers always see a consistent index.
+    """
+
+    def __init__(self, size=0, labels=(), bits=None, slices=None):
+        self.size = size
+        self.labels = list(labels)
+        self.bits = bits if bits is not None else np.zeros((0, 0), dtype=np.uint8)
+        self.slices = dict(slices or {})
+
+    @classmethod
+    def from_frame(cls, df, subject_vocab=None):
+        size = len(df)
+        labels = []
+        rows = []
+        slices = {}
+        for facet in FACETS:
+            start = len(labels)
+            for value, mask in _facet_masks(df, facet, subject_vocab):
+                labels.append((facet, value))
+                rows.append(np.packbits(mask))
+            slices[facet] = slice(start, len(labels))
+        bits = np.vstack(rows) if rows else np.zeros((0, (size + 7) // 8), dtype=np.uint8)
+        bits.setflags(write=False)
+        return cls(size, labels, bits, slices)
+
+    def with_status(self, facet, values):
+        """A copy of the index with the `facet` (favorited or show) rows rebuilt from `values`."""
+        if facet not in STATUS_FACETS or facet not in self.slices or len(values) != self.size:
+            return self
+        values = np.asarray(values)
+        bits = self.bits.copy()
+        section = self.slices[facet]
+        for offset, (_, value) in enumerate(self.labels[section]):
+            bits[section.start + offset] = np.packbits(values == value)
+        bits.setflags(write=False)
+        return FacetIndex(self.size, self.labels, bits, self.slices)
+
+    def counts(self, positions=None):
+        """
+        Returns {facet: [{'value', 'count'}]} for the rows at `positions` (all rows if None).
+
+        Positions beyond the indexed rows (appended by a concurrent reload) are ignored.
+        """
+        if positions is None:
+            mask = np.ones(self.size, dtype=bool)
+        else:
+            positions = np.asarray(positions)
+            mask = np.zeros(self.size, dtype=bool)
+            mask[positions[positions < self.size]] = True
+        totals = _popcount(self.bits & np.packbits(mask)).sum(axis=1, dtype=np.int64)
+        return {
+            facet: [
+                {'value': self.labels[row][1], 'count': int(totals[row])}
+                for row in range(section.start, section.stop)
+            ]
+            for facet, section in self.slices.items()
+        }
+
+
+def _facet_masks(df, facet, subject_vocab):
+    """Yields (value, boolean row mask) for each value of a facet."""
+    size = len(df)
+    if facet == 'subject':
+        if subject_vocab is None:
+            return
+        for name, code, _ in sorted(subject_vocab.counts(), key=lambda entry: entry[0].lower()):
+            yield name, subject_vocab.mask([code], size)
+    elif facet == 'rating':
+        ratings = _column(df, 'interest_rating')
+        ratings = pd.to_numeric(pd.Series(ratings), errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+        buckets = np.clip(np.floor(ratings), RATING_BUCKETS.start, RATING_BUCKETS.stop - 1)
+        for bucket in RATING_BUCKETS:
+            yield bucket, buckets == bucket
+    elif facet in STATUS_FACETS:
+        values = np.asarray(_column(df, facet))
+        for value in (0, 1):
+            yield value, values == value
+    else:
+        column = 'deadline' if facet == 'deadline_month' else facet
+        values = pd.Series(_column(df, column), dtype=object)
+        if facet == 'deadline_month':
+            values = values.map(lambda v: v[:7] if isinstance(v, str) and _MONTH_PATTERN.match(v) else None)
+        codes, uniques = pd.factorize(values, sort=True)
+        for code, value in enumerate(uniques):
+            yield str(value), codes == code
+        missing = codes == -1
+        if missing.any():
+            yield None, missing
+
+
+def _column(df, name):
+    if name in df.columns:
+        return df[name].to_numpy()
+    return np.full(len(df), None, dtype=object)
@@ -0,0 +1,209 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Reads what FacetWP's own script posts when it loads a page of results. Returns null until
+# FacetWP has finished its first refresh (FWP.loaded), so callers can wait on it.
+FACETWP_STATE_SCRIPT = """
+var FWP = window.FWP;
+if (!FWP || !FWP.loaded || typeof FWP.buildPostData !== 'function') { return null; }
+return JSON.stringify({
+    endpoint: (window.FWP_JSON && window.FWP_JSON.ajaxurl) || window.location.href,
+    data: FWP.buildPostData(),
+    url: window.location.href,
+    user_agent: navigator.userAgent
+});
+"""
+
+# Files a recording is made of: the request state, then one response per page.
+STATE_FILE = "request.json"
+PAGE_FILE = "page_{}.json"
+
+
+class FacetWPError(Exception):
+    """FacetWP's state could not be read, or a results page could not be fetched."""
+
+
+def pooled_session(pool_size, retries=2, user_agent=None):
+    """A requests.Session keeping up to `pool_size` connections open, retrying transient errors."""
+    session = requests.Session()
+    retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=None)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if user_agent:
+        session.headers['User-Agent'] = user_agent
+    return session
+
+
+class FacetWPClient:
+    """
+    Fetches the pages of a FacetWP listing over HTTP, as the 'Load More' button does.
+
+    FacetWP renders each page of results on the server: a refresh request with `paged` set
+    returns that page's HTML under 'template' and the pager (total_pages) under
+    'settings'. Page 1 is fetched first to learn the page count, then the remaining pages
+    are fetched in parallel, at most `concurrency` at a time, over one pooled session.
+
+    When `record_dir` is set, the request state and every response are saved there, so a
+    FacetWPReplayServer can serve the same listing later.
+    """
+
+    def __init__(self, endpoint, post_data, session=None, concurrency=4, timeout=30, record_dir=None, base_url=None):
+        self.endpoint = endpoint
+        # The results page's URL, which card links are resolved against
+        self.base_url = base_url
+        self.post_data = dict(post_data)
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = timeout
+        self.session = session or pooled_session(self.concurrency)
+        self.record_dir = record_dir
+
+    @classmethod
+    def from_driver(cls, driver, concurrency=4, timeout=30, retries=2, record_dir=None, wait_seconds=15):
+        """A client that reuses the logged-in browser's cookies and the filters applied in it."""
+        state = None
+        deadline = time.monotonic() + wait_seconds
+        while state is None:
+            state = driver.execute_script(FACETWP_STATE_SCRIPT)
+            if state is None:
+                if time.monotonic() > deadline:
+                    raise FacetWPError("FacetWP did not finish loading on the results page.")
+                time.sleep(0.25)
+        state = json.loads(state)
+        session = pooled_session(max(1, int(concurrency)), retries, state.get('user_agent'))
+        for cookie in driver.get_cookies():
+            session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'), path=cookie.get('path', '/'))
+        if record_dir:
+            os.makedirs(record_dir, exist_ok=True)
+            with open(os.path.join(record_dir, STATE_FILE), 'w', encoding='utf-8') as f:
+                json.dump({'endpoint': state['endpoint'], 'url': state['url'], 'data': state['data']}, f)
+        return cls(state['endpoint'], state['data'], session, concurrency, timeout, record_dir, state['url'])
+
+    @classmethod
+    def from_recording(cls, record_dir, endpoint, concurrency=4, timeout=30):
+        """A client that replays a recorded listing's requests against `endpoint`."""
+        with open(os.path.join(record_dir, STATE_FILE), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        return cls(endpoint, state['data'], concurrency=concurrency, timeout=timeout, base_url=state.get('url'))
+
+    def fetch_page(self, page):
+        """Returns FacetWP's response for one page: {'template': html, 'settings': {'pager': ...}, ...}."""
+        data = dict(self.post_data, paged=page, soft_refresh=1, first_load=0)
+        try:
+            response = self.session.post(self.endpoint, json={'action': 'facetwp_refresh', 'data': data}, timeout=self.timeout)
+            response.raise_for_status()
+            payload = response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise FacetWPError(f"Could not fetch results page {page}: {e}") from e
+        if not isinstance(payload, dict) or 'template' not in payload:
+            raise FacetWPError(f"Results page {page} has no template in FacetWP's response.")
+        if self.record_dir:
+            with open(os.path.join(self.record_dir, PAGE_FILE.format(page)), 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+        return payload
+
+    def fetch_all(self, on_page=None):
+        """
+        Returns the template HTML of every page of the listing, in page order.
+
+        `on_page(pages_done, total_pages)` is called as pages arrive.
+        """
+        first = self.fetch_page(1)
+        pager = (first.get('settings') or {}).get('pager') or {}
+        total_pages = max(1, int(pager.get('total_pages') or 1))
+        logger.info("FacetWP listing has %d pages (%s results); fetching with %d workers.", total_pages, pager.get('total_rows', '?'), self.concurrency)
+        templates = [first['template']]
+        if on_page:
+            on_page(1, total_pages)
+        if total_pages > 1:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                for payload in pool.map(self.fetch_page, range(2, total_pages + 1)):
+                    templates.append(payload['template'])
+                    if on_page:
+                        on_page(len(templates), total_pages)
+        return templates
+
+    def close(self):
+        self.session.close()
+
+
+class FacetWPReplayServer:
+    """
+    A local stand-in for the site's FacetWP endpoint that serves a recorded listing.
+
+    Every POST answers with the recorded response for the request's `paged` value (404 if
+    that page was not recorded), after `delay` seconds to mimic the site's latency. Use as
+    a context manager; `url` is the endpoint to point a FacetWPClient at.
+    """
+
+    def __init__(self, record_dir, delay=0.0, host='127.0.0.1', port=0):
+        self.record_dir = record_dir
+        self.delay = delay
+        self.requests_served = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/wp-json/facetwp/v1/refresh"
+
+    def _handler(self):
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                try:
+                    page = int(json.loads(self.rfile.read(length) or b'{}').get('data', {}).get('paged') or 1)
+                except (ValueError, AttributeError):
+                    self.send_error(400, "Expected a FacetWP refresh request")
+                    return
+                path = os.path.join(replay.record_dir, PAGE_FILE.format(page))
+                if not os.path.exists(path):
+                    self.send_error(404, f"Page {page} was not recorded")
+                    return
+                if replay.delay:
+                    time.sleep(replay.delay)
+                with open(path, 'rb') as f:
+                    body = f.read()
+                with replay._lock:
+                    replay.requests_served += 1
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug("Replay server: " + format, *args)
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class FragmentCache:
+    """
+    Bounded LRU cache of rendered HTML fragments, one per fellowship, tagged with a row version.
+
+    get() only returns a fragment stored for the same (fellowship id, row version), so a row
+    that changed is re-rendered even if nobody invalidated it. invalidate() and clear() free
+    entries eagerly when a row or the whole dataset changes.
+    """
+
+    def __init__(self, max_size=2000):
+        self.max_size = max(int(max_size), 0)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.renders = 0
+        self.render_seconds = 0.0
+
+    def get(self, fellowship_id, version):
+        with self._lock:
+            entry = self._entries.get(fellowship_id)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(fellowship_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, fellowship_id, version, fragment):
+        if self.max_size == 0:
+            return
+        with self._lock:
+            self._entries[fellowship_id] = (version, fragment)
+            self._entries.move_to_end(fellowship_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_or_render(self, fellowship_id, version, render, cacheable=True):
+        """Returns the cached fragment, or calls render() (timed) and caches its result."""
+        fragment = self.get(fellowship_id, version)
+        if fragment is not None:
+            return fragment
+        start = time.perf_counter()
+        fragment = render()
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.renders += 1
+            self.render_seconds += elapsed
+        if cacheable:
+            self.put(fellowship_id, version, fragment)
+        return fragment
+
+    def invalidate(self, fellowship_id):
+        with self._lock:
+            self._entries.pop(fellowship_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "renders": self.renders,
+                "render_seconds": self.render_seconds,
+                "avg_render_ms": (self.render_seconds / self.renders * 1000) if self.renders else 0.0,
+            }
@@ -0,0 +1,161 @@
+import sys
+import numpy as np
+import pandas as pd
+
+# Flag columns that only ever hold 0/1 and are compared with == 1 / sorted on.
+FLAG_COLUMNS = ('favorited', 'show')
+SMALL_INT_COLUMNS = ('length_in_years',)
+FLOAT32_COLUMNS = ('interest_rating',)
+# Free text that is searched and rendered as-is; never made categorical.
+TEXT_COLUMNS = ('title', 'description', 'link')
+# Columns of Python lists whose string elements repeat across rows.
+LIST_COLUMNS = ('subjects',)
+
+# A string column becomes categorical when it has at most this share of distinct values.
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+def column_memory(df):
+    """Returns {column: bytes} for a frame, counting the Python objects behind object columns."""
+    if df is None:
+        return {}
+    usage = df.memory_usage(deep=True, index=False)
+    sizes = {col: int(usage[col]) for col in df.columns}
+    for col in LIST_COLUMNS:
+        if col in df.columns and df[col].dtype == object:
+            sizes[col] = _list_column_bytes(df[col])
+    return sizes
+
+
+def optimize_frame(df):
+    """
+    Returns a copy of the fellowship frame with compact column types.
+
+    - 0/1 flags become int8 and small integers int16
+    - ratings become float32 when that is exact (whole or half stars)
+    - low-cardinality strings (continent, location, deadline, ...) become categoricals
+    - long free text uses Arrow-backed strings (interned Python strings without pyarrow)
+    - subject names inside the subjects lists are interned, so each name is stored once
+
+    Missing values stay NaN in every column, so str(), pd.isna() and JSON output behave as
+    they do on the unoptimized frame.
+    """
+    df = df.copy()
+    for col in df.columns:
+        series = df[col]
+        if col in FLAG_COLUMNS:
+            df[col] = series.astype(np.int8)
+        elif col in SMALL_INT_COLUMNS:
+            df[col] = series.astype(np.int16)
+        elif col in FLOAT32_COLUMNS:
+            compact = series.astype(np.float32)
+            # Only when exact, so writing the frame back out never changes a rating.
+            if np.array_equal(compact.to_numpy(dtype=np.float64), series.to_numpy(dtype=np.float64), equal_nan=True):
+                df[col] = compact
+        elif col in LIST_COLUMNS:
+            df[col] = pd.Series([_intern_list(value) for value in series.tolist()], index=df.index, dtype=object)
+        elif _is_string_column(series):
+            if col not in TEXT_COLUMNS and series.nunique(dropna=True) <= max(len(series) * CATEGORY_MAX_UNIQUE_RATIO, 1):
+                df[col] = series.astype('category')
+            else:
+                df[col] = _compact_strings(series)
+    return df
+
+
+def conform_frame(live, incoming):
+    """
+    Casts `incoming` to the column types of an optimized `live` frame so rows can be merged.
+
+    Returns (live, incoming): categoricals of `live` gain any categories that only `incoming`
+    has (live is copied first), and `incoming` uses the same dtypes column for column.
+    """
+    live = live.copy()
+    incoming = incoming.copy()
+    for col in live.columns:
+        if col not in incoming.columns:
+            continue
+        dtype = live[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            new_values = pd.Index(incoming[col].dropna().unique()).difference(dtype.categories)
+            if len(new_values):
+                live[col] = live[col].cat.add_categories(new_values)
+            incoming[col] = incoming[col].astype(live[col].dtype)
+        elif col in LIST_COLUMNS:
+            incoming[col] = pd.Series([_intern_list(value) for value in incoming[col].tolist()], index=incoming.index, dtype=object)
+        elif incoming[col].dtype != dtype:
+            incoming[col] = incoming[col].astype(dtype)
+    return live, incoming
+
+
+def memory_report(before, after):
+    """
+    Per-column memory before and after optimization.
+
+    `before` and `after` are {column: bytes} mappings (see column_memory). Returns a dict with
+    a row per column and the totals.
+    """
+    columns = []
+    for col in before:
+        before_bytes = before.get(col, 0)
+        after_bytes = after.get(col, before_bytes)
+        columns.append({
+            'column': col,
+            'before_bytes': before_bytes,
+            'after_bytes': after_bytes,
+            'saved_bytes': before_bytes - after_bytes,
+        })
+    total_before = sum(before.values())
+    total_after = sum(after.get(col, size) for col, size in before.items())
+    return {
+        'columns': columns,
+        'total_before_bytes': total_before,
+        'total_after_bytes': total_after,
+        'ratio': (total_after / total_before) if total_before else 1.0,
+    }
+
+
+def _is_string_column(series):
+    return series.dtype == object or pd.api.types.is_string_dtype(series.dtype)
+
+
+def _compact_strings(series):
+    dtype = arrow_string_dtype()
+    if dtype is not None:
+        return series.astype(dtype)
+    return series.map(lambda value: sys.intern(value) if isinstance(value, str) else value).astype(object)
+
+
+def arrow_string_dtype():
+    """Arrow-backed string dtype that keeps NaN as the missing value, if this pandas has one."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    try:
+        return pd.StringDtype('pyarrow', na_value=np.nan)  # pandas >= 2.3
+    except TypeError:
+        pass
+    try:
+        return pd.StringDtype('pyarrow_numpy')  # pandas 2.1 / 2.2
+    except (TypeError, ValueError):
+        return None
+
+
+def _intern_list(value):
+    if isinstance(value, list):
+        return [sys.intern(item) if isinstance(item, str) else item for item in value]
+    return value
+
+
+def _list_column_bytes(series):
+    """Bytes of a column of lists: the pointer array, each list, and each distinct string once."""
+    total = int(series.memory_usage(index=False, deep=False))
+    seen = set()
+    for value in series.tolist():
+        total += sys.getsizeof(value)
+        if isinstance(value, list):
+            for item in value:
+                if id(item) not in seen:
+                    seen.add(id(item))
+                    total += sys.getsizeof(item)
+    return total
@@ -0,0 +1,289 @@
+import logging
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+from utils.events import parse_progress_line
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+
+class Job:
+    """One pipeline run (a data_retrieval.py subprocess) tracked by the JobManager."""
+
+    def __init__(self, job_id, job_type, command):
+        self.id = job_id
+        self.type = job_type
+        self.command = list(command)
+        self.state = QUEUED
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.exit_code = None
+        self.pid = None
+        self.progress = None
+        self.coalesced = 0
+        self.error = None
+        self.output = deque(maxlen=50)
+        self.cancel_requested = False
+        self.process = None
+
+    @property
+    def active(self):
+        return self.state in ACTIVE_STATES
+
+    @property
+    def duration(self):
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+    def to_dict(self, output=False):
+        data = {
+            'id': self.id,
+            'type': self.type,
+            'state': self.state,
+            'command': self.command[1:],
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'duration_seconds': round(self.duration, 1) if self.duration is not None else None,
+            'exit_code': self.exit_code,
+            'pid': self.pid,
+            'progress': self.progress,
+            'coalesced': self.coalesced,
+            'error': self.error,
+        }
+        if output:
+            data['output'] = list(self.output)
+        return data
+
+
+class JobManager:
+    """
+    Runs the app's scrape/process pipelines on a bounded pool of worker threads.
+
+    Each job type is single-flight: submitting a type that is already queued or running
+    returns the existing job instead of starting a second browser or refiner against the
+    same CSV files. Jobs report progress through the report_progress() lines of their
+    output; other output is passed through to this process's stdout. Finished jobs keep
+    their exit code and duration; the most recent `history_size` are retained.
+
+    `publish(event_type, data)` receives 'job' and 'progress' events, and `on_finish(job)`
+    is called after every run (both are optional).
+    """
+
+    def __init__(self, max_workers=1, history_size=50, cwd=None, cancel_timeout=10.0, publish=None, on_finish=None):
+        self.max_workers = max(int(max_workers), 1)
+        self.history_size = max(int(history_size), 1)
+        self.cwd = cwd
+        self.cancel_timeout = cancel_timeout
+        self._publish = publish
+        self._on_finish = on_finish
+        self._jobs = OrderedDict()
+        self._active = {}
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._workers = []
+
+    @classmethod
+    def from_config(cls, config, **kwargs):
+        """A JobManager sized by the [JOBS] section of `config` (a ConfigParser)."""
+        return cls(
+            max_workers=config.getint('JOBS', 'max_workers', fallback=1),
+            history_size=config.getint('JOBS', 'history_size', fallback=50),
+            cancel_timeout=config.getfloat('JOBS', 'cancel_timeout_seconds', fallback=10.0),
+            **kwargs,
+        )
+
+    def submit(self, job_type, command):
+        """
+        Queues `command` as a job of `job_type`.
+
+        Returns (job, created); created is False when an active job of the same type was
+        returned instead.
+        """
+        with self._lock:
+            existing = self._active.get(job_type)
+            if existing is not None:
+                existing.coalesced += 1
+                logger.info("%s job %s is already %s; not starting another.", job_type, existing.id, existing.state)
+                return existing, False
+            job = Job(str(self._next_id), job_type, command)
+            self._next_id += 1
+            self._jobs[job.id] = job
+            self._active[job_type] = job
+            self._prune_history()
+            self._start_workers()
+        self._queue.put(job)
+        logger.info("Queued %s job %s: %s", job_type, job.id, ' '.join(command))
+        self._emit('job', job)
+        return job, True
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(str(job_id))
+
+    def jobs(self):
+        """All retained jobs, newest first."""
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def cancel(self, job_id):
+        """
+        Cancels a queued or running job. Returns the job, or None if it does not exist.
+
+        A running job's process group is terminated, then killed if it has not exited
+        after `cancel_timeout` seconds. Cancelling a finished job does nothing.
+        """
+        with self._lock:
+            job = self._jobs.get(str(job_id))
+            if job is None or not job.active:
+                return job
+            job.cancel_requested = True
+            process = job.process
+            if job.state == QUEUED:
+                self._finish(job, CANCELLED, None)
+        if process is not None:
+            logger.info("Cancelling %s job %s (pid %s).", job.type, job.id, process.pid)
+            threading.Thread(target=self._terminate, args=(process,), name=f"job-{job.id}-cancel", daemon=True).start()
+        else:
+            self._emit('job', job)
+            if self._on_finish is not None:
+                self._on_finish(job)
+        return job
+
+    def stats(self):
+        with self._lock:
+            states = {}
+            for job in self._jobs.values():
+                states[job.state] = states.get(job.state, 0) + 1
+            return {
+                'max_workers': self.max_workers,
+                'workers': len(self._workers),
+                'queued': self._queue.qsize(),
+                'active': {job_type: job.id for job_type, job in self._active.items()},
+                'states': states,
+            }
+
+    def _start_workers(self):
+        # Called with the lock held; threads are started lazily, up to max_workers.
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._work, name=f"job-worker-{len(self._workers) + 1}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _prune_history(self):
+        # Called with the lock held; drops the oldest finished jobs beyond history_size.
+        excess = len(self._jobs) - self.history_size
+        for job_id in list(self._jobs):
+            if excess <= 0:
+                break
+            if not self._jobs[job_id].active:
+                del self._jobs[job_id]
+                excess -= 1
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            try:
+                self._run(job)
+            except Exception as e:
+                logger.warning("%s job %s failed to run: %s", job.type, job.id, e)
+                with self._lock:
+                    job.error = str(e)
+                    self._finish(job, FAILED, job.exit_code)
+                self._emit('job', job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job):
+        with self._lock:
+            if job.cancel_requested:
+                return
+            job.state = RUNNING
+            job.started_at = time.time()
+            process = job.process = self._spawn(job.command)
+            job.pid = process.pid
+        logger.info("Started %s job %s (pid %s).", job.type, job.id, job.pid)
+        self._emit('job', job)
+
+        for line in process.stdout:
+            progress = parse_progress_line(line)
+            if progress is not None:
+                job.progress = progress
+                if self._publish is not None:
+                    self._publish('progress', {'job': job.type, 'job_id': job.id, **progress})
+            else:
+                job.output.append(line.rstrip('\n'))
+                sys.stdout.write(line)
+        exit_code = process.wait()
+
+        with self._lock:
+            if job.cancel_requested:
+                state = CANCELLED
+            else:
+                state = SUCCEEDED if exit_code == 0 else FAILED
+            self._finish(job, state, exit_code)
+        logger.info("%s job %s %s (exit code %s) after %.1fs.", job.type, job.id, state, exit_code, job.duration)
+        self._emit('job', job)
+        if self._on_finish is not None:
+            self._on_finish(job)
+
+    def _finish(self, job, state, exit_code):
+        # Called with the lock held.
+        job.state = state
+        job.exit_code = exit_code
+        job.finished_at = time.time()
+        job.process = None
+        if self._active.get(job.type) is job:
+            del self._active[job.type]
+
+    def _spawn(self, command):
+        env = dict(os.environ, PYTHONUNBUFFERED='1')
+        kwargs = {}
+        if os.name == 'nt':
+            kwargs['creationflags'] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            # Own process group, so cancelling also stops the browser and driver it started
+            kwargs['start_new_session'] = True
+        return subprocess.Popen(
+            command, cwd=self.cwd, env=env, text=True, bufsize=1,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, **kwargs,
+        )
+
+    def _terminate(self, process):
+        try:
+            if os.name == 'nt':
+                process.terminate()
+            else:
+                os.killpg(process.pid, signal.SIGTERM)
+            process.wait(timeout=self.cancel_timeout)
+        except subprocess.TimeoutExpired:
+            if os.name == 'nt':
+                process.kill()
+            else:
+                os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def _emit(self, event_type, job):
+        if self._publish is None:
+            return
+        data = job.to_dict()
+        data['job_id'] = data.pop('id')
+        data['job'] = data.pop('type')
+        self._publish(event_type, data)
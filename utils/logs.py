@@ -0,0 +1,96 @@
+import atexit
+import configparser
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+
+DEFAULT_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+_listener = None
+_setup_lock = threading.Lock()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Thins out per-item log messages.
+
+    Records logged with extra=sampled(key) pass for the 1st, (N+1)th, (2N+1)th... occurrence
+    of their key, where N comes from the [LOG_SAMPLING] section (`default_every` for keys it
+    does not list). Passed records are suffixed with how many were skipped since the last
+    one. Records without a sample key always pass.
+    """
+
+    def __init__(self, every=None, default_every=100):
+        super().__init__()
+        self.every = dict(every or {})
+        self.default_every = max(int(default_every), 1)
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, 'sample', None)
+        if key is None:
+            return True
+        every = max(int(self.every.get(key, self.default_every)), 1)
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        if count % every != 0:
+            return False
+        if count:
+            record.msg = f"{record.msg} [sampled 1/{every}, {count} so far]"
+        return True
+
+
+def sampled(key):
+    """`extra` argument that marks a per-item log record for sampling under `key`."""
+    return {'sample': key}
+
+
+def setup_logging(config_path='config.ini'):
+    """
+    Routes logging through a queue drained by a background thread.
+
+    Callers only enqueue records, so the hot paths never wait on stdout or file I/O.
+    Reads [LOGGING] (level, format, optional rotating file), [LOG_LEVELS] (logger name =
+    level) and [LOG_SAMPLING] (sample key = keep one in N). Safe to call more than once; only
+    the first call configures anything.
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+        config = configparser.ConfigParser()
+        config.read(config_path)
+
+        formatter = logging.Formatter(config.get('LOGGING', 'format', fallback=DEFAULT_FORMAT, raw=True))
+        handlers = [logging.StreamHandler(sys.stdout)]
+        log_file = config.get('LOGGING', 'file', fallback='').strip()
+        if log_file:
+            handlers.append(logging.handlers.RotatingFileHandler(
+                log_file,
+                maxBytes=config.getint('LOGGING', 'max_bytes', fallback=5 * 1024 * 1024),
+                backupCount=config.getint('LOGGING', 'backup_count', fallback=3),
+                encoding='utf-8',
+            ))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        sampling = dict(config.items('LOG_SAMPLING')) if config.has_section('LOG_SAMPLING') else {}
+        default_every = sampling.pop('default_every', 100)
+        # Unbounded, so logging never blocks or fails in the calling thread.
+        queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+        queue_handler.addFilter(SamplingFilter(sampling, default_every))
+
+        root = logging.getLogger()
+        root.setLevel(config.get('LOGGING', 'level', fallback='INFO').upper())
+        root.addHandler(queue_handler)
+        if config.has_section('LOG_LEVELS'):
+            for name, level in config.items('LOG_LEVELS'):
+                logging.getLogger(name).setLevel(level.upper())
+
+        _listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
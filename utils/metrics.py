@@ -0,0 +1,182 @@
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from sub-millisecond filter stages up to slow page renders.
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram with labels, rendered in Prometheus text format."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_values(self.labelnames, labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0, 0.0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            series[1] += 1
+            series[2] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        with self._lock:
+            series = [(key, list(counts), count, total) for key, (counts, count, total) in self._series.items()]
+        for key, counts, count, total in sorted(series):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield f'{self.name}_bucket', {**labels, 'le': _format_value(bound)}, cumulative
+            yield f'{self.name}_bucket', {**labels, 'le': '+Inf'}, count
+            yield f'{self.name}_sum', labels, total
+            yield f'{self.name}_count', labels, count
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_values(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+
+class CallbackMetric:
+    """
+    Gauge or counter whose samples are read from the application when metrics are rendered.
+
+    `collect()` returns an iterable of (labels dict, value); use it for values that already
+    live elsewhere (cache statistics, dataset size) instead of mirroring them.
+    """
+
+    def __init__(self, name, documentation, collect, kind='gauge'):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self._collect = collect
+
+    def samples(self):
+        for labels, value in self._collect():
+            yield self.name, labels, value
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def callback(self, name, documentation, collect, kind='gauge'):
+        return self.register(CallbackMetric(name, documentation, collect, kind))
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            try:
+                samples = list(metric.samples())
+            except Exception:
+                logger.exception("Failed to collect metric %s", metric.name)
+                continue
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in samples:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _label_values(labelnames, labels):
+    if set(labels) != set(labelnames):
+        raise ValueError(f"Expected labels {labelnames}, got {tuple(labels)}")
+    return tuple(str(labels[name]) for name in labelnames)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(f'{key}="{_escape_label(value)}"' for key, value in labels.items())
+    return '{' + pairs + '}'
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _escape_help(text):
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _format_value(value):
+    value = float(value)
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if math.isnan(value):
+        return 'NaN'
+    return repr(int(value)) if value.is_integer() and abs(value) < 1e15 else repr(value)
+
+
+# Registry served at /api/metrics, and the metrics shared between modules.
+REGISTRY = MetricsRegistry()
+QUERY_STAGE_SECONDS = REGISTRY.histogram(
+    'fellowship_query_stage_seconds',
+    'Time spent in each stage of answering a fellowship query (filters, ranking, sorting, paging, serialization).',
+    ['stage'],
+)
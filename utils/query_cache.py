@@ -0,0 +1,69 @@
+import threading
+from collections import OrderedDict
+
+
+class QueryCache:
+    """
+    Bounded LRU cache for filtered query results, tagged with the dataset version.
+
+    Entries stored under an older version are never returned. When the dataset changes,
+    advance() either carries each entry over to the new version (optionally patching it)
+    or drops it.
+    """
+
+    def __init__(self, max_size=128):
+        self.max_size = max(int(max_size), 0)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, version, value):
+        if self.max_size == 0:
+            return
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def advance(self, old_version, new_version, patch=None):
+        """
+        Moves entries from old_version to new_version.
+
+        `patch(key, value)` returns the value to keep for the new version, or None to drop
+        the entry. Without a patch function every entry is dropped.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                version, value = self._entries[key]
+                patched = patch(key, value) if patch is not None and version == old_version else None
+                if patched is None:
+                    del self._entries[key]
+                else:
+                    self._entries[key] = (new_version, patched)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
@@ -0,0 +1,139 @@
+import math
+import threading
+from collections import Counter, defaultdict
+import numpy as np
+
+# Default BM25F field weights: a keyword in the title counts more than one in the description.
+DEFAULT_FIELD_WEIGHTS = {'title': 3.0, 'subjects': 2.0, 'description': 1.0}
+
+
+def field_text(value):
+    """Lowercase text of one searchable field, tokenized the same way as the keyword index."""
+    return str(value).lower()
+
+
+class BM25Ranker:
+    """
+    BM25F relevance scores for keyword searches over title, subjects and description.
+
+    Term statistics are precomputed per field: for every token, the rows containing it and
+    how often, plus each row's field length. A keyword is scored through the tokens that
+    contain it (keywords match as substrings, like the keyword index), so only the candidate
+    rows of a query are ever touched. Per keyword, the weighted, length-normalized term
+    frequency across fields is saturated with k1 and multiplied by the keyword's IDF.
+    """
+
+    def __init__(self, field_weights=None, k1=1.2, b=0.75):
+        self.field_weights = dict(field_weights or DEFAULT_FIELD_WEIGHTS)
+        self.fields = tuple(self.field_weights)
+        self.k1 = k1
+        self.b = b
+        self._postings = {field: defaultdict(dict) for field in self.fields}
+        self._lengths = {field: {} for field in self.fields}
+        self._row_tokens = {field: {} for field in self.fields}
+        self._total_lengths = dict.fromkeys(self.fields, 0)
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_frame(cls, df, field_weights=None, k1=1.2, b=0.75):
+        ranker = cls(field_weights, k1, b)
+        columns = [
+            df[field].tolist() if field in df.columns else [''] * len(df)
+            for field in ranker.fields
+        ]
+        for row_id, values in zip(df.index.tolist(), zip(*columns)):
+            ranker._add(row_id, dict(zip(ranker.fields, values)))
+        return ranker
+
+    def __len__(self):
+        return len(self._lengths[self.fields[0]]) if self.fields else 0
+
+    def update(self, row_id, row):
+        """Indexes (or re-indexes) a row; `row` is anything with .get(field)."""
+        with self._lock:
+            self._remove(row_id)
+            self._add(row_id, {field: row.get(field, '') for field in self.fields})
+
+    def remove(self, row_id):
+        with self._lock:
+            self._remove(row_id)
+
+    def _add(self, row_id, values):
+        for field in self.fields:
+            tokens = field_text(values.get(field, '')).split()
+            counts = Counter(tokens)
+            for token, count in counts.items():
+                self._postings[field][token][row_id] = count
+            self._row_tokens[field][row_id] = tuple(counts)
+            self._lengths[field][row_id] = len(tokens)
+            self._total_lengths[field] += len(tokens)
+
+    def _remove(self, row_id):
+        for field in self.fields:
+            length = self._lengths[field].pop(row_id, None)
+            if length is None:
+                continue
+            self._total_lengths[field] -= length
+            postings = self._postings[field]
+            for token in self._row_tokens[field].pop(row_id, ()):
+                rows = postings.get(token)
+                if rows is None:
+                    continue
+                rows.pop(row_id, None)
+                if not rows:
+                    del postings[token]
+
+    def score(self, keywords, row_ids, keyword_index, texts_for=None):
+        """
+        Returns BM25F scores aligned with `row_ids` (the candidate rows of a query).
+
+        keyword_index resolves keywords to matching tokens and document frequencies.
+        Keywords containing whitespace cannot be resolved through tokens; for those,
+        `texts_for(field)` must return the candidates' raw field values so occurrences
+        can be counted directly.
+        """
+        row_ids = list(row_ids)
+        scores = np.zeros(len(row_ids), dtype=np.float64)
+        if not row_ids or not keywords:
+            return scores
+        slot_for = {row_id: slot for slot, row_id in enumerate(row_ids)}
+
+        with self._lock:
+            total_docs = len(self)
+            norms = {}
+            for field in self.fields:
+                lengths = self._lengths[field]
+                average = self._total_lengths[field] / total_docs if total_docs else 0.0
+                field_lengths = np.fromiter((lengths.get(row_id, 0) for row_id in row_ids), dtype=np.float64, count=len(row_ids))
+                norm = 1.0 - self.b + self.b * (field_lengths / average if average else 0.0)
+                norms[field] = np.maximum(norm, 1e-9)
+
+            for keyword in keywords:
+                doc_freq = len(keyword_index.lookup(keyword))
+                if doc_freq == 0:
+                    continue
+                idf = math.log(1.0 + (total_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+                weighted_tf = np.zeros(len(row_ids), dtype=np.float64)
+                for field in self.fields:
+                    tf = self._field_term_frequencies(field, keyword, slot_for, keyword_index, texts_for)
+                    weighted_tf += self.field_weights[field] * tf / norms[field]
+                scores += idf * weighted_tf * (self.k1 + 1.0) / (weighted_tf + self.k1)
+        return scores
+
+    def _field_term_frequencies(self, field, keyword, slot_for, keyword_index, texts_for):
+        tf = np.zeros(len(slot_for), dtype=np.float64)
+        if keyword.split() == [keyword]:
+            postings = self._postings[field]
+            for token in keyword_index.matching_tokens(keyword):
+                rows = postings.get(token)
+                if not rows:
+                    continue
+                occurrences = token.count(keyword)
+                for row_id, count in rows.items():
+                    slot = slot_for.get(row_id)
+                    if slot is not None:
+                        tf[slot] += count * occurrences
+        elif texts_for is not None:
+            for slot, value in enumerate(texts_for(field)):
+                tf[slot] = field_text(value).count(keyword)
+        return tf
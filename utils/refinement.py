@@ -1,15 +1,18 @@
 from google import genai
 import pandas as pd
 import json
+import logging
 import os
 import time
 from tqdm import tqdm
 import requests
 import sys
 
+logger = logging.getLogger(__name__)
+
 class GeminiRefiner:
     def __init__(self, model_name="sonar"):
-        print(f'Model Name received in Refiner: {model_name}')
+        logger.info("Model name received in Refiner: %s", model_name)
         self.enabled = False
         api_key_path = 'configs/api_key.json'
         gemini_api_key = None
@@ -24,19 +27,19 @@ class GeminiRefiner:
                     elif "sonar" in model_name.lower():
                         perplexity_api_key = api_key_data.get('perplexity_api_key')
             except (json.JSONDecodeError, IOError) as e:
-                print(f"Warning: Could not read API key file at {api_key_path}. Error: {e}")
+                logger.warning("Could not read API key file at %s. Error: %s", api_key_path, e)
                 # Keep self.enabled as False, no return here
 
-        print(f"DEBUG Refiner: Loaded Gemini API Key (present and non-empty): {gemini_api_key is not None and len(gemini_api_key) > 0}")
-        print(f"DEBUG Refiner: Loaded Perplexity API Key (present and non-empty): {perplexity_api_key is not None and len(perplexity_api_key) > 0}")
+        logger.debug("Loaded Gemini API Key (present and non-empty): %s", bool(gemini_api_key))
+        logger.debug("Loaded Perplexity API Key (present and non-empty): %s", bool(perplexity_api_key))
 
         if "gemini" in model_name.lower():
             if not gemini_api_key:
-                print("Warning: `gemini_api_key` not found or is empty in `configs/api_key.json`. GeminiRefiner will be disabled.")
+                logger.warning("`gemini_api_key` not found or is empty in `configs/api_key.json`. GeminiRefiner will be disabled.")
                 # Keep self.enabled as False, no return here
         elif "sonar" in model_name.lower():
             if not perplexity_api_key:
-                print("Warning: `perplexity_api_key` not found or is empty in `configs/api_key.json`. GeminiRefiner will be disabled.")
+                logger.warning("`perplexity_api_key` not found or is empty in `configs/api_key.json`. GeminiRefiner will be disabled.")
                 # Keep self.enabled as False, no return here
 
         # Only enable if the relevant key is present
@@ -47,7 +50,7 @@ class GeminiRefiner:
             self.enabled = False # Explicitly set to False if checks failed
 
         self.model = model_name
-        print(f"DEBUG Refiner: Final self.enabled status: {self.enabled}")
+        logger.debug("Final enabled status: %s", self.enabled)
         
         if "flash" in self.model.lower():
             self.rate_limit_interval = 60 / 10  # More generous for Flash
@@ -64,7 +67,7 @@ class GeminiRefiner:
             try:
                 self.client = genai.Client(api_key=gemini_api_key)
             except Exception as e:
-                print(f"Failed to initialize Gemini client: {e}")
+                logger.error("Failed to initialize Gemini client: %s", e)
                 self.enabled = False
                 return
         elif "sonar" in self.model.lower():
@@ -72,14 +75,14 @@ class GeminiRefiner:
         
         filters_path = 'configs/filters.json'
         if not os.path.exists(filters_path):
-            print(f"Warning: Filters file not found at {filters_path}. System instructions will be empty.")
+            logger.warning("Filters file not found at %s. System instructions will be empty.", filters_path)
             self.system_instructions = ''
         else:
             with open(filters_path, 'r') as f:
                 filters_data = json.load(f)
                 self.system_instructions = filters_data.get('system_instructions', '')
                 if not self.system_instructions:
-                    print("Warning: `system_instructions` not found or empty in `configs/filters.json`")
+                    logger.warning("`system_instructions` not found or empty in `configs/filters.json`")
                 
     def refine(self, row):
         if not self.enabled:
@@ -135,35 +138,32 @@ Ensure that this is a Valid JSON Object. Thanks!
         for attempt in range(max_retries):
             try:
                 if "gemini" in self.model.lower():
-                    print(f'GEMINI DETECTED. Attempt {attempt + 1}. Using model: models/{self.model}')
+                    logger.debug("Gemini request, attempt %d. Using model: models/%s", attempt + 1, self.model)
                     # CORRECTED API CALL: Use self.client.generate_content directly
                     response = self.client.generate_content(
                         model=f'models/{self.model}', # Prepend 'models/' as required
                         contents=self.prompt
                     )
-                    print(f'Response Text: {response.text}')
+                    logger.debug("Response text: %s", response.text)
                     refined_data = self._parse_response(response.text)
-                    print(f'Refined Data (parsed): {refined_data}')
+                    logger.debug("Refined data (parsed): %s", refined_data)
                 elif "sonar" in self.model.lower():
-                    print(f'PERPLEXITY DETECTED. Attempt {attempt + 1}.')
+                    logger.debug("Perplexity request, attempt %d.", attempt + 1)
                     refined_data = self.client.run(self.prompt)
-                    print(f'Refined Data (parsed): {refined_data}')
+                    logger.debug("Refined data (parsed): %s", refined_data)
                 else:
                     raise ValueError(f"Invalid model name: {self.model}")
                 return refined_data
             except Exception as e:
-                tqdm.write(f"An error occurred on attempt {attempt + 1}/{max_retries}: {e}")
-                sys.stdout.flush()
+                logger.warning("An error occurred on attempt %d/%d: %s", attempt + 1, max_retries, e)
                 if "rate limit" in str(e).lower():
                     sleep_time = backoff_factor ** attempt
-                    tqdm.write(f"Rate limit likely reached. Retrying in {sleep_time} seconds...")
-                    sys.stdout.flush()
+                    logger.warning("Rate limit likely reached. Retrying in %d seconds...", sleep_time)
                     time.sleep(sleep_time)
                 else:
                     return None
         
-        tqdm.write("Failed to get a valid response after several retries.")
-        sys.stdout.flush()
+        logger.error("Failed to get a valid response after several retries.")
         return None
 
     def _parse_response(self, response_text):
@@ -177,8 +177,7 @@ Ensure that this is a Valid JSON Object. Thanks!
 
             return json.loads(json_str)
         except (json.JSONDecodeError, IndexError) as e:
-            tqdm.write(f"Error parsing JSON: {e}")
-            sys.stdout.flush()
+            logger.warning("Error parsing JSON: %s", e)
             return None
 
     def _format_fellowship(self, row):
@@ -205,8 +204,7 @@ class Prompter:
             return perplexity_result
         except Exception as e:
             error_message = f"Error: {str(e)}"
-            tqdm.write(error_message)
-            sys.stdout.flush()
+            logger.error(error_message)
             return {"error": error_message}
 
     def perplexity_generate(self, prompt):
@@ -0,0 +1,86 @@
+import gzip
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional, the stdlib json module still works
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional, gzip is always available
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = (
+    'application/json',
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/javascript',
+    'application/javascript',
+)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that serializes with orjson when it is installed.
+
+    Keys are not sorted (no client depends on key order). Calls that ask for stdlib-only
+    options such as indent fall back to the default provider.
+    """
+
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except TypeError:
+            # e.g. integers wider than 64 bits; the stdlib encoder handles anything Flask's does
+            return super().dumps(obj, **kwargs)
+
+
+def available_encodings():
+    """Content encodings this server can produce, most preferred first."""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def compress_response(response, accept_encodings, min_size=1024, gzip_level=6, brotli_quality=5):
+    """
+    Compresses a JSON/HTML/text response body with the best encoding the client accepts.
+
+    `accept_encodings` is the request's parsed Accept-Encoding header
+    (request.accept_encodings). Streamed and passthrough responses (files, event streams),
+    bodies smaller than `min_size`, and already-encoded responses are left alone. The ETag
+    of a compressed response is made weak, since the bytes differ from the identity
+    encoding while the content is the same.
+    """
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or 'Content-Encoding' in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = accept_encodings.best_match(available_encodings())
+    if encoding is None:
+        return response
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+
+    if encoding == 'br':
+        compressed = brotli.compress(data, quality=brotli_quality)
+    else:
+        compressed = gzip.compress(data, compresslevel=gzip_level)
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    etag, _ = response.get_etag()
+    if etag:
+        response.set_etag(etag, weak=True)
+    return response
@@ -1,7 +1,6 @@
 import json
 import time
 import random
-import requests
 from selenium import webdriver
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.chrome.service import Service as ChromeService
@@ -12,19 +11,49 @@ from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.firefox import GeckoDriverManager
 from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.microsoft import EdgeChromiumDriverManager
-from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, NoSuchElementException, WebDriverException
 import configparser
+import logging
 import os
 from utils.data import DataProcessor
 from utils.refinement import GeminiRefiner
+from utils.events import report_progress
+from utils.logs import sampled
+from utils.cards import CARD_CLASS, CARD_FIELDS, card_from_element, html_parsing_available, parse_fellowship_cards
+from utils.browser_profiles import BrowserProfile, FULL
+from utils.scrape_runs import ScrapeRun, load_runs, session_hit_rate
+from utils.facetwp import FacetWPClient, FacetWPError
+from utils.session_cache import SessionCache
+from utils.waits import PageWaits
+
+# Fields WebDriver accepts when adding a cookie.
+COOKIE_FIELDS = ('name', 'value', 'path', 'domain', 'secure', 'httpOnly', 'expiry', 'sameSite')
+# Returned by ProfellowBot._find_load_more when the results page has no more to load.
+NO_LOAD_MORE = object()
+
+logger = logging.getLogger(__name__)
 
 
 class ProfellowBot:
-    def __init__(self, browser=None, notify_app=False):
+    def __init__(self, browser=None, notify_app=False, profile=None, fetch_mode=None):
         config = configparser.ConfigParser()
         config.read('config.ini')
         self.configs_path = config.get('PATHS', 'configs', fallback='configs/')
         self.notify_app = notify_app
+        # 'html' parses one page_source snapshot; 'webdriver' reads every card field over WebDriver
+        self.card_parser = config.get('SCRAPE', 'card_parser', fallback='html').lower()
+        if self.card_parser == 'html' and not html_parsing_available():
+            logger.warning("beautifulsoup4 is not installed; reading fellowship cards over WebDriver.")
+            self.card_parser = 'webdriver'
+        # 'browser' clicks Load More until every result shows; 'direct' fetches FacetWP's result
+        # pages over HTTP with the logged-in browser's cookies
+        self.fetch_mode = (fetch_mode or config.get('SCRAPE', 'fetch_mode', fallback='browser')).lower()
+        self.direct_concurrency = config.getint('SCRAPE', 'direct_concurrency', fallback=4)
+        self.direct_timeout = config.getfloat('SCRAPE', 'direct_timeout', fallback=30)
+        self.direct_retries = config.getint('SCRAPE', 'direct_retries', fallback=2)
+        if self.fetch_mode == 'direct' and not html_parsing_available():
+            logger.warning("beautifulsoup4 is not installed; loading results in the browser.")
+            self.fetch_mode = 'browser'
 
         # Load filters from JSON file for browser selection and categories
         with open(os.path.join(self.configs_path, "filters.json"), "r") as f:
@@ -35,10 +64,24 @@ class ProfellowBot:
         else:
             self.browser = filters_data.get('Browsing', 'firefox').lower()
 
-        self._initialize_driver()
-
         # --- Configuration ---
         self.tmp_path = config.get('PATHS', 'tmp', fallback='tmp/')
+        self.runs_path = os.path.join(self.tmp_path, "scrape_runs.jsonl")
+
+        # 'headless' blocks images, media, fonts and trackers; 'full' is a visible browser
+        self.profile = BrowserProfile.from_config(config, profile)
+        if not self.profile.applies_to(self.browser):
+            logger.warning("The %s profile supports Firefox and Chrome only; using the %s profile for %s.", self.profile.name, FULL, self.browser)
+            self.profile = BrowserProfile(FULL)
+        self.run_stats = ScrapeRun(self.browser, self.profile.name, self.card_parser, self.fetch_mode)
+
+        with self.run_stats.phase('driver_start'):
+            self._initialize_driver()
+        self.run_stats.attach(self.driver)
+        # Bounded, condition-based waits on the site ([WAITS] in config.ini)
+        self.waits = PageWaits.from_config(self.driver, config)
+        # Seconds the full profile's window stays open after a run, to look at the results
+        self.linger_seconds = config.getfloat('WAITS', 'linger', fallback=5)
         
         # --- Data Processor ---
         self.data_processor = DataProcessor()
@@ -53,32 +96,35 @@ class ProfellowBot:
         with open(os.path.join(self.configs_path, "login.json"), "r") as f:
             login_data = json.load(f)
         self.profellow_login_data = login_data.get("profellow", {})
+        # Login cookies reused across runs (None when [SESSION] is disabled or cryptography is missing)
+        self.session_cache = SessionCache.from_config(config, self.tmp_path, self.profellow_login_data)
 
         self.categories_data = filters_data["categories"]
 
+        self.SITE_URL = "https://www.profellow.com/"
         self.LOGIN_URL = "https://www.profellow.com/log-in/"
 
     def _initialize_driver(self):
         """Initializes the WebDriver based on the selected browser."""
         if self.browser == "firefox":
             service = FirefoxService(GeckoDriverManager().install())
-            self.driver = webdriver.Firefox(service=service)
-            print("Firefox WebDriver initialized.")
+            self.driver = webdriver.Firefox(service=service, options=self.profile.firefox_options())
+            logger.info("Firefox WebDriver initialized (%s profile).", self.profile.name)
         elif self.browser == "chrome":
             service = ChromeService(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service)
-            print("Chrome WebDriver initialized.")
+            self.driver = webdriver.Chrome(service=service, options=self.profile.chrome_options())
+            logger.info("Chrome WebDriver initialized (%s profile).", self.profile.name)
         elif self.browser == "edge":
             service = EdgeService(EdgeChromiumDriverManager().install())
             self.driver = webdriver.Edge(service=service)
-            print("Edge WebDriver initialized.")
+            logger.info("Edge WebDriver initialized.")
         elif self.browser == "safari":
             self.driver = webdriver.Safari()
-            print("Safari WebDriver initialized.")
+            logger.info("Safari WebDriver initialized.")
         else:
             raise ValueError(f"Unsupported browser: '{self.browser}'. Please choose 'firefox', 'chrome', 'edge', or 'safari'.")
-        # Fullscreen the window
-        self.driver.fullscreen_window()
+        # Fullscreen the window (full profile) or set up request blocking (headless)
+        self.profile.prepare(self.driver, self.browser)
         
     def _are_categories_same(self):
         """Deep compares the filters.json files in configs/ and tmp/."""
@@ -86,7 +132,7 @@ class ProfellowBot:
         tmp_cat_path = os.path.join(self.tmp_path, "filters.json")
 
         if not os.path.exists(tmp_cat_path):
-            print("tmp/filters.json does not exist.")
+            logger.info("tmp/filters.json does not exist.")
             return False
 
         try:
@@ -95,18 +141,18 @@ class ProfellowBot:
                 tmp_data = json.load(f2)["categories"]
 
             if config_data.keys() != tmp_data.keys():
-                print("Keys in filters.json files do not match.")
+                logger.info("Keys in filters.json files do not match.")
                 return False
 
             for key in config_data:
                 if sorted(config_data[key]) != sorted(tmp_data[key]):
-                    print(f"Mismatch found in key '{key}' between filters.json files.")
+                    logger.info("Mismatch found in key '%s' between filters.json files.", key)
                     return False
             
-            print("filters.json files in configs/ and tmp/ are identical.")
+            logger.info("filters.json files in configs/ and tmp/ are identical.")
             return True
         except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Error comparing filters.json files: {e}")
+            logger.warning("Error comparing filters.json files: %s", e)
             return False
 
     def _get_cached_link(self):
@@ -116,15 +162,15 @@ class ProfellowBot:
             with open(link_path, 'r') as f:
                 link = f.read().strip()
                 if link:
-                    print(f"Found cached link: {link}")
+                    logger.info("Found cached link: %s", link)
                     return link
-        print("No cached link found.")
+        logger.info("No cached link found.")
         return None
 
     def _login(self):
         self.driver.get(self.LOGIN_URL)
-        print("Navigated to login page.")
-        self.driver.execute_script("document.body.style.zoom = '0.5';")
+        logger.debug("Navigated to login page.")
+        self.profile.after_navigation(self.driver)
 
         # Wait for the email input to be visible and type the email
         email_input = WebDriverWait(self.driver, 10).until(
@@ -140,23 +186,68 @@ class ProfellowBot:
             password_input.send_keys(char)
             time.sleep(random.uniform(0.01, 0.05))
 
-                    # Scroll down slightly after entering credentials
+        # Scroll down slightly after entering credentials
         self.driver.execute_script("window.scrollBy(0, 100);")
-        time.sleep(random.uniform(0.5, 1.5)) # Add a small delay after scrolling
 
-        # Add a brief delay before clicking the login button
-        time.sleep(random.uniform(0.4, 1.3))
-
-        # Find and click the login button
-        login_button = self.driver.find_element(By.ID, "wpforms-submit-106652")
+        # Find and click the login button once it can take the click
+        login_button = self.waits.until('login_form', EC.element_to_be_clickable((By.ID, "wpforms-submit-106652")), required=True)
         login_button.click()
 
         # Wait for a successful login by checking for a URL change
-        WebDriverWait(self.driver, 10).until(
-            EC.url_contains("fellowship")
+        self.waits.until('login_redirect', EC.url_contains("fellowship"), required=True)
+        logger.info("Login successful!")
+        self.waits.until('page_ready', self.waits.idle())
+
+    def _ensure_session(self, url=None):
+        """
+        Gets the browser logged in, reusing the cached session when the site still accepts it
+        and logging in interactively otherwise. Returns True when the browser is already on
+        `url` (the page the cached session was checked on).
+        """
+        start = time.perf_counter()
+        session = self.session_cache.load() if self.session_cache is not None else None
+        if session is not None and self._restore_session(session, url):
+            self.run_stats.session = 'hit'
+            self._log_login("Restored the cached login session", start)
+            return url is not None
+
+        self._login()
+        if self.session_cache is not None:
+            self.run_stats.session = 'miss'
+            try:
+                self.session_cache.save(self.driver.get_cookies(), self.driver.current_url)
+            except OSError as e:
+                logger.warning("Could not cache the login session: %s", e)
+        self._log_login("Logged in", start)
+        return False
+
+    def _restore_session(self, session, url=None):
+        """Loads cached cookies into the browser, opens `url` and checks the site sees a logged-in user."""
+        # Cookies can only be set for the site the browser is on; robots.txt is the cheapest page there.
+        self.driver.get(self.SITE_URL + "robots.txt")
+        now = time.time()
+        for cookie in session['cookies']:
+            if cookie.get('expiry') and cookie['expiry'] <= now:
+                continue
+            try:
+                self.driver.add_cookie({field: cookie[field] for field in COOKIE_FIELDS if field in cookie})
+            except WebDriverException as e:
+                logger.debug("Skipped cached cookie %s: %s", cookie.get('name'), e)
+        self.driver.get(url or session.get('landing_url') or self.SITE_URL)
+        # WordPress marks pages served to a logged-in user with the 'logged-in' body class.
+        if self.driver.execute_script("return !!document.body && document.body.classList.contains('logged-in');"):
+            return True
+        logger.info("The site rejected the cached login session; logging in again.")
+        self.session_cache.clear()
+        self.driver.delete_all_cookies()
+        return False
+
+    def _log_login(self, action, start):
+        hit_rate = session_hit_rate(load_runs(self.runs_path) + [{'session': self.run_stats.session}])
+        logger.info(
+            "%s in %.1fs (session hit rate %s).",
+            action, time.perf_counter() - start, f"{hit_rate:.0%}" if hit_rate is not None else "n/a",
         )
-        print("Login successful!")
-        time.sleep(random.uniform(1, 2))
 
     def _click_filter_button(self):
         try:
@@ -164,28 +255,28 @@ class ProfellowBot:
                 EC.element_to_be_clickable((By.CLASS_NAME, "filter-button"))
             )
             filter_button.click()
-            print("Filter button clicked.")
+            logger.debug("Filter button clicked.")
         except TimeoutException:
-            print("Filter button not found or not clickable within the given time.")
+            logger.warning("Filter button not found or not clickable within the given time.")
         except NoSuchElementException:
-            print("Filter button not found.")
+            logger.warning("Filter button not found.")
 
     def _get_filter_blocks(self):
         try:
             filter_blocks = WebDriverWait(self.driver, 10).until(
                 EC.presence_of_all_elements_located((By.CLASS_NAME, "filter-block"))
             )
-            print(f"Found {len(filter_blocks)} filter blocks. The names are the following:")
-            for block in filter_blocks:
-                print(block.text)
+            logger.info("Found %d filter blocks.", len(filter_blocks))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Filter block names: %s", [block.text for block in filter_blocks])
             return filter_blocks
         except TimeoutException:
-            print("No filter blocks found within the given time.")
+            logger.warning("No filter blocks found within the given time.")
             return []
 
     def _process_filter_blocks(self, filter_blocks):
         if not filter_blocks:
-            print("No filter blocks to process.")
+            logger.warning("No filter blocks to process.")
             return
 
         category_keys = list(self.categories_data.keys())
@@ -197,7 +288,7 @@ class ProfellowBot:
 
             items_to_select = self.categories_data[category_key]
             if not items_to_select:
-                print(f"No items to select for category '{category_key}'. Skipping.")
+                logger.info("No items to select for category '%s'. Skipping.", category_key)
                 continue
 
             found_block = False
@@ -215,7 +306,7 @@ class ProfellowBot:
                     category_key = "Citizenship Requirement"
 
                 if category_key.lower() == block.text.lower():
-                    print(f"Processing filter block {i+1}/{len(filter_blocks)}: '{category_key}' which has title '{block.text}'")
+                    logger.info("Processing filter block %d/%d: '%s' which has title '%s'", i+1, len(filter_blocks), category_key, block.text)
                     try:
                         # Re-locate the filter block to ensure it's fresh
                         clickable_block = block
@@ -225,11 +316,11 @@ class ProfellowBot:
                             WebDriverWait(clickable_block, 2).until(
                                 EC.visibility_of_element_located((By.CLASS_NAME, "facetwp-checkbox"))
                             )
-                            print("Filter block is already open.")
+                            logger.debug("Filter block is already open.")
                         except TimeoutException:
                             clickable_block.click()
-                            print(f"Clicked filter block: {category_key}")
-                            time.sleep(1.5) # Wait for animation
+                            logger.debug("Clicked filter block: %s", category_key)
+                            self.waits.until('filter_open', lambda driver: clickable_block.find_element(By.CLASS_NAME, "facetwp-checkbox").is_displayed())
 
                         # --- 2. Process checkboxes within this block ---
                         self._process_checkboxes_for_category(clickable_block, items_to_select)
@@ -238,19 +329,18 @@ class ProfellowBot:
                         break
 
                     except (TimeoutException, StaleElementReferenceException, NoSuchElementException) as e:
-                        print(f"Could not process filter block '{category_key}' due to: {e}")
+                        logger.warning("Could not process filter block '%s' due to: %s", category_key, e)
                         # It might be good to refresh the page or take other recovery actions here
             
             if not found_block:
-                print(f"Warning: No matching filter block found for category key '{category_key}'. Skipping.")
+                logger.warning("No matching filter block found for category key '%s'. Skipping.", category_key)
 
     def _process_checkboxes_for_category(self, filter_block, items_to_select):
         processed_checkbox_texts = set()
         
         while True:
             checkboxes = self._get_facetwp_checkboxes(filter_block)
-            time.sleep(0.25)
-            
+
             if not checkboxes:
                 break # No more checkboxes to process in this block
 
@@ -264,26 +354,20 @@ class ProfellowBot:
                     # Extract the name and the count
                     checkbox_name = ''.join(filter(lambda x: not x.isdigit(), checkbox_text_full)).strip('() ')
                     
-                    print(f"Comparing extracted checkbox name '{checkbox_name}' with items to select: {items_to_select}")
+                    logger.debug("Comparing extracted checkbox name '%s' with items to select: %s", checkbox_name, items_to_select, extra=sampled('checkbox'))
                     if checkbox_name in items_to_select:
-                        print(f"Found matching checkbox: '{checkbox_name}'")
-                        
-                        # Extract number for wait time
-                        count_str = ''.join(filter(str.isdigit, checkbox_text_full))
-                        if count_str:
-                            wait_time = int(count_str) / 100
-                            print(f"Waiting for {wait_time:.2f} seconds.")
-                        else:
-                            wait_time = 1 # Default wait time
+                        logger.info("Found matching checkbox: '%s'", checkbox_name)
 
+                        # Wait for the refresh the click triggers, however many results it has
+                        before = self.waits.state()
                         checkbox.click()
-                        time.sleep(wait_time)
+                        self.waits.after_action(before)
                         
                         processed_checkbox_texts.add(checkbox_text_full)
                         found_new_checkbox_to_click = True
                         break # Exit the for-loop to re-fetch checkboxes
                 except StaleElementReferenceException:
-                    print("Checkbox became stale. Re-fetching...")
+                    logger.debug("Checkbox became stale. Re-fetching...")
                     found_new_checkbox_to_click = True
                     break # Re-fetch
             
@@ -296,9 +380,9 @@ class ProfellowBot:
                 EC.element_to_be_clickable((By.CLASS_NAME, "facetwp-toggle"))
             )
             facetwp_toggle.click()
-            print("Clicked facetwp-toggle.")
+            logger.debug("Clicked facetwp-toggle.")
         except (TimeoutException, NoSuchElementException) as e:
-            print(f"Could not click facetwp-toggle within the filter block due to: {e}")
+            logger.warning("Could not click facetwp-toggle within the filter block due to: %s", e)
 
     def _get_facetwp_checkboxes(self, filter_block):
         try:
@@ -307,21 +391,20 @@ class ProfellowBot:
                 EC.element_to_be_clickable((By.CLASS_NAME, "facetwp-toggle"))
             )
             facetwp_toggle.click()
-            print("Clicked facetwp-toggle.")
-            time.sleep(0.25)
-            
+            logger.debug("Clicked facetwp-toggle.")
+
             checkboxes = WebDriverWait(filter_block, 10).until(
                 EC.presence_of_all_elements_located((By.CLASS_NAME, "facetwp-checkbox"))
             )
-            print(f"Found {len(checkboxes)} facetwp-checkboxes within the block.")
+            logger.debug("Found %d facetwp-checkboxes within the block.", len(checkboxes))
             return checkboxes
         except TimeoutException:
-            print("No facetwp-checkboxes found within the filter block within the given time.")
+            logger.debug("No facetwp-checkboxes found within the filter block within the given time.")
             
             checkboxes = WebDriverWait(filter_block, 10).until(
                 EC.presence_of_all_elements_located((By.CLASS_NAME, "facetwp-checkbox"))
             )
-            print(f"Found {len(checkboxes)} facetwp-checkboxes within the block.")
+            logger.debug("Found %d facetwp-checkboxes within the block.", len(checkboxes))
             return checkboxes
 
     def _click_done_button(self):
@@ -329,12 +412,15 @@ class ProfellowBot:
             done_button = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, "//button[contains(.,'Done')]"))
             )
+            before = self.waits.state()
             done_button.click()
-            print("Clicked 'Done' button.")
+            logger.debug("Clicked 'Done' button.")
+            # The results (and the URL _cache_results saves) update once FacetWP refreshes
+            self.waits.after_action(before)
         except TimeoutException:
-            print(" 'Done' button not found or not clickable within the given time.")
+            logger.warning("'Done' button not found or not clickable within the given time.")
         except NoSuchElementException:
-            print(" 'Done' button not found.")
+            logger.warning("'Done' button not found.")
 
     def _cache_results(self):
         """Saves the current URL and copies filters.json to tmp/."""
@@ -342,7 +428,7 @@ class ProfellowBot:
         link_path = os.path.join(self.tmp_path, "link.txt")
         with open(link_path, 'w') as f:
             f.write(self.driver.current_url)
-        print(f"Saved current URL to {link_path}")
+        logger.info("Saved current URL to %s", link_path)
 
         # Copy filters.json from configs to tmp
         config_cat_path = os.path.join(self.configs_path, "filters.json")
@@ -350,9 +436,9 @@ class ProfellowBot:
         try:
             with open(config_cat_path, 'r') as src, open(tmp_cat_path, 'w') as dst:
                 dst.write(src.read())
-            print(f"Copied {config_cat_path} to {tmp_cat_path}")
+            logger.info("Copied %s to %s", config_cat_path, tmp_cat_path)
         except FileNotFoundError:
-            print(f"Error: {config_cat_path} not found.")
+            logger.error("Could not cache filters: %s not found.", config_cat_path)
 
     def run(self):
         """Runs the entire scraping process."""
@@ -360,39 +446,53 @@ class ProfellowBot:
             use_cache = self._are_categories_same()
             cached_link = self._get_cached_link()
 
+            report_progress('scrape', message='Logging in')
             if use_cache and cached_link:
-                print("Using cached link.")
-                self._login()
-                self.driver.get(cached_link)
-                self.driver.execute_script("document.body.style.zoom = '0.5';")
-                print(f"Navigated to cached link: {cached_link}")
+                logger.info("Using cached link.")
+                with self.run_stats.phase('login'):
+                    on_cached_link = self._ensure_session(cached_link)
+                with self.run_stats.phase('filters'):
+                    if not on_cached_link:
+                        self.driver.get(cached_link)
+                    self.profile.after_navigation(self.driver)
+                logger.info("Navigated to cached link: %s", cached_link)
             else:
-                print("Performing a full scrape.")
-                self._login()
-                self.driver.execute_script("document.body.style.zoom = '0.5';")
-                self._click_filter_button()
-                time.sleep(1)
-                filter_blocks = self._get_filter_blocks()
-                self._process_filter_blocks(filter_blocks)
-                self._click_done_button()
-                self._cache_results()
-                print("Scraping process completed successfully.")
+                logger.info("Performing a full scrape.")
+                with self.run_stats.phase('login'):
+                    self._ensure_session()
+                    self.profile.after_navigation(self.driver)
+                report_progress('scrape', message='Applying filters')
+                with self.run_stats.phase('filters'):
+                    self._click_filter_button()
+                    self.waits.until('filter_panel', EC.visibility_of_element_located((By.CLASS_NAME, "filter-block")))
+                    filter_blocks = self._get_filter_blocks()
+                    self._process_filter_blocks(filter_blocks)
+                    self._click_done_button()
+                    self._cache_results()
+                logger.info("Scraping process completed successfully.")
             
             # Load more results
-            self._load_more_results()
+            if self.fetch_mode == 'direct':
+                self._fetch_results_directly()
+            else:
+                self._load_more_results()
 
-            # Keep the browser open for a while to see the result
-            print("Process finished. Browser will close in 5 seconds.")
-            time.sleep(5)
+            if not self.profile.headless and self.linger_seconds > 0:
+                # Keep the browser open for a while to see the result
+                logger.info("Process finished. Browser will close in %g seconds.", self.linger_seconds)
+                time.sleep(self.linger_seconds)
 
         except Exception as e:
-            print(f"An error occurred during the scraping process: {e}")
+            self.run_stats.error = str(e)
+            logger.exception("An error occurred during the scraping process: %s", e)
         finally:
-            print("Closing the browser.")
-            self.driver.quit()
+            logger.info("Closing the browser.")
+            with self.run_stats.phase('quit'):
+                self.driver.quit()
+            self._record_run()
 
             # --- Refine and Save Data ---
-            print("Starting data refinement process...")
+            logger.info("Starting data refinement process...")
             try:
                 with open(os.path.join(self.configs_path, "filters.json"), "r") as f:
                     latest_filters = json.load(f)
@@ -403,60 +503,172 @@ class ProfellowBot:
                 model_name = 'gemini-2.5-flash-lite'
             self.refiner = GeminiRefiner(model_name=model_name)
             self.data_processor.refine_and_save_fellowships(self.refiner)
-            print("Data refinement process finished.")
+            logger.info("Data refinement process finished.")
 
             if self.notify_app:
-                print("Notifying Flask app to refresh data...")
+                # The app streams this to its clients when it launched the run; otherwise its
+                # reload thread notices the new processed file on its own.
+                report_progress('done', message='Processed data updated')
+
+    def _record_run(self):
+        """Appends this run's timings to tmp/scrape_runs.jsonl (see data_retrieval.py --scrape-report)."""
+        self.run_stats.waits = self.waits.summary()
+        try:
+            record = self.run_stats.save(self.runs_path)
+        except OSError as e:
+            logger.warning("Could not record scrape run timings: %s", e)
+            return
+        peak = record['peak_rss_bytes']
+        logger.info(
+            "Scrape run (%s, %s profile): %.1fs wall, peak browser memory %s | %s",
+            record['browser'], record['profile'], record['wall_seconds'],
+            f"{peak / (1024 * 1024):.0f} MB" if peak is not None else "unknown",
+            ', '.join(f"{name} {seconds:.1f}s" for name, seconds in record['phases'].items()),
+        )
+        if record['waits']:
+            logger.info("Waits: %s", ', '.join(
+                f"{name} {entry['count']}x {entry['seconds']:.1f}s (max {entry['max_seconds']:.1f}s, {entry['timeouts']} timed out)"
+                for name, entry in record['waits'].items()
+            ))
+
+    def _fetch_results_directly(self):
+        """
+        Fetches every page of results from FacetWP over HTTP, reusing the browser's cookies and
+        filters, and parses them. Falls back to _load_more_results if the fetch fails. The
+        responses are kept in tmp/facetwp/ for data_retrieval.py --direct-replay.
+        """
+        try:
+            with self.run_stats.phase('direct_fetch'):
+                client = FacetWPClient.from_driver(
+                    self.driver, self.direct_concurrency, self.direct_timeout, self.direct_retries,
+                    record_dir=os.path.join(self.tmp_path, "facetwp"),
+                )
                 try:
-                    response = requests.post("http://127.0.0.1:5000/api/refresh")
-                    if response.status_code == 200:
-                        print("Successfully notified Flask app.")
-                    else:
-                        print(f"Failed to notify Flask app. Status code: {response.status_code}, Response: {response.text}")
-                except requests.exceptions.RequestException as e:
-                    print(f"Error notifying Flask app: {e}")
+                    templates = client.fetch_all(lambda done, total: report_progress('load_more', current=done, total=total))
+                finally:
+                    client.close()
+        except FacetWPError as e:
+            logger.warning("Direct fetch failed (%s); loading results in the browser instead.", e)
+            self.run_stats.fetch_mode = 'browser'
+            self._load_more_results()
+            return
+
+        with self.run_stats.phase('parse'):
+            self.run_stats.cards = self.data_processor.process_fellowship_pages(templates, client.base_url)
 
     def _load_more_results(self):
-        print("Attempting to load more results...")
+        with self.run_stats.phase('load_more'):
+            self._click_load_more()
+
+        # Scroll all the way to the top.
+        self.driver.execute_script("window.scrollTo(0, 0);")
+
+        with self.run_stats.phase('parse'):
+            self._get_fellowship_elements()
+
+    def _click_load_more(self):
+        logger.info("Attempting to load more results...")
+        clicks = 0
+        self.waits.until('page_ready', self.waits.idle())
         while True:
+            cards = self.waits.state()['cards']
             # Scroll to the bottom of the page
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2.0)  # Give time for page to load after scroll
 
-            # Scroll up a small amount to bring "facetwp-load-more" into view
-            # self.driver.execute_script("window.scrollBy(0, -750);")
-            # time.sleep(1.0)
-            
-            try:
-                load_more_button = WebDriverWait(self.driver, 2).until(
-                    EC.element_to_be_clickable((By.CLASS_NAME, "facetwp-load-more"))
-                )
-                load_more_button.click()
-                print("Clicked 'Load More' button. Waiting 2.0 seconds...")
-                time.sleep(2.0)  # Wait for content to load
-            except TimeoutException:
-                print("No more 'Load More' buttons found. All results loaded.")
+            load_more_button = self.waits.until('load_more_button', self._find_load_more)
+            if load_more_button is None or load_more_button is NO_LOAD_MORE:
+                logger.info("No more 'Load More' buttons found. All results loaded.")
                 break
-            except NoSuchElementException:
-                print("No 'Load More' button found on the page.")
+            load_more_button.click()
+            clicks += 1
+            report_progress('load_more', current=clicks)
+
+            shown = self.waits.until('load_more', self.waits.more_cards_than(cards))
+            self.run_stats.sample_memory()
+            if not shown:
+                logger.warning("No new results appeared after clicking 'Load More'; stopping with %d results.", cards)
                 break
-        
-        # Scroll all the way to the top.
-        self.driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(1.0)
-
-        self._get_fellowship_elements()
+            logger.info("Clicked 'Load More' button; %d results shown.", shown, extra=sampled('load_more'))
+
+    def _find_load_more(self, driver):
+        """
+        Wait condition: the 'Load More' button once it can be clicked, or NO_LOAD_MORE when the
+        page is idle without one (FacetWP hides it on the last page).
+        """
+        for button in driver.find_elements(By.CLASS_NAME, "facetwp-load-more"):
+            if button.is_displayed():
+                return button if button.is_enabled() else False
+        return NO_LOAD_MORE if self.waits.is_idle(self.waits.state(driver)) else False
 
     def _get_fellowship_elements(self):
-        print("Activating _get_fellowship_elements...")
+        logger.debug("Activating _get_fellowship_elements...")
         try:
-            fellowship_elements = self.driver.find_elements(By.CLASS_NAME, "fellowship")
-            print(f"Number of 'fellowship' elements found: {len(fellowship_elements)}")
+            if self.card_parser == 'html':
+                page_source = self.driver.page_source
+                self._save_page_snapshot(page_source)
+                self.run_stats.cards = self.data_processor.process_fellowship_html(page_source, self.driver.current_url)
+                return
+            fellowship_elements = self.driver.find_elements(By.CLASS_NAME, CARD_CLASS)
+            self.run_stats.cards = len(fellowship_elements)
+            logger.info("Number of 'fellowship' elements found: %d", len(fellowship_elements))
             
             # Process the elements
             self.data_processor.process_fellowships(fellowship_elements)
-
-            return fellowship_elements
         except Exception as e:
-            print(f"An error occurred while getting 'fellowship' elements: {e}")
-            return []
\ No newline at end of file
+            logger.error("An error occurred while getting 'fellowship' elements: %s", e)
+
+    def _save_page_snapshot(self, page_source):
+        """Keeps the last results page in tmp/, for benchmark_card_parsing and debugging."""
+        try:
+            with open(os.path.join(self.tmp_path, "fellowship_page.html"), 'w', encoding='utf-8') as f:
+                f.write(page_source)
+        except OSError as e:
+            logger.warning("Could not save the results page snapshot: %s", e)
+
+    def benchmark_card_parsing(self, url=None):
+        """
+        Reads the cards on the current page (or `url`) both ways and compares the results.
+
+        Returns {'cards', 'html_cards', 'webdriver_seconds', 'html_seconds', 'speedup',
+        'identical', 'mismatches'}; mismatches lists up to 10 cards whose fields differ.
+        """
+        if url is not None:
+            self.driver.get(url)
+
+        start = time.perf_counter()
+        webdriver_cards = []
+        for element in self.driver.find_elements(By.CLASS_NAME, CARD_CLASS):
+            try:
+                webdriver_cards.append(card_from_element(element))
+            except Exception as e:
+                webdriver_cards.append(e)
+        webdriver_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        html_cards = parse_fellowship_cards(self.driver.page_source, self.driver.current_url)
+        html_seconds = time.perf_counter() - start
+
+        mismatches = []
+        for position, (expected, actual) in enumerate(zip(webdriver_cards, html_cards)):
+            if isinstance(expected, Exception) or isinstance(actual, Exception):
+                if isinstance(expected, Exception) != isinstance(actual, Exception):
+                    mismatches.append({'position': position, 'webdriver': str(expected), 'html': str(actual)})
+                continue
+            fields = [field for field in CARD_FIELDS if expected.get(field) != actual.get(field)]
+            if fields:
+                mismatches.append({
+                    'position': position,
+                    'fields': fields,
+                    'webdriver': {field: expected.get(field) for field in fields},
+                    'html': {field: actual.get(field) for field in fields},
+                })
+        identical = not mismatches and len(webdriver_cards) == len(html_cards)
+        return {
+            'cards': len(webdriver_cards),
+            'html_cards': len(html_cards),
+            'webdriver_seconds': webdriver_seconds,
+            'html_seconds': html_seconds,
+            'speedup': webdriver_seconds / html_seconds if html_seconds else None,
+            'identical': identical,
+            'mismatches': mismatches[:10],
+        }
@@ -0,0 +1,194 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - /proc is read instead (Linux only)
+    psutil = None
+
+
+class ScrapeRun:
+    """
+    Wall time per phase and peak memory of one ProfellowBot run.
+
+    Memory is the resident set size of the WebDriver process and everything it started
+    (the browser and its content processes), sampled at the end of every phase and while
+    results are loading. Runs are appended to a JSON lines file, so profiles can be
+    compared across runs (see summarize_runs).
+    """
+
+    def __init__(self, browser, profile, card_parser, fetch_mode='browser'):
+        self.browser = browser
+        self.profile = profile
+        self.card_parser = card_parser
+        self.fetch_mode = fetch_mode
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.phases = {}
+        self.peak_rss_bytes = None
+        self.cards = None
+        # 'hit' when a cached login session was reused, 'miss' when the bot logged in
+        self.session = None
+        # PageWaits.summary(): time spent per kind of wait
+        self.waits = {}
+        self.error = None
+        self._root_pid = None
+
+    def attach(self, driver):
+        """Starts measuring the memory of `driver`'s process tree."""
+        process = getattr(getattr(driver, 'service', None), 'process', None)
+        self._root_pid = process.pid if process is not None else None
+        self.sample_memory()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+            self.sample_memory()
+
+    def sample_memory(self):
+        if self._root_pid is None:
+            return
+        rss = process_tree_rss(self._root_pid)
+        if rss is not None and (self.peak_rss_bytes is None or rss > self.peak_rss_bytes):
+            self.peak_rss_bytes = rss
+
+    def to_dict(self):
+        return {
+            'started_at': self.started_at,
+            'browser': self.browser,
+            'profile': self.profile,
+            'card_parser': self.card_parser,
+            'fetch_mode': self.fetch_mode,
+            'wall_seconds': round(time.perf_counter() - self._start, 3),
+            'phases': {name: round(seconds, 3) for name, seconds in self.phases.items()},
+            'peak_rss_bytes': self.peak_rss_bytes,
+            'cards': self.cards,
+            'session': self.session,
+            'waits': self.waits,
+            'error': self.error,
+        }
+
+    def save(self, path):
+        record = self.to_dict()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+        return record
+
+
+def process_tree_rss(pid):
+    """Resident memory in bytes of a process and all of its descendants, or None if unknown."""
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+    return _proc_tree_rss(pid)
+
+
+def _proc_tree_rss(pid):
+    if not os.path.isdir('/proc'):
+        return None
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'rb') as f:
+                # The command name may contain spaces; fields after it are space separated.
+                parent = int(f.read().rsplit(b')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+    total = 0
+    found = False
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f'/proc/{current}/status', 'r') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1]) * 1024
+                        found = True
+                        break
+        except OSError:
+            continue
+        stack.extend(children.get(current, ()))
+    return total if found else None
+
+
+def load_runs(path):
+    runs = []
+    if not os.path.exists(path):
+        return runs
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                runs.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return runs
+
+
+def summarize_runs(runs):
+    """
+    Averages completed runs per (browser, profile, card_parser, fetch_mode).
+
+    Returns a list of {'browser', 'profile', 'card_parser', 'fetch_mode', 'runs', 'wall_seconds',
+    'peak_rss_bytes', 'phases', 'waits', 'session_hit_rate'}, where the numbers are means
+    ('waits' maps each kind of wait to its mean seconds per run).
+    """
+    groups = {}
+    for run in runs:
+        if run.get('error'):
+            continue
+        # Runs recorded before fetch modes existed all loaded results in the browser
+        key = (run.get('browser'), run.get('profile'), run.get('card_parser'), run.get('fetch_mode', 'browser'))
+        groups.setdefault(key, []).append(run)
+    summary = []
+    for (browser, profile, card_parser, fetch_mode), group in sorted(groups.items(), key=lambda item: tuple(str(part) for part in item[0])):
+        phases = {}
+        for run in group:
+            for name, seconds in run.get('phases', {}).items():
+                phases.setdefault(name, []).append(seconds)
+        waits = {}
+        for run in group:
+            for name, entry in (run.get('waits') or {}).items():
+                waits.setdefault(name, []).append(entry['seconds'])
+        memory = [run['peak_rss_bytes'] for run in group if run.get('peak_rss_bytes') is not None]
+        summary.append({
+            'browser': browser,
+            'profile': profile,
+            'card_parser': card_parser,
+            'fetch_mode': fetch_mode,
+            'runs': len(group),
+            'wall_seconds': sum(run['wall_seconds'] for run in group) / len(group),
+            'peak_rss_bytes': sum(memory) / len(memory) if memory else None,
+            'phases': {name: sum(values) / len(values) for name, values in phases.items()},
+            'waits': {name: sum(values) / len(values) for name, values in waits.items()},
+            'session_hit_rate': session_hit_rate(group),
+        })
+    return summary
+
+
+def session_hit_rate(runs):
+    """Share of runs that reused a cached login session, or None if no run recorded one."""
+    outcomes = [run.get('session') for run in runs if run.get('session') in ('hit', 'miss')]
+    if not outcomes:
+        return None
+    return outcomes.count('hit') / len(outcomes)
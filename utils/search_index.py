@@ -0,0 +1,158 @@
+import threading
+from collections import Counter, defaultdict
+
+SEARCH_FIELDS = ('title', 'description', 'subjects')
+
+
+def build_search_text(row):
+    """Builds the lowercase text a fellowship is searched by (title, description, subjects)."""
+    return ' '.join(str(row.get(field, '')) for field in SEARCH_FIELDS).lower()
+
+
+class KeywordIndex:
+    """
+    Inverted index used to resolve keyword searches to sets of row ids.
+
+    Keywords match as case-insensitive substrings of the search text, exactly like a
+    plain `keyword in text` scan. Any keyword without whitespace can only occur inside a
+    single whitespace-delimited token, so the index maps tokens to row ids and keeps a
+    character n-gram index over the token vocabulary to find the tokens containing a
+    keyword without scanning every row.
+    """
+
+    GRAM_SIZE = 3
+
+    def __init__(self):
+        self._texts = {}
+        self._postings = defaultdict(set)
+        self._grams = defaultdict(set)
+        self._token_cache = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_frame(cls, df):
+        """Builds an index over every row of a DataFrame, keyed by its index labels."""
+        index = cls()
+        columns = [
+            df[field].tolist() if field in df.columns else [''] * len(df)
+            for field in SEARCH_FIELDS
+        ]
+        for row_id, values in zip(df.index.tolist(), zip(*columns)):
+            index.add(row_id, ' '.join(str(value) for value in values).lower())
+        return index
+
+    def __len__(self):
+        return len(self._texts)
+
+    def __contains__(self, row_id):
+        return row_id in self._texts
+
+    def add(self, row_id, text):
+        """Adds a row to the index, replacing any text previously indexed for it."""
+        with self._lock:
+            self._add(row_id, text)
+
+    def _add(self, row_id, text):
+        if row_id in self._texts:
+            if self._texts[row_id] == text:
+                return
+            self._remove(row_id)
+        self._texts[row_id] = text
+        self._token_cache.clear()
+        for token in set(text.split()):
+            if token not in self._postings:
+                for gram in self._token_grams(token):
+                    self._grams[gram].add(token)
+            self._postings[token].add(row_id)
+
+    def update(self, row_id, text):
+        self.add(row_id, text)
+
+    def remove(self, row_id):
+        with self._lock:
+            self._remove(row_id)
+
+    def _remove(self, row_id):
+        text = self._texts.pop(row_id, None)
+        if text is None:
+            return
+        self._token_cache.clear()
+        for token in set(text.split()):
+            rows = self._postings.get(token)
+            if rows is None:
+                continue
+            rows.discard(row_id)
+            if not rows:
+                del self._postings[token]
+                for gram in self._token_grams(token):
+                    tokens = self._grams.get(gram)
+                    if tokens is not None:
+                        tokens.discard(token)
+                        if not tokens:
+                            del self._grams[gram]
+
+    def lookup(self, keyword):
+        """Returns the set of row ids whose search text contains the keyword."""
+        with self._lock:
+            return self._lookup(keyword.lower())
+
+    def _lookup(self, keyword):
+        parts = keyword.split()
+        if not parts:
+            return {row_id for row_id, text in self._texts.items() if keyword in text}
+
+        if len(parts) == 1 and parts[0] == keyword:
+            rows = set()
+            for token in self._matching_tokens(keyword):
+                rows |= self._postings[token]
+            return rows
+
+        # Keywords spanning whitespace: every part must occur in some token of the row,
+        # then the remaining candidates are verified against the full text.
+        candidates = None
+        for part in parts:
+            part_rows = set()
+            for token in self._matching_tokens(part):
+                part_rows |= self._postings[token]
+            candidates = part_rows if candidates is None else candidates & part_rows
+            if not candidates:
+                return set()
+        return {row_id for row_id in candidates if keyword in self._texts[row_id]}
+
+    def count_matches(self, keywords):
+        """Returns a {row_id: count} mapping of how many keywords each matching row contains."""
+        counts = Counter()
+        for keyword in keywords:
+            counts.update(self.lookup(keyword))
+        return counts
+
+    def matching_tokens(self, fragment):
+        """Returns the indexed tokens that contain `fragment` (a keyword without whitespace)."""
+        with self._lock:
+            return list(self._matching_tokens(fragment.lower()))
+
+    def _matching_tokens(self, fragment):
+        tokens = self._token_cache.get(fragment)
+        if tokens is not None:
+            return tokens
+
+        if len(fragment) < self.GRAM_SIZE:
+            candidates = self._postings.keys()
+        else:
+            candidates = None
+            for gram in self._token_grams(fragment):
+                gram_tokens = self._grams.get(gram)
+                if not gram_tokens:
+                    candidates = set()
+                    break
+                candidates = set(gram_tokens) if candidates is None else candidates & gram_tokens
+                if not candidates:
+                    break
+
+        tokens = [token for token in candidates if fragment in token]
+        self._token_cache[fragment] = tokens
+        return tokens
+
+    def _token_grams(self, token):
+        size = self.GRAM_SIZE
+        return {token[i:i + size] for i in range(len(token) - size + 1)}
@@ -0,0 +1,115 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import time
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:  # pragma: no cover - without cryptography every run logs in interactively
+    Fernet = None
+
+logger = logging.getLogger(__name__)
+
+# Key derivation for the cache file; changing the credentials makes an old file unreadable.
+KDF_ITERATIONS = 200_000
+FILE_VERSION = 1
+DEFAULT_AUTH_COOKIES = ('wordpress_logged_in', 'wordpress_sec')
+
+
+def encryption_available():
+    return Fernet is not None
+
+
+class SessionCache:
+    """
+    The browser's login cookies, kept encrypted in tmp/ between runs.
+
+    The file is encrypted with Fernet under a key derived (PBKDF2) from the login
+    credentials, so it is useless without configs/login.json and is dropped automatically
+    when the credentials change. A saved session expires after `max_age` seconds, or
+    earlier when one of the `auth_cookies` (matched by name prefix) expires.
+    """
+
+    def __init__(self, path, credentials, max_age=72 * 3600, auth_cookies=DEFAULT_AUTH_COOKIES):
+        self.path = path
+        self.max_age = max_age
+        self.auth_cookies = tuple(auth_cookies)
+        self._secret = '\0'.join(credentials).encode('utf-8')
+
+    @classmethod
+    def from_config(cls, config, tmp_path, login_data):
+        """The cache configured by [SESSION], or None when it is disabled or cannot be used."""
+        if not config.getboolean('SESSION', 'enabled', fallback=True):
+            return None
+        if not encryption_available():
+            logger.warning("cryptography is not installed; the login session will not be cached.")
+            return None
+        credentials = (login_data.get("username-email", ""), login_data.get("password", ""))
+        if not all(credentials):
+            return None
+        auth_cookies = config.get('SESSION', 'auth_cookies', fallback=','.join(DEFAULT_AUTH_COOKIES))
+        return cls(
+            os.path.join(tmp_path, config.get('SESSION', 'file', fallback='session.bin')),
+            credentials,
+            max_age=config.getfloat('SESSION', 'max_age_hours', fallback=72) * 3600,
+            auth_cookies=[name.strip() for name in auth_cookies.split(',') if name.strip()],
+        )
+
+    def _fernet(self, salt):
+        key = hashlib.pbkdf2_hmac('sha256', self._secret, salt, KDF_ITERATIONS, dklen=32)
+        return Fernet(base64.urlsafe_b64encode(key))
+
+    def load(self):
+        """Returns the saved {'cookies', 'landing_url', 'expires_at'}, or None if missing, expired or unreadable."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored.get('version') != FILE_VERSION:
+                return None
+            fernet = self._fernet(base64.b64decode(stored['salt']))
+            session = json.loads(fernet.decrypt(stored['token'].encode('ascii'), ttl=int(self.max_age)))
+        except FileNotFoundError:
+            return None
+        except InvalidToken:
+            logger.info("Cached login session expired or was saved with other credentials.")
+            self.clear()
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Could not read the cached login session: %s", e)
+            return None
+        if session.get('expires_at', 0) <= time.time():
+            logger.info("Cached login session expired.")
+            self.clear()
+            return None
+        return session
+
+    def save(self, cookies, landing_url=None):
+        """Saves the cookies of a logged-in browser; returns the session's expiry time."""
+        now = time.time()
+        expires_at = now + self.max_age
+        for cookie in cookies:
+            if cookie.get('expiry') and cookie['name'].startswith(self.auth_cookies):
+                expires_at = min(expires_at, cookie['expiry'])
+        salt = os.urandom(16)
+        token = self._fernet(salt).encrypt(json.dumps({
+            'cookies': cookies,
+            'landing_url': landing_url,
+            'saved_at': now,
+            'expires_at': expires_at,
+        }).encode('utf-8'))
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = self.path + '.tmp'
+        # Only the owner may read the file, even though it is encrypted.
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'version': FILE_VERSION, 'salt': base64.b64encode(salt).decode('ascii'), 'token': token.decode('ascii')}, f)
+        os.replace(temp_path, self.path)
+        return expires_at
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
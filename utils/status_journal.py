@@ -0,0 +1,122 @@
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class StatusJournal:
+    """
+    Append-only log of fellowship status changes, stored as JSON lines next to the processed list.
+
+    Each record is {"link", "field", "value", "ts"}. Records are keyed by fellowship link so
+    they can be replayed onto any rebuild of the base file. Compaction rotates the active
+    journal to a `.compacting` file, the caller writes a new base file, and then the
+    rotated file is deleted. A rotated file left behind by a crash is replayed as well.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.compacting_path = path + ".compacting"
+        self._lock = threading.Lock()
+        self.entries = 0
+        self.first_entry_time = None
+        self._scan_existing()
+
+    def _scan_existing(self):
+        for record in self._read(self.path):
+            self.entries += 1
+            if self.first_entry_time is None:
+                self.first_entry_time = record.get('ts', time.time())
+
+    @property
+    def size_bytes(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def append(self, link, field, value):
+        record = {"link": link, "field": field, "value": value, "ts": time.time()}
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self.entries += 1
+            if self.first_entry_time is None:
+                self.first_entry_time = record['ts']
+        return record
+
+    def append_many(self, changes):
+        """Appends (link, field, value) changes with a single write and fsync. Returns the records."""
+        now = time.time()
+        records = [{"link": link, "field": field, "value": value, "ts": now} for link, field, value in changes]
+        if not records:
+            return records
+        data = "".join(json.dumps(record) + "\n" for record in records)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            self.entries += len(records)
+            if self.first_entry_time is None:
+                self.first_entry_time = now
+        return records
+
+    def replay(self):
+        """Yields every pending record, oldest first (including an unfinished compaction)."""
+        yield from self._read(self.compacting_path)
+        yield from self._read(self.path)
+
+    def rotate(self):
+        """
+        Moves the active journal aside so a compaction can fold it into the base file.
+
+        Returns False if there was nothing to compact.
+        """
+        with self._lock:
+            if not os.path.exists(self.path):
+                return os.path.exists(self.compacting_path)
+            if os.path.exists(self.compacting_path):
+                # An earlier compaction never finished: keep its records ahead of the new ones.
+                with open(self.compacting_path, 'a', encoding='utf-8') as dst, open(self.path, 'r', encoding='utf-8') as src:
+                    dst.write(src.read())
+                os.remove(self.path)
+            else:
+                os.replace(self.path, self.compacting_path)
+            self.entries = 0
+            self.first_entry_time = None
+            return True
+
+    def finish_compaction(self):
+        with self._lock:
+            if os.path.exists(self.compacting_path):
+                os.remove(self.compacting_path)
+
+    def clear(self):
+        """Drops all pending records (used after the base file was rewritten in full)."""
+        with self._lock:
+            for path in (self.path, self.compacting_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self.entries = 0
+            self.first_entry_time = None
+
+    def _read(self, path):
+        if not os.path.exists(path):
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-append; everything before it is intact.
+                    logger.warning("Skipping unreadable record in %s", path)
@@ -0,0 +1,288 @@
+import json
+import logging
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from utils.subjects import parse_subjects_value
+from utils.frame_memory import arrow_string_dtype
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - pyarrow is optional, CSV still works without it
+    pa = None
+    feather = None
+
+logger = logging.getLogger(__name__)
+
+# Columns stored as typed lists in columnar formats (CSV keeps their "['a', 'b']" repr).
+LIST_COLUMNS = ('subjects',)
+INT_COLUMNS = ('favorited', 'show', 'length_in_years')
+FLOAT_COLUMNS = ('interest_rating',)
+
+
+class FellowshipStore:
+    """Reads and writes one fellowship table in a specific on-disk format."""
+
+    format_name = None
+    extension = None
+
+    def __init__(self, directory, name):
+        self.directory = directory
+        self.name = name
+        self.path = os.path.join(directory, f"{name}.{self.extension}")
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    @property
+    def mtime(self):
+        return os.path.getmtime(self.path) if self.exists() else None
+
+    @property
+    def size_bytes(self):
+        return os.path.getsize(self.path) if self.exists() else 0
+
+    def read(self):
+        raise NotImplementedError
+
+    def write(self, df):
+        """Writes atomically: to a temp file in the same directory, then renamed over the target."""
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        self._write_to(df, tmp_path)
+        with open(tmp_path, 'rb+') as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _write_to(self, df, path):
+        raise NotImplementedError
+
+
+class CsvStore(FellowshipStore):
+    format_name = 'csv'
+    extension = 'csv'
+
+    def read(self):
+        return pd.read_csv(self.path)
+
+    def _write_to(self, df, path):
+        df.to_csv(path, index=False)
+
+
+class FeatherStore(FellowshipStore):
+    """Arrow IPC (Feather v2) file with typed columns, read through a memory map."""
+
+    format_name = 'feather'
+    extension = 'feather'
+
+    def read(self):
+        table = feather.read_table(self.path, memory_map=True)
+        df = table.to_pandas()
+        for col in df.columns:
+            if col in LIST_COLUMNS:
+                df[col] = pd.Series([parse_subjects_value(v) for v in df[col].tolist()], index=df.index, dtype=object)
+            elif df[col].dtype == object:
+                # Missing strings come back as None; match what read_csv produces (NaN).
+                df[col] = df[col].where(df[col].notna(), np.nan)
+        return df
+
+    def _write_to(self, df, path):
+        feather.write_feather(_to_arrow_table(df), path, compression='zstd')
+
+
+class SnapshotStore(FeatherStore):
+    """
+    Immutable, uncompressed Feather file that worker processes map read-only.
+
+    Snapshots are written once and never modified, so every process that reads one maps the
+    same pages of the OS page cache. Text columns are read as Arrow-backed strings that point
+    into the mapping instead of being copied into each worker's heap.
+    """
+
+    format_name = 'snapshot'
+
+    def read(self):
+        table = feather.read_table(self.path, memory_map=True)
+        string_dtype = arrow_string_dtype()
+        types_mapper = (lambda arrow_type: string_dtype if arrow_type == pa.string() else None) if string_dtype is not None else None
+        df = table.to_pandas(types_mapper=types_mapper)
+        for col in df.columns:
+            if col in LIST_COLUMNS:
+                df[col] = pd.Series([parse_subjects_value(v) for v in df[col].tolist()], index=df.index, dtype=object)
+            elif df[col].dtype == object:
+                df[col] = df[col].where(df[col].notna(), np.nan)
+        return df
+
+    def _write_to(self, df, path):
+        feather.write_feather(_to_arrow_table(df), path, compression='uncompressed')
+
+
+SNAPSHOT_MANIFEST = 'manifest.json'
+
+
+def write_snapshot(directory, df, version, keep=3, **metadata):
+    """
+    Writes `df` as snapshot `version` and points the manifest at it.
+
+    Returns the manifest. Only the newest `keep` snapshot files are kept; a worker still
+    mapping an older one keeps its pages until it moves on (files that cannot be removed
+    yet, e.g. mapped on Windows, are retried on the next write).
+    """
+    store = SnapshotStore(directory, f"fellowships-v{version}")
+    start = time.perf_counter()
+    store.write(df)
+    manifest = {
+        'version': version,
+        'file': os.path.basename(store.path),
+        'rows': len(df),
+        'size_bytes': store.size_bytes,
+        'written_at': time.time(),
+        **metadata,
+    }
+    tmp_path = os.path.join(directory, SNAPSHOT_MANIFEST + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, os.path.join(directory, SNAPSHOT_MANIFEST))
+    logger.debug("Wrote snapshot v%s (%d rows, %d bytes) in %.3fs", version, len(df), manifest['size_bytes'], time.perf_counter() - start)
+    _prune_snapshots(directory, keep, manifest['file'])
+    return manifest
+
+
+def read_snapshot_manifest(directory):
+    """The current snapshot manifest, or None if no snapshot has been written."""
+    try:
+        with open(os.path.join(directory, SNAPSHOT_MANIFEST), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def snapshot_store(directory, manifest):
+    return SnapshotStore(directory, os.path.splitext(manifest['file'])[0])
+
+
+def _prune_snapshots(directory, keep, current_file):
+    snapshots = []
+    for name in os.listdir(directory):
+        if name.startswith('fellowships-v') and name.endswith('.' + SnapshotStore.extension):
+            try:
+                snapshots.append((int(name[len('fellowships-v'):-len(SnapshotStore.extension) - 1]), name))
+            except ValueError:
+                continue
+    snapshots.sort()
+    for _, name in snapshots[:-max(keep, 1)]:
+        if name == current_file:
+            continue
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError:
+            pass
+
+
+STORE_CLASSES = {
+    CsvStore.format_name: CsvStore,
+    FeatherStore.format_name: FeatherStore,
+}
+
+
+def columnar_available():
+    return pa is not None
+
+
+def get_store(directory, name, format_name='feather'):
+    """Returns the store for `format_name`, falling back to CSV when pyarrow is not installed."""
+    format_name = (format_name or 'csv').lower()
+    if format_name not in STORE_CLASSES:
+        raise ValueError(f"Unsupported storage format: '{format_name}'. Please choose one of {sorted(STORE_CLASSES)}.")
+    if format_name != 'csv' and not columnar_available():
+        logger.warning("pyarrow is not installed; using CSV instead of %s.", format_name)
+        format_name = 'csv'
+    return STORE_CLASSES[format_name](directory, name)
+
+
+def open_fellowship_store(directory, name, format_name='feather'):
+    """
+    Returns the configured store, importing the CSV copy first when it is missing or newer.
+
+    CSV stays the interchange format: other tools (or older versions of the scraper) can
+    still drop a CSV next to the columnar file and it will be picked up on the next open.
+    """
+    store = get_store(directory, name, format_name)
+    if store.format_name == 'csv':
+        return store
+    csv_store = CsvStore(directory, name)
+    if csv_store.exists() and (not store.exists() or csv_store.mtime > store.mtime):
+        import_csv(csv_store.path, store)
+    return store
+
+
+def import_csv(csv_path, store):
+    """Loads a CSV export into `store`."""
+    start = time.perf_counter()
+    df = pd.read_csv(csv_path)
+    store.write(df)
+    logger.info("Imported %d rows from %s into %s in %.3fs", len(df), csv_path, store.path, time.perf_counter() - start)
+    return df
+
+
+def export_csv(store, csv_path=None):
+    """Writes the contents of `store` out as CSV and returns the path written."""
+    csv_store = CsvStore(store.directory, store.name)
+    if csv_path is not None:
+        csv_store.path = csv_path
+    csv_store.write(store.read())
+    logger.info("Exported %s to %s", store.path, csv_store.path)
+    return csv_store.path
+
+
+def storage_report(df):
+    """Writes `df` in every available format and reports on-disk size and load time for each."""
+    report = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for format_name, store_class in STORE_CLASSES.items():
+            if format_name != 'csv' and not columnar_available():
+                continue
+            store = store_class(tmp_dir, 'report')
+            start = time.perf_counter()
+            store.write(df)
+            write_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            store.read()
+            load_seconds = time.perf_counter() - start
+            report.append({
+                'format': format_name,
+                'size_bytes': store.size_bytes,
+                'write_seconds': write_seconds,
+                'load_seconds': load_seconds,
+            })
+    return report
+
+
+def _to_arrow_table(df):
+    """Converts the fellowship frame to an Arrow table with stable, explicit column types."""
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if col in LIST_COLUMNS:
+            values = [parse_subjects_value(v) for v in series.tolist()]
+            columns[col] = pa.array(values, type=pa.list_(pa.string()))
+        elif col in INT_COLUMNS:
+            columns[col] = pa.array(pd.to_numeric(series, errors='coerce').fillna(0).astype('int64'))
+        elif col in FLOAT_COLUMNS:
+            columns[col] = pa.array(pd.to_numeric(series, errors='coerce').astype('float64'))
+        elif pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            columns[col] = pa.array(series)
+        else:
+            values = [None if _is_null(v) else str(v) for v in series.tolist()]
+            columns[col] = pa.array(values, type=pa.string())
+    return pa.table(columns)
+
+
+def _is_null(value):
+    try:
+        return value is None or bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
@@ -0,0 +1,118 @@
+import ast
+import threading
+import numpy as np
+
+
+def parse_subjects_value(subjects_raw):
+    """Converts a stored subjects value (usually the string "['a', 'b']") into a list of strings."""
+    if isinstance(subjects_raw, list):
+        return [str(s) for s in subjects_raw]
+    if isinstance(subjects_raw, (tuple, set, np.ndarray)):
+        return [str(s) for s in subjects_raw]
+    if isinstance(subjects_raw, str):
+        try:
+            subjects_list = ast.literal_eval(subjects_raw)
+            if isinstance(subjects_list, (list, tuple)):
+                return [str(s) for s in subjects_list]
+            return [str(subjects_list)]
+        except (ValueError, SyntaxError):
+            return [s.strip() for s in subjects_raw.split(',') if s.strip()]
+    return []
+
+
+def normalize_subject(subject):
+    return ' '.join(str(subject).split()).casefold()
+
+
+class SubjectVocabulary:
+    """
+    Integer codes for the distinct subjects in the processed fellowship list.
+
+    Subjects are normalized (whitespace collapsed, case-folded) before coding, so
+    "Deep Learning" and "deep  learning" share a code. Each row keeps a frozenset of
+    codes, and each code keeps the set of row positions that carry it.
+    """
+
+    def __init__(self):
+        self.names = []
+        self._codes = {}
+        self.row_codes = []
+        self._postings = []
+        self._posting_arrays = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_subject_lists(cls, subject_lists):
+        vocabulary = cls()
+        for subjects in subject_lists:
+            vocabulary.append_row(subjects)
+        return vocabulary
+
+    def __len__(self):
+        return len(self.names)
+
+    def code_for(self, subject, add=False):
+        """Returns the code for a subject, or -1 if unknown and add is False."""
+        key = normalize_subject(subject)
+        code = self._codes.get(key)
+        if code is None:
+            if not add:
+                return -1
+            with self._lock:
+                code = self._codes.get(key)
+                if code is None:
+                    code = len(self.names)
+                    self.names.append(str(subject).strip())
+                    self._postings.append(set())
+                    self._codes[key] = code
+        return code
+
+    def encode(self, subjects, add=False):
+        return frozenset(self.code_for(subject, add=add) for subject in subjects)
+
+    def append_row(self, subjects):
+        with self._lock:
+            position = len(self.row_codes)
+            self.row_codes.append(frozenset())
+            self.set_row(position, subjects)
+            return position
+
+    def set_row(self, position, subjects):
+        """Replaces the subject codes stored for the row at `position`."""
+        with self._lock:
+            new_codes = self.encode(subjects, add=True)
+            old_codes = self.row_codes[position]
+            for code in old_codes - new_codes:
+                self._postings[code].discard(position)
+                self._posting_arrays.pop(code, None)
+            for code in new_codes - old_codes:
+                self._postings[code].add(position)
+                self._posting_arrays.pop(code, None)
+            self.row_codes[position] = new_codes
+
+    def row_has_any(self, position, codes):
+        return not self.row_codes[position].isdisjoint(codes)
+
+    def rows_for(self, code):
+        """Sorted array of row positions carrying the subject code."""
+        rows = self._posting_arrays.get(code)
+        if rows is None:
+            with self._lock:
+                rows = np.array(sorted(self._postings[code]), dtype=np.intp)
+                self._posting_arrays[code] = rows
+        return rows
+
+    def mask(self, codes, size):
+        """Boolean row mask of rows that carry any of the given codes."""
+        mask = np.zeros(size, dtype=bool)
+        for code in codes:
+            if 0 <= code < len(self._postings):
+                rows = self.rows_for(code)
+                # Rows appended by a concurrent reload are beyond a frame of `size` rows.
+                mask[rows[rows < size]] = True
+        return mask
+
+    def counts(self):
+        """Returns [(subject, code, row count)] for every subject in the vocabulary."""
+        with self._lock:
+            return [(name, code, len(self._postings[code])) for code, name in enumerate(self.names)]
@@ -0,0 +1,165 @@
+import logging
+import time
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, NoSuchElementException
+
+from utils.cards import CARD_CLASS
+from utils.logs import sampled
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) per kind of wait; [WAITS] in config.ini overrides them.
+DEFAULT_TIMEOUTS = {
+    'page_ready': 15,
+    'login_form': 10,
+    'login_redirect': 10,
+    'filter_panel': 10,
+    'filter_open': 3,
+    'refresh_start': 1,
+    'facet_refresh': 20,
+    'load_more_button': 5,
+    'load_more': 15,
+}
+
+# Installs (once per page) counters of the XHR/fetch requests the page makes and of FacetWP
+# refreshes, then reports them with FacetWP's loading state and the number of cards shown.
+PAGE_STATE_SCRIPT = """
+var t = window.__fellowshipFinderWaits;
+if (!t) {
+    t = window.__fellowshipFinderWaits = {requests: 0, inflight: 0, last: performance.now(), refreshes: 0};
+    var started = function () { t.requests++; t.inflight++; t.last = performance.now(); };
+    var finished = function () { t.inflight = Math.max(0, t.inflight - 1); t.last = performance.now(); };
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        started();
+        this.addEventListener('loadend', finished);
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            started();
+            return fetch.apply(this, arguments).finally(finished);
+        };
+    }
+    var loaded = function () { t.refreshes++; t.last = performance.now(); };
+    document.addEventListener('facetwp-loaded', loaded);
+    if (window.jQuery) { window.jQuery(document).on('facetwp-loaded', loaded); }
+}
+return {
+    requests: t.requests,
+    inflight: t.inflight,
+    quiet_ms: performance.now() - t.last,
+    refreshes: t.refreshes,
+    loading: !!(window.FWP && window.FWP.is_refresh) ||
+        !!document.querySelector('.facetwp-loading, .facetwp-template.is-loading, .facetwp-load-more.loading'),
+    ready_state: document.readyState,
+    cards: document.getElementsByClassName(arguments[0]).length
+};
+"""
+
+
+class PageWaits:
+    """
+    Condition-based waits for the results page, each bounded by a per-kind timeout.
+
+    A wait returns as soon as its condition holds, so a run takes as long as the site needs
+    rather than a fixed worst case. "Idle" means FacetWP is not refreshing, no XHR/fetch
+    request is in flight, and none has started or finished for `network_idle_ms`.
+
+    Time spent in every kind of wait is kept (count, total, max, timeouts); see summary().
+    """
+
+    def __init__(self, driver, timeouts=None, poll_interval=0.1, network_idle_ms=300):
+        self.driver = driver
+        self.timeouts = dict(DEFAULT_TIMEOUTS, **(timeouts or {}))
+        self.poll_interval = poll_interval
+        self.network_idle_ms = network_idle_ms
+        self.stats = {}
+
+    @classmethod
+    def from_config(cls, driver, config):
+        timeouts = {name: config.getfloat('WAITS', name, fallback=default) for name, default in DEFAULT_TIMEOUTS.items()}
+        return cls(
+            driver,
+            timeouts,
+            poll_interval=config.getfloat('WAITS', 'poll_interval', fallback=0.1),
+            network_idle_ms=config.getfloat('WAITS', 'network_idle_ms', fallback=300),
+        )
+
+    def until(self, name, condition, required=False):
+        """
+        Waits up to the `name` timeout for `condition(driver)` to return something truthy and
+        returns it. On timeout returns None, or raises TimeoutException if `required`.
+        """
+        timeout = self.timeouts.get(name, 10)
+        start = time.perf_counter()
+        try:
+            result = WebDriverWait(
+                self.driver, timeout, poll_frequency=self.poll_interval,
+                ignored_exceptions=(StaleElementReferenceException, NoSuchElementException),
+            ).until(condition)
+        except TimeoutException:
+            self._record(name, time.perf_counter() - start, timed_out=True)
+            logger.debug("Wait '%s' gave up after %.1fs.", name, timeout, extra=sampled(f'wait:{name}'))
+            if required:
+                raise
+            return None
+        self._record(name, time.perf_counter() - start, timed_out=False)
+        return result
+
+    def _record(self, name, seconds, timed_out):
+        entry = self.stats.setdefault(name, {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'timeouts': 0})
+        entry['count'] += 1
+        entry['seconds'] += seconds
+        entry['max_seconds'] = max(entry['max_seconds'], seconds)
+        entry['timeouts'] += timed_out
+
+    def state(self, driver=None):
+        """The page's request counters, FacetWP loading flag, readyState and card count."""
+        return (driver or self.driver).execute_script(PAGE_STATE_SCRIPT, CARD_CLASS)
+
+    def is_idle(self, state):
+        return (
+            state['ready_state'] != 'loading'
+            and not state['loading']
+            and state['inflight'] == 0
+            and state['quiet_ms'] >= self.network_idle_ms
+        )
+
+    def idle(self):
+        """Condition: the page is idle."""
+        return lambda driver: self.is_idle(self.state(driver))
+
+    def activity_since(self, before):
+        """Condition: a request or FacetWP refresh started after `before` (a state())."""
+        def condition(driver):
+            state = self.state(driver)
+            return state['requests'] > before['requests'] or state['refreshes'] > before['refreshes'] or state['loading']
+        return condition
+
+    def more_cards_than(self, count):
+        """Condition: more than `count` cards are shown and the page is idle again; returns the new count."""
+        def condition(driver):
+            state = self.state(driver)
+            return state['cards'] if state['cards'] > count and self.is_idle(state) else False
+        return condition
+
+    def after_action(self, before):
+        """
+        Waits for whatever an action (a click) triggered to finish: if a request or refresh
+        starts within the refresh_start bound, waits for idle up to facet_refresh.
+        """
+        if self.until('refresh_start', self.activity_since(before)):
+            self.until('facet_refresh', self.idle())
+
+    def summary(self):
+        return {
+            name: {
+                'count': entry['count'],
+                'seconds': round(entry['seconds'], 3),
+                'max_seconds': round(entry['max_seconds'], 3),
+                'timeouts': entry['timeouts'],
+            }
+            for name, entry in self.stats.items()
+        }